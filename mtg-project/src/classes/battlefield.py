@@ -1,5 +1,7 @@
 from mtgsdk import Card
 
+from classes.mana import DeckMana
+
 
 class Battlefield:
     """
@@ -9,10 +11,22 @@ class Battlefield:
     -----------
     lands : list of Card
         The lands currently on the battlefield.
+    mana : DeckMana or None
+        The colored mana model of the deck the lands come from.
+    color_supply : list of int
+        The lands that produce some color of each of `mana.subsets` (see `DeckMana`), kept up
+        to date as lands are added.
     """
 
-    def __init__(self):
+    def __init__(self, mana: DeckMana = None):
         self.lands = []
+        self.mana = mana
+        self.color_supply = mana.empty_supply() if mana else []
+
+    def reset(self):
+        """Removes every land from the battlefield in place (see `MatchState`)."""
+        self.lands.clear()
+        self.color_supply[:] = [0] * len(self.color_supply)
 
     def add_land(self, card: Card):
         """
@@ -24,6 +38,8 @@ class Battlefield:
             The land card to be added to the battlefield.
         """
         self.lands.append(card)
+        if self.mana is not None:
+            self.mana.add_land(self.color_supply, card)
 
     def calculate_mana_pool(self) -> int:
         """
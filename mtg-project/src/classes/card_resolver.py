@@ -0,0 +1,377 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+
+from mtgsdk import Card
+
+from classes.card_store import CardStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URL = "https://api.magicthegathering.io/v1"
+
+# Respostas HTTP que valem nova tentativa (limite de requisições e erros do servidor)
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class CardNotFoundError(ValueError):
+    """Raised when the API has no card with the requested name (never retried)."""
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket shared by every event loop that uses the resolver.
+
+    Each request takes one token; tokens refill at `rate` per second up to `burst`. A request
+    that finds the bucket empty reserves the next token and sleeps until it is refilled, so
+    concurrent callers are spaced out instead of polling.
+
+    Attributes:
+    -----------
+    rate : float or None
+        Tokens added per second. None disables the limit.
+    burst : int
+        Maximum number of tokens (requests that may start back to back).
+    """
+
+    def __init__(self, rate: Optional[float], burst: int = 1):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Takes a token and returns how many seconds the caller must wait before using it."""
+        if not self.rate:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            # Saldo negativo: o token foi reservado e só estará disponível no futuro
+            return max(-self._tokens / self.rate, 0.0)
+
+    async def acquire(self):
+        wait = self.reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+
+class CardResolver:
+    """
+    Resolves card names through the MTG API with asyncio, shared by all deck loads in a run.
+
+    Lookups go first to a `CardStore` (so every deck reuses the same Card objects and names are
+    fetched at most once per store). Missing names are fetched concurrently over a pooled HTTP
+    session, with duplicate in-flight lookups coalesced into a single request, a token-bucket
+    rate limit and retries with exponential backoff. Names the API does not know are remembered,
+    so later decks fail fast instead of querying them again.
+
+    Attributes:
+    -----------
+    card_store : CardStore
+        Where resolved cards are kept (an in-memory store by default).
+    base_url : str
+        Root of the API (the `/cards?name=` endpoint of the MTG API). Point it at a local stub
+        server to resolve cards without network access.
+    max_connections : int
+        Maximum number of concurrent requests (and pooled connections).
+    rate_limit : float or None
+        Maximum requests per second (None for no limit).
+    burst : int
+        Requests that may start back to back before the rate limit applies.
+    max_retries : int
+        Retries of a request after connection errors, timeouts, 429 or 5xx responses.
+    backoff : float
+        Base delay of the exponential backoff, in seconds (a `Retry-After` header takes
+        precedence).
+    timeout : float
+        Timeout of each request, in seconds.
+    """
+
+    def __init__(
+        self,
+        card_store: Optional[CardStore] = None,
+        base_url: str = DEFAULT_BASE_URL,
+        max_connections: int = 10,
+        rate_limit: Optional[float] = 10.0,
+        burst: int = 20,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 30.0,
+    ):
+        self.card_store = card_store if card_store is not None else CardStore()
+        self.base_url = base_url.rstrip("/")
+        self.max_connections = max_connections
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.rate_limiter = TokenBucket(rate_limit, burst)
+
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+        self._not_found: Dict[str, str] = {}
+        self._session = None
+        self._executor = None
+        self.stats = {"requests": 0, "retries": 0, "store_hits": 0, "coalesced": 0}
+
+    def _get_session(self):
+        """Creates the pooled HTTP session (and its threads) on first use."""
+        with self._lock:
+            if self._session is None:
+                # Import local: o requests só é carregado quando alguma carta vai à rede
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1, pool_maxsize=self.max_connections
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_connections, thread_name_prefix="card-resolver"
+                )
+            return self._session
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    @staticmethod
+    def _pick_card(card_name: str, records: list) -> dict:
+        """
+        Picks the record of the requested card. The API matches names partially, so an exact
+        (case-insensitive) match is preferred over the first result.
+        """
+        for record in records:
+            if record.get("name", "").lower() == card_name.lower():
+                return record
+        return records[0]
+
+    def _retry_delay(self, attempt: int, response=None) -> float:
+        retry_after = (
+            response.headers.get("Retry-After") if response is not None else None
+        )
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return self.backoff * 2**attempt + random.uniform(0, self.backoff)
+
+    async def _fetch(self, card_name: str) -> Card:
+        """Fetches a card from the API, retrying transient failures."""
+        import requests
+
+        session = self._get_session()
+        loop = asyncio.get_running_loop()
+        url = f"{self.base_url}/cards"
+
+        for attempt in range(self.max_retries + 1):
+            await self.rate_limiter.acquire()
+            self._count("requests")
+
+            response = None
+            try:
+                response = await loop.run_in_executor(
+                    self._executor,
+                    lambda: session.get(
+                        url, params={"name": card_name}, timeout=self.timeout
+                    ),
+                )
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                if attempt == self.max_retries:
+                    raise
+                logger.warning(f"Request for '{card_name}' failed ({exc}); retrying.")
+            else:
+                if response.status_code not in RETRY_STATUS_CODES:
+                    response.raise_for_status()
+                    records = response.json().get("cards", [])
+                    if not records:
+                        raise CardNotFoundError(
+                            f"Card '{card_name}' not found in the database."
+                        )
+                    return Card(self._pick_card(card_name, records))
+
+                if attempt == self.max_retries:
+                    response.raise_for_status()
+                logger.warning(
+                    f"Request for '{card_name}' returned {response.status_code}; retrying."
+                )
+
+            self._count("retries")
+            await asyncio.sleep(self._retry_delay(attempt, response))
+
+    async def resolve(self, card_name: str) -> Card:
+        """
+        Resolves a single card name, joining the request already in flight for it, if any.
+
+        Raises:
+        -------
+        ValueError:
+            If the card does not exist (`CardNotFoundError`) or could not be fetched.
+        """
+        card = self.card_store.get(card_name)
+        if card is not None:
+            self._count("store_hits")
+            return card
+
+        if card_name in self._not_found:
+            raise CardNotFoundError(self._not_found[card_name])
+
+        # O futuro é do concurrent.futures para ser compartilhado entre event loops e threads
+        with self._lock:
+            future = self._in_flight.get(card_name)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._in_flight[card_name] = future
+            else:
+                self.stats["coalesced"] += 1
+
+        if is_owner:
+            try:
+                card = await self._fetch(card_name)
+                self.card_store.add(card)
+                future.set_result(card)
+            except CardNotFoundError as exc:
+                self._not_found[card_name] = str(exc)
+                future.set_exception(exc)
+            except Exception as exc:
+                future.set_exception(exc)
+            except BaseException:
+                # Cancelamento: libera quem aguarda a mesma carta antes de propagar
+                future.set_exception(
+                    RuntimeError(f"Lookup of '{card_name}' was cancelled.")
+                )
+                raise
+            finally:
+                with self._lock:
+                    self._in_flight.pop(card_name, None)
+
+        return await asyncio.wrap_future(future)
+
+    async def resolve_many(
+        self, card_names: Iterable[str]
+    ) -> Tuple[Dict[str, Card], Dict[str, str]]:
+        """
+        Resolves several card names concurrently (each distinct name once).
+
+        Returns:
+        --------
+        Tuple[Dict[str, Card], Dict[str, str]]
+            The resolved cards and, for names that could not be resolved, the failure reason.
+        """
+        unique_names = list(dict.fromkeys(card_names))
+        results = await asyncio.gather(
+            *(self.resolve(name) for name in unique_names), return_exceptions=True
+        )
+
+        cards, failures = {}, {}
+        for name, result in zip(unique_names, results):
+            if isinstance(result, Exception):
+                failures[name] = str(result)
+            else:
+                cards[name] = result
+        return cards, failures
+
+    def resolve_names(
+        self, card_names: Iterable[str]
+    ) -> Tuple[Dict[str, Card], Dict[str, str]]:
+        """
+        Synchronous `resolve_many`, for callers outside an event loop.
+
+        Names already in the card store are returned without starting an event loop. When the
+        calling thread already runs a loop (e.g. in a notebook), the lookups run in a helper
+        thread.
+        """
+        card_names = list(dict.fromkeys(card_names))
+        cards = {}
+        missing = []
+        for name in card_names:
+            card = self.card_store.get(name)
+            if card is None:
+                missing.append(name)
+            else:
+                cards[name] = card
+        with self._lock:
+            self.stats["store_hits"] += len(cards)
+
+        if not missing:
+            return cards, {}
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            fetched, failures = asyncio.run(self.resolve_many(missing))
+        else:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                fetched, failures = executor.submit(
+                    asyncio.run, self.resolve_many(missing)
+                ).result()
+
+        cards.update(fetched)
+        return {name: cards[name] for name in card_names if name in cards}, failures
+
+    def fetch_card(self, card_name: str) -> Card:
+        """
+        Resolves one card name, usable as the `fetch_card` argument of `Deck.load_deck_from_text`.
+
+        Raises:
+        -------
+        ValueError:
+            If the card could not be resolved.
+        """
+        cards, failures = self.resolve_names([card_name])
+        if card_name in failures:
+            raise ValueError(failures[card_name])
+        return cards[card_name]
+
+    def close(self):
+        """Closes the pooled session and its threads."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._session.close()
+            self._session = None
+            self._executor = None
+
+    def __repr__(self):
+        return (
+            f"CardResolver(base_url: {self.base_url}, {len(self.card_store)} cards, "
+            f"{self.stats['requests']} requests, {self.stats['coalesced']} coalesced, "
+            f"{self.stats['store_hits']} store hits)"
+        )
+
+
+_default_resolver: Optional[CardResolver] = None
+_default_lock = threading.Lock()
+
+
+def get_default_resolver() -> CardResolver:
+    """
+    Returns the resolver shared by deck loads that are not given one (created on first use).
+    """
+    global _default_resolver
+    with _default_lock:
+        if _default_resolver is None:
+            _default_resolver = CardResolver()
+        return _default_resolver
+
+
+def set_default_resolver(resolver: Optional[CardResolver]):
+    """Replaces the shared resolver (None creates a new default one on next use)."""
+    global _default_resolver
+    with _default_lock:
+        _default_resolver = resolver
@@ -0,0 +1,169 @@
+import json
+import logging
+import os
+import threading
+from typing import Dict, Iterable, Optional
+
+from mtgsdk import Card
+
+logger = logging.getLogger(__name__)
+
+
+class CardStore:
+    """
+    A local, in-memory store of card data keyed by card name, persisted as a JSON file.
+
+    It resolves card names without network calls, so decks can be loaded offline and many
+    decks can share the same Card objects. Records saved before the store kept mana costs
+    (without `manaCost`) count as misses, so they are fetched again and replaced.
+
+    Attributes:
+    -----------
+    path : str or None
+        The JSON file backing the store. If None, the store only lives in memory.
+    allow_remote : bool
+        Whether names missing from the store are fetched from the mtgsdk API (and added).
+    """
+
+    def __init__(self, path: Optional[str] = None, allow_remote: bool = False):
+        self.path = path
+        self.allow_remote = allow_remote
+        self._records: Dict[str, dict] = {}
+        self._cards: Dict[str, Card] = {}
+        self._lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as file:
+                self._records = json.load(file)
+            n_stale = sum(
+                not self._is_current(record) for record in self._records.values()
+            )
+            logger.info(
+                f"Loaded {len(self._records)} cards from {path}"
+                + (
+                    f" ({n_stale} without mana cost, to be fetched again)."
+                    if n_stale
+                    else "."
+                )
+            )
+
+    @staticmethod
+    def _is_current(record: dict) -> bool:
+        # Registros antigos não têm manaCost (terrenos têm manaCost None, mas com a chave)
+        return 'manaCost' in record
+
+    @staticmethod
+    def card_to_record(card: Card) -> dict:
+        """
+        Converts a Card into the JSON record stored for it (mtgsdk response field names).
+        """
+        return {
+            'name': card.name,
+            'type': card.type,
+            'types': card.types,
+            'cmc': card.cmc,
+            'manaCost': card.mana_cost,
+            'colors': card.colors,
+            'colorIdentity': card.color_identity,
+            'set': card.set,
+        }
+
+    def add(self, card: Card):
+        """
+        Adds (or replaces) a card in the store.
+
+        Parameters:
+        -----------
+        card : Card
+            The card to be stored under its name.
+        """
+        with self._lock:
+            self._records[card.name] = self.card_to_record(card)
+            self._cards[card.name] = card
+
+    def add_many(self, cards: Iterable[Card]):
+        """Adds several cards to the store."""
+        for card in cards:
+            self.add(card)
+
+    def get(self, card_name: str, allow_stale: bool = False) -> Optional[Card]:
+        """
+        Returns the stored card for a name, or None if it is not in the store.
+
+        The same Card object is returned for every lookup of a name.
+
+        Parameters:
+        -----------
+        card_name : str
+            The name of the card.
+        allow_stale : bool
+            Whether a record without `manaCost` is returned instead of counting as a miss.
+        """
+        record = self._records.get(card_name)
+        if record is None or not (allow_stale or self._is_current(record)):
+            return None
+
+        card = self._cards.get(card_name)
+        if card is None:
+            card = Card(record)
+            with self._lock:
+                card = self._cards.setdefault(card_name, card)
+        return card
+
+    def fetch_card(self, card_name: str) -> Card:
+        """
+        Resolves a card name, usable as the `fetch_card` argument of `Deck.load_deck_from_text`.
+
+        Raises:
+        -------
+        ValueError:
+            If the card is not in the store and remote lookups are disabled or find nothing.
+        """
+        card = self.get(card_name)
+        if card is not None:
+            return card
+
+        if not self.allow_remote:
+            # Sem acesso remoto, um registro antigo ainda serve (com os custos aproximados)
+            card = self.get(card_name, allow_stale=True)
+            if card is not None:
+                logger.warning(
+                    f"Card '{card_name}' has no mana cost in the local card store; "
+                    "colored costs will be approximated."
+                )
+                return card
+            raise ValueError(f"Card '{card_name}' not found in the local card store.")
+
+        cards = Card.where(name=card_name).all()
+        if not cards:
+            raise ValueError(f"Card '{card_name}' not found in the database.")
+
+        self.add(cards[0])
+        return cards[0]
+
+    def save(self, path: Optional[str] = None):
+        """
+        Persists the store as JSON (atomically replacing the previous file).
+        """
+        path = path or self.path
+        if path is None:
+            raise ValueError("No path was given to save the card store.")
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._lock:
+            records = dict(self._records)
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(records, file)
+        os.replace(tmp_path, path)
+
+    def __contains__(self, card_name: str) -> bool:
+        record = self._records.get(card_name)
+        return record is not None and self._is_current(record)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __repr__(self):
+        return f"CardStore({len(self._records)} cards, path: {self.path})"
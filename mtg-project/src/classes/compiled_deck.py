@@ -0,0 +1,392 @@
+import json
+import secrets
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from classes.constants import color_bits
+
+# Features numéricas de cada carta do pool, na ordem dos IDs de carta do pool
+CARD_FEATURES_DTYPE = np.dtype(
+    [('cmc', np.float64), ('is_land', np.bool_), ('color_bits', np.uint8)]
+)
+
+
+class CompiledCard:
+    """
+    A lightweight, read-only card with only the fields the simulation uses.
+
+    One CompiledCard exists per distinct card of a `SharedDeckPool` in each process, shared by
+    every deck of the pool, instead of a full `mtgsdk.Card` per card of every unpickled deck.
+
+    Attributes:
+    -----------
+    card_id : int
+        The ID of the card in the pool's card table.
+    name, type : str
+        As in `mtgsdk.Card`.
+    cmc : int or float
+        Converted mana cost, with the type of the original card.
+    colors : list of str
+        Colors of the card.
+    mana_cost : str or None
+        Mana cost symbols (e.g. "{1}{G}"), used by the colored mana model.
+    color_identity : list of str or None
+        Color identity (the colors a non-basic land produces in the colored mana model).
+    """
+
+    __slots__ = (
+        'card_id',
+        'name',
+        'type',
+        'cmc',
+        'colors',
+        'mana_cost',
+        'color_identity',
+    )
+
+    def __init__(
+        self,
+        card_id: int,
+        name: str,
+        type: str,
+        cmc,
+        colors: List[str],
+        mana_cost: Optional[str] = None,
+        color_identity: Optional[List[str]] = None,
+    ):
+        self.card_id = card_id
+        self.name = name
+        self.type = type
+        self.cmc = cmc
+        self.colors = colors
+        self.mana_cost = mana_cost
+        self.color_identity = color_identity
+
+    def __repr__(self):
+        return f"CompiledCard({self.name}, cmc: {self.cmc})"
+
+
+class CompiledDeck:
+    """
+    A deck backed by a `SharedDeckPool`: the card ID array of the deck plus its metadata.
+
+    It exposes what `Player`, `Library` and `PlayerTracker` read from a `Deck` (`cards`,
+    `deck_name`, `deck_colors`, `is_valid` and `card_ids`), so it can be assigned to a player in
+    place of the original deck, with the same simulation results.
+
+    Attributes:
+    -----------
+    deck_name : str
+        The name of the deck.
+    deck_colors : set of str
+        The colors of the deck.
+    """
+
+    def __init__(self, pool: 'SharedDeckPool', deck_idx: int):
+        metadata = pool._decks[deck_idx]
+        self.deck_name = metadata['deck_name']
+        self.deck_colors = set(metadata['deck_colors'])
+        self._start, self._end = int(pool.offsets[deck_idx]), int(
+            pool.offsets[deck_idx + 1]
+        )
+        self._valid = metadata['is_valid']
+        self._pool = pool
+        self._cards = None
+
+    @property
+    def card_id_array(self) -> np.ndarray:
+        """The pool card IDs of the deck, in the order of the original deck (shared memory view)."""
+        return self._pool.card_id_array[self._start : self._end]
+
+    @property
+    def cards(self) -> List[CompiledCard]:
+        """The cards of the deck, built from the card IDs on first use."""
+        if self._cards is None:
+            pool_cards = self._pool.cards
+            self._cards = [
+                pool_cards[card_id] for card_id in self.card_id_array.tolist()
+            ]
+        return self._cards
+
+    def is_valid(self) -> bool:
+        """Whether the original deck was valid when the pool was created."""
+        return self._valid
+
+    def card_ids(self) -> Dict[str, int]:
+        """Same mapping as `Deck.card_ids` (alphabetical IDs of the distinct card names)."""
+        card_names = sorted({card.name for card in self.cards})
+        return {card_name: card_id for card_id, card_name in enumerate(card_names)}
+
+    def count_lands(self) -> int:
+        return int(self._pool.card_features['is_land'][self.card_id_array].sum())
+
+    def __len__(self):
+        return self._end - self._start
+
+    def __repr__(self):
+        deck_colors = (
+            ', '.join(sorted(self.deck_colors)) if self.deck_colors else "No colors"
+        )
+        return (
+            f"CompiledDeck({self.deck_name}: {len(self)} cards, {self.count_lands()} lands, "
+            f"Colors: {deck_colors})"
+        )
+
+
+# Blocos criados por este processo (os únicos que o resource tracker deve acompanhar)
+_owned_blocks = set()
+
+
+def _attach_block(name: str) -> shared_memory.SharedMemory:
+    """
+    Attaches to an existing shared memory block without tracking it.
+
+    Before Python 3.13 every attaching process registers the block with its resource tracker,
+    which unlinks it when that process exits; only the process that created the pool may do so.
+    """
+    block = shared_memory.SharedMemory(name=name)
+    if name not in _owned_blocks:
+        resource_tracker.unregister(block._name, 'shared_memory')
+    return block
+
+
+class SharedDeckPool:
+    """
+    Compiled decks placed once in `multiprocessing.shared_memory`, for worker processes.
+
+    The pool is made of four shared memory blocks, found through the pool name:
+
+    - ``<name>``: the registry, a JSON document with the card records (name, type, cmc,
+      colors, mana cost and color identity of each distinct card, by pool card ID), the deck
+      metadata (key, name, colors and validity) and the total number of card IDs;
+    - ``<name>_features``: the card feature table (`CARD_FEATURES_DTYPE`, one row per card ID);
+    - ``<name>_ids``: the card ID arrays of every deck, concatenated (int32);
+    - ``<name>_offsets``: where each deck starts in ``<name>_ids`` (int64, one more than decks).
+
+    The process that creates the pool owns it and must `unlink` it when done; workers `attach`
+    by name and only `close` their view. Attaching costs one JSON parse and one `CompiledCard`
+    per distinct card, whatever the number of decks and workers.
+
+    Attributes:
+    -----------
+    name : str
+        The name of the registry block, passed to `attach`.
+    keys : list of str
+        The key of each deck (e.g. the player partition), in pool order.
+    card_features : np.ndarray
+        The card feature table.
+    card_id_array : np.ndarray
+        The card IDs of all decks, concatenated.
+    offsets : np.ndarray
+        The start of each deck in `card_id_array`.
+    """
+
+    def __init__(
+        self, name: str, blocks: Dict[str, shared_memory.SharedMemory], owner: bool
+    ):
+        self.name = name
+        self.owner = owner
+        self._blocks = blocks
+
+        registry_bytes = bytes(blocks['registry'].buf).rstrip(b'\0')
+        registry = json.loads(registry_bytes.decode('utf-8'))
+        self._card_records = registry['cards']
+        self._decks = registry['decks']
+        self.keys = [deck['key'] for deck in self._decks]
+        self._index = {key: deck_idx for deck_idx, key in enumerate(self.keys)}
+
+        n_cards, n_ids = len(self._card_records), registry['n_card_ids']
+        self.card_features = np.ndarray(
+            (n_cards,), dtype=CARD_FEATURES_DTYPE, buffer=blocks['features'].buf
+        )
+        self.card_id_array = np.ndarray(
+            (n_ids,), dtype=np.int32, buffer=blocks['ids'].buf
+        )
+        self.offsets = np.ndarray(
+            (len(self._decks) + 1,), dtype=np.int64, buffer=blocks['offsets'].buf
+        )
+
+        self._cards = None
+        self._compiled: Dict[int, CompiledDeck] = {}
+
+    @staticmethod
+    def _block_names(name: str) -> Dict[str, str]:
+        return {
+            'registry': name,
+            'features': f"{name}_features",
+            'ids': f"{name}_ids",
+            'offsets': f"{name}_offsets",
+        }
+
+    @classmethod
+    def create(
+        cls, decks: Dict[str, object], name: Optional[str] = None
+    ) -> 'SharedDeckPool':
+        """
+        Compiles decks into a new pool owned by the calling process.
+
+        Parameters:
+        -----------
+        decks : Dict[str, Deck]
+            The decks to compile, by key (e.g. the player partition name).
+        name : str, optional
+            The pool name. A random name is used by default.
+
+        Returns:
+        --------
+        SharedDeckPool
+            The pool, which must be unlinked by the caller when no longer used.
+        """
+        name = name or f"mtg_decks_{secrets.token_hex(6)}"
+
+        # Tabela de cartas: um ID por nome de carta distinto, na ordem em que aparecem
+        card_index: Dict[str, int] = {}
+        card_records, features, deck_metadata = [], [], []
+        card_ids, offsets = [], [0]
+        for key, deck in decks.items():
+            for card in deck.cards:
+                card_id = card_index.get(card.name)
+                if card_id is None:
+                    card_id = card_index[card.name] = len(card_records)
+                    colors = list(card.colors or [])
+                    card_records.append(
+                        [
+                            card.name,
+                            card.type,
+                            card.cmc,
+                            colors,
+                            getattr(card, 'mana_cost', None),
+                            getattr(card, 'color_identity', None),
+                        ]
+                    )
+                    features.append(
+                        (
+                            card.cmc or 0,
+                            'Land' in card.type,
+                            sum(color_bits.get(color, 0) for color in set(colors)),
+                        )
+                    )
+                card_ids.append(card_id)
+            offsets.append(len(card_ids))
+            deck_metadata.append(
+                {
+                    'key': key,
+                    'deck_name': deck.deck_name,
+                    'deck_colors': sorted(deck.deck_colors),
+                    'is_valid': bool(deck.is_valid()),
+                }
+            )
+
+        registry_bytes = json.dumps(
+            {'cards': card_records, 'decks': deck_metadata, 'n_card_ids': len(card_ids)}
+        ).encode('utf-8')
+        arrays = {
+            'features': np.array(features, dtype=CARD_FEATURES_DTYPE),
+            'ids': np.array(card_ids, dtype=np.int32),
+            'offsets': np.array(offsets, dtype=np.int64),
+        }
+
+        blocks = {}
+        try:
+            for block, block_name in cls._block_names(name).items():
+                data = registry_bytes if block == 'registry' else arrays[block]
+                size = len(data) if block == 'registry' else data.nbytes
+                # Blocos de tamanho zero não são permitidos
+                blocks[block] = shared_memory.SharedMemory(
+                    name=block_name, create=True, size=max(size, 1)
+                )
+                _owned_blocks.add(block_name)
+                if block == 'registry':
+                    blocks[block].buf[:size] = data
+                else:
+                    np.ndarray(data.shape, dtype=data.dtype, buffer=blocks[block].buf)[
+                        :
+                    ] = data
+        except BaseException:
+            for block_name, shm in zip(
+                cls._block_names(name).values(), blocks.values()
+            ):
+                shm.close()
+                shm.unlink()
+                _owned_blocks.discard(block_name)
+            raise
+
+        return cls(name, blocks, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedDeckPool':
+        """Attaches to a pool created by another process, by its name."""
+        blocks = {}
+        try:
+            for block, block_name in cls._block_names(name).items():
+                blocks[block] = _attach_block(block_name)
+        except BaseException:
+            for shm in blocks.values():
+                shm.close()
+            raise
+        return cls(name, blocks, owner=False)
+
+    @property
+    def cards(self) -> List[CompiledCard]:
+        """One CompiledCard per pool card ID, created on first use."""
+        if self._cards is None:
+            self._cards = [
+                CompiledCard(card_id, *record)
+                for card_id, record in enumerate(self._card_records)
+            ]
+        return self._cards
+
+    def deck(self, key: Union[str, int]) -> CompiledDeck:
+        """
+        Returns a compiled deck by key or position (the same object on every call).
+
+        Raises:
+        -------
+        KeyError:
+            If the pool has no deck with that key.
+        """
+        deck_idx = key if isinstance(key, int) else self._index[key]
+        compiled = self._compiled.get(deck_idx)
+        if compiled is None:
+            compiled = self._compiled[deck_idx] = CompiledDeck(self, deck_idx)
+        return compiled
+
+    def close(self):
+        """Releases this process' view of the pool (the blocks stay available to others)."""
+        # As views numpy apontam para os buffers e precisam ser soltas antes do close
+        self.card_features = self.card_id_array = self.offsets = None
+        self._compiled.clear()
+        for shm in self._blocks.values():
+            shm.close()
+
+    def unlink(self):
+        """Destroys the pool's blocks (owner only, after every worker is done)."""
+        if not self.owner:
+            raise RuntimeError("Only the process that created the pool can unlink it.")
+        for block_name, shm in zip(
+            self._block_names(self.name).values(), self._blocks.values()
+        ):
+            shm.unlink()
+            _owned_blocks.discard(block_name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        if self.owner:
+            self.unlink()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def __repr__(self):
+        return (
+            f"SharedDeckPool({self.name}: {len(self)} decks, {len(self._card_records)} cards, "
+            f"{len(self.card_id_array)} card IDs)"
+        )
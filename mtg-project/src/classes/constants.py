@@ -53,6 +53,9 @@ land_colors = {
     'Swamp': {'B'},  # Black
 }
 
+# Bit de cada cor nas máscaras de cores (ex.: W | U = 3 para um deck azorius)
+color_bits = {'W': 1, 'U': 2, 'B': 4, 'R': 8, 'G': 16}
+
 color_combinations = {
     "monowhite": {"w": 1, "u": 0, "b": 0, "r": 0, "g": 0},  # W
     "monoblue": {"w": 0, "u": 1, "b": 0, "r": 0, "g": 0},  # U
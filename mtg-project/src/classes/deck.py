@@ -2,9 +2,7 @@ import re
 from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Union
 
-import pandas as pd
-from mtgsdk import Card
-
+from classes.card_resolver import get_default_resolver
 from classes.constants import (
     color_combinations,
     color_combinations_abbreviated,
@@ -57,22 +55,39 @@ class Deck:
         self.exception_cards = exception_cards or []
         self.cards = []
 
-    def load_deck_from_txt(self, file_path: str):
+    def load_deck_from_txt(self, file_path: str, fetch_card=None):
         """
         Loads the deck name and cards from a .txt file and assigns them to the Deck object.
 
         Args:
             file_path (str): The path to the .txt file containing the deck information.
+            fetch_card (Callable[[str], Card], optional): Resolves a card name to a Card.
+                Defaults to the shared `CardResolver` (see `classes.card_resolver`).
 
         Returns:
             None
         """
         with open(file_path, 'r') as file:
-            lines = file.readlines()
+            decklist_text = file.read()
+
+        self.load_deck_from_text(decklist_text, fetch_card=fetch_card)
+
+    @staticmethod
+    def parse_decklist(decklist_text: str):
+        """
+        Parses a decklist in the .txt format ("Name <deck name>", then "Deck" and one
+        "<quantity> <card name>" line per card).
 
+        Args:
+            decklist_text (str): The decklist contents.
+
+        Returns:
+            Tuple[str, Dict[str, int]]: The cleaned deck name (or None) and the card quantities,
+            in the order the cards first appear.
+        """
         # Extrair o nome do deck
+        deck_name = None
         deck_list_started = False
-        card_names = []
         card_quantities = {}
 
         def clean_text(text):
@@ -82,10 +97,10 @@ class Deck:
             text = re.sub(r'[^a-z0-9\s]', '', text)
             return text
 
-        for line in lines:
+        for line in decklist_text.splitlines():
             line = line.strip()
             if line.startswith('Name'):
-                self.deck_name = clean_text(line.split(' ', 1)[1].strip())
+                deck_name = clean_text(line.split(' ', 1)[1].strip())
             elif line.startswith('Deck'):
                 deck_list_started = True
             elif deck_list_started and line:
@@ -95,34 +110,60 @@ class Deck:
                 card_name = card_name.strip()
 
                 # Armazenar os nomes e quantidades
-                if card_name in card_quantities:
-                    card_quantities[card_name] += quantity
-                else:
-                    card_quantities[card_name] = quantity
-                    card_names.append(card_name)
-
-        # Função para buscar uma carta específica
-        def fetch_card(card_name):
-            cards = Card.where(name=card_name).all()
-            if not cards:
-                raise ValueError(f"Card '{card_name}' not found in the database.")
-            return cards[0]
-
-        # Usar ThreadPoolExecutor para buscar cartas em paralelo
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            future_to_card_name = {
-                executor.submit(fetch_card, name): name for name in card_names
-            }
-            cards_dict = {}
-            for future in future_to_card_name:
-                card_name = future_to_card_name[future]
-                try:
-                    card = future.result()
-                    cards_dict[card_name] = card
-                except Exception as exc:
-                    raise ValueError(
-                        f"Card '{card_name}' generated an exception: {exc}"
-                    )
+                card_quantities[card_name] = (
+                    card_quantities.get(card_name, 0) + quantity
+                )
+
+        return deck_name, card_quantities
+
+    def load_deck_from_text(self, decklist_text: str, fetch_card=None, cards=None):
+        """
+        Loads the deck name and cards from a decklist text (see `parse_decklist`).
+
+        Args:
+            decklist_text (str): The decklist contents.
+            fetch_card (Callable[[str], Card], optional): Resolves a card name to a Card.
+                Defaults to the shared `CardResolver` (see `classes.card_resolver`).
+            cards (Dict[str, Card], optional): Cards already resolved by name (e.g. for a whole
+                deck pool at once). If given, the deck is built from them without any lookups
+                and `fetch_card` is ignored.
+
+        Returns:
+            None
+        """
+        deck_name, card_quantities = self.parse_decklist(decklist_text)
+        if deck_name is not None:
+            self.deck_name = deck_name
+
+        if cards is not None:
+            # Cartas já resolvidas: monta o deck sem novas buscas
+            for card_name in card_quantities:
+                if card_name not in cards:
+                    raise ValueError(f"Card '{card_name}' was not resolved.")
+            cards_dict = cards
+        elif fetch_card is None:
+            # Resolver compartilhado: uma passada concorrente por todas as cartas do deck,
+            # reaproveitando as cartas já resolvidas por outros decks da execução
+            cards_dict, failures = get_default_resolver().resolve_names(card_quantities)
+            if failures:
+                card_name, reason = next(iter(failures.items()))
+                raise ValueError(f"Card '{card_name}' generated an exception: {reason}")
+        else:
+            # Usar ThreadPoolExecutor para buscar cartas em paralelo
+            with ThreadPoolExecutor(max_workers=10) as executor:
+                future_to_card_name = {
+                    executor.submit(fetch_card, name): name for name in card_quantities
+                }
+                cards_dict = {}
+                for future in future_to_card_name:
+                    card_name = future_to_card_name[future]
+                    try:
+                        card = future.result()
+                        cards_dict[card_name] = card
+                    except Exception as exc:
+                        raise ValueError(
+                            f"Card '{card_name}' generated an exception: {exc}"
+                        )
 
         # Adicionar as cartas ao deck
         for card_name, quantity in card_quantities.items():
@@ -209,6 +250,16 @@ class Deck:
                 land_colors.update(self.determine_land_color(card))
         return land_colors
 
+    def card_ids(self) -> Dict[str, int]:
+        """
+        Maps each distinct card name in the deck to a compact integer ID.
+
+        IDs follow the alphabetical order of the card names, so the same decklist
+        always produces the same mapping and logged IDs can be decoded back to names.
+        """
+        card_names = sorted({card.name for card in self.cards})
+        return {card_name: card_id for card_id, card_name in enumerate(card_names)}
+
     def remove_card(self, card):
         """
         Removes a card from the deck.
@@ -222,12 +273,12 @@ class Deck:
         """
         Adds a list of cards to the deck based on a dictionary input.
         """
+        cards, failures = get_default_resolver().resolve_names(decklist)
         for card_name, quantity in decklist.items():
-            cards = Card.where(name=card_name).all()
-            if not cards:
-                raise ValueError(f"Card '{card_name}' not found in the database.")
+            if card_name in failures:
+                raise ValueError(failures[card_name])
 
-            card = cards[0]
+            card = cards[card_name]
             for _ in range(quantity):
                 self.add_card(card)
 
@@ -264,6 +315,9 @@ class Deck:
             Union[Dict[str, int], str]: A dictionary with the colors and their binary values (1 for present, 0 for absent)
                                         or an error message if the color combination is not found.
         """
+        # O pandas só é necessário aqui; importá-lo no módulo atrasaria todo import de Deck
+        import pandas as pd
+
         deck_name = self.deck_name
 
         # Building up the colors dataframe
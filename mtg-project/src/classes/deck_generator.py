@@ -0,0 +1,222 @@
+import logging
+import random
+from typing import Dict, List, Optional, Tuple
+
+from mtgsdk import Card
+
+from classes.constants import land_colors, mtg_formats
+from classes.deck import Deck
+
+logger = logging.getLogger(__name__)
+
+# Terreno básico de cada cor (inverso de land_colors)
+BASIC_LAND_BY_COLOR = {
+    color: land_name for land_name, colors in land_colors.items() for color in colors
+}
+
+
+class SyntheticDeckGenerator:
+    """
+    Generates valid decks from parametric distributions, without any card database lookup.
+
+    Spells are drawn from a synthetic card pool shared by all generated decks (one list of
+    cards per color and mana value, created on demand), so decks reuse the same Card objects.
+    Every generated deck passes `Deck.is_valid` for its format.
+
+    Attributes:
+    -----------
+    land_ratio : Tuple[float, float]
+        Mean and standard deviation of the fraction of lands in a deck. The land count is
+        clipped to the format's limits.
+    cmc_weights : Dict[int, float]
+        Relative weight of each mana value among the spells.
+    color_count_weights : Dict[int, float]
+        Relative weight of the number of colors (1 to 5) of a deck.
+    max_copies : int
+        Maximum number of copies of each spell, further limited by the format.
+    cards_per_slot : int
+        Number of distinct synthetic spells per (color, mana value) in the card pool.
+    seed : int or None
+        Seed of the generator; the same seed and parameters generate the same decks.
+    """
+
+    def __init__(
+        self,
+        land_ratio: Tuple[float, float] = (0.40, 0.03),
+        cmc_weights: Optional[Dict[int, float]] = None,
+        color_count_weights: Optional[Dict[int, float]] = None,
+        max_copies: int = 4,
+        cards_per_slot: int = 50,
+        seed: Optional[int] = None,
+    ):
+        self.land_ratio = tuple(land_ratio)
+        self.cmc_weights = {
+            int(cmc): weight
+            for cmc, weight in (
+                cmc_weights or {1: 0.15, 2: 0.25, 3: 0.25, 4: 0.15, 5: 0.10, 6: 0.10}
+            ).items()
+        }
+        self.color_count_weights = {
+            int(n_colors): weight
+            for n_colors, weight in (
+                color_count_weights or {1: 0.40, 2: 0.45, 3: 0.15}
+            ).items()
+        }
+        self.max_copies = max_copies
+        self.cards_per_slot = cards_per_slot
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+        self._lands = {
+            color: Card(
+                {
+                    'name': land_name,
+                    'type': f'Basic Land — {land_name}',
+                    'types': ['Land'],
+                    'cmc': 0,
+                    'colors': [],
+                }
+            )
+            for color, land_name in BASIC_LAND_BY_COLOR.items()
+        }
+        self._spells: Dict[Tuple[str, int], List[Card]] = {}
+
+    def _spell_pool(self, color: str, cmc: int) -> List[Card]:
+        """
+        Returns the synthetic spells of a color and mana value, creating them on first use.
+        """
+        pool = self._spells.get((color, cmc))
+        if pool is None:
+            pool = [
+                Card(
+                    {
+                        'name': f'Synthetic {color}{cmc} #{card_idx:03d}',
+                        'type': 'Creature',
+                        'types': ['Creature'],
+                        'cmc': cmc,
+                        'colors': [color],
+                    }
+                )
+                for card_idx in range(self.cards_per_slot)
+            ]
+            self._spells[(color, cmc)] = pool
+        return pool
+
+    def _land_count(self, deck: Deck, deck_size: int) -> int:
+        """Draws the number of lands, clipped to the format's limits."""
+        mean, std = self.land_ratio
+        n_lands = round(deck_size * self.rng.gauss(mean, std))
+        return min(max(n_lands, deck.min_lands), deck.max_lands)
+
+    def _spell_copies(self, deck: Deck) -> int:
+        """Maximum copies of each spell allowed by both the generator and the format."""
+        if deck.max_copies_per_card == "No limit":
+            return self.max_copies
+        return min(self.max_copies, deck.max_copies_per_card)
+
+    def generate(self, format_name: str = "Standard", deck_name: str = None) -> Deck:
+        """
+        Generates a single valid deck for a format.
+
+        Parameters:
+        -----------
+        format_name : str
+            A format from `classes.constants.mtg_formats`.
+        deck_name : str, optional
+            The name of the deck.
+
+        Returns:
+        --------
+        Deck
+            A deck with exactly the format's minimum number of cards.
+
+        Raises:
+        -------
+        ValueError:
+            If the card pool is too small to fill the deck under the copy limit.
+
+        Notes:
+        ------
+        Cards are appended to `deck.cards` directly instead of through `Deck.add_card`,
+        whose per-card copy count makes building many decks quadratic.
+        """
+        deck = Deck(format_name=format_name, deck_name=deck_name)
+        deck_size = deck.min_cards
+        n_lands = self._land_count(deck, deck_size)
+        n_spells = deck_size - n_lands
+
+        n_colors = self.rng.choices(
+            list(self.color_count_weights),
+            weights=list(self.color_count_weights.values()),
+        )[0]
+        colors = self.rng.sample(sorted(BASIC_LAND_BY_COLOR), n_colors)
+
+        # Terrenos básicos distribuídos igualmente entre as cores do deck
+        for land_idx in range(n_lands):
+            deck.cards.append(self._lands[colors[land_idx % n_colors]])
+
+        # Mágicas: cada carta sorteada entra com até `copies` cópias
+        copies = self._spell_copies(deck)
+        cmcs = list(self.cmc_weights)
+        cmc_weights = list(self.cmc_weights.values())
+        used = set()
+        while n_spells > 0:
+            color = self.rng.choice(colors)
+            cmc = self.rng.choices(cmcs, weights=cmc_weights)[0]
+            available = [
+                card for card in self._spell_pool(color, cmc) if card.name not in used
+            ]
+            if not available:
+                if len(used) >= len(colors) * len(cmcs) * self.cards_per_slot:
+                    raise ValueError(
+                        f"Card pool too small for a {format_name} deck; increase cards_per_slot."
+                    )
+                continue
+
+            card = self.rng.choice(available)
+            used.add(card.name)
+            n_copies = min(copies, n_spells)
+            deck.cards.extend([card] * n_copies)
+            n_spells -= n_copies
+
+        deck.deck_colors.update(colors)
+
+        # Conferência final, já que as cartas não passam pelo add_card
+        if not deck.is_valid():
+            raise ValueError(f"Generated an invalid {format_name} deck: {deck}")
+
+        return deck
+
+    def generate_many(
+        self, n_decks: int, formats: Optional[List[str]] = None
+    ) -> Dict[str, Deck]:
+        """
+        Generates several decks, cycling through the given formats.
+
+        Parameters:
+        -----------
+        n_decks : int
+            Number of decks to generate.
+        formats : List[str], optional
+            Formats to cycle through. Defaults to every format in `mtg_formats`.
+
+        Returns:
+        --------
+        Dict[str, Deck]
+            Decks keyed by their (unique) names.
+        """
+        formats = formats or list(mtg_formats)
+        decks = {}
+        for deck_idx in range(n_decks):
+            format_name = formats[deck_idx % len(formats)]
+            deck_name = f"Synthetic {format_name} {deck_idx:06d}"
+            decks[deck_name] = self.generate(format_name, deck_name)
+
+        logger.info(f"Generated {len(decks)} synthetic decks ({', '.join(formats)}).")
+        return decks
+
+    def __repr__(self):
+        return (
+            f"SyntheticDeckGenerator(seed: {self.seed}, land_ratio: {self.land_ratio}, "
+            f"{sum(len(pool) for pool in self._spells.values())} spells in the pool)"
+        )
@@ -0,0 +1,144 @@
+import hashlib
+import json
+import weakref
+from typing import List, Tuple
+
+from classes.compiled_deck import CompiledCard
+from classes.constants import color_bits
+from classes.mana import land_color_mask, spell_color_pips
+
+# Versão das regras de simulação (Player e match_kernel): mudar sempre que as regras mudarem,
+# para invalidar os resultados guardados por assinatura
+RULES_VERSION = 1
+
+
+def card_features(card, colored_mana: bool = True) -> Tuple:
+    """
+    The features of a card the simulation depends on: whether it is a land, its mana value
+    (with its type, as `spent_mana` keeps it) and, with colored mana, the colors the land
+    produces or the colored pips of the spell (see `classes.mana`).
+    """
+    is_land = 'Land' in card.type
+    if not colored_mana:
+        colors = ()
+    elif is_land:
+        colors = (land_color_mask(card),)
+    else:
+        colors = tuple(sorted(spell_color_pips(card)))
+    return (is_land, type(card.cmc).__name__, card.cmc, colors)
+
+
+class DeckSignature:
+    """
+    The simulation signature of a deck: a hash of the features of its cards in a canonical
+    order.
+
+    The Player engine (and the compiled kernel) only look at these features, so every deck
+    with the same multiset of features plays the same matches when simulated in the canonical
+    order (lands, then spells, by mana value and colors) with the same seed, whatever the card
+    names. Simulation can then run once per signature, on a `SignatureDeck`, and be mapped
+    back to each deck by card position.
+
+    Attributes:
+    -----------
+    signature : str
+        The hash of the canonical features.
+    cards : list of Card
+        The cards of the deck in the canonical order (ties broken by name).
+    features : list of tuple
+        The `card_features` of `cards`.
+    colored_mana : bool
+        Whether the colors are part of the features.
+    """
+
+    def __init__(self, deck, colored_mana: bool = True):
+        self.colored_mana = colored_mana
+        features = [(card_features(card, colored_mana), card) for card in deck.cards]
+        features.sort(key=lambda item: (_sort_key(item[0]), item[1].name))
+        self.cards: List = [card for _, card in features]
+        self.features = [feature for feature, _ in features]
+        payload = json.dumps([RULES_VERSION, colored_mana, self.features])
+        self.signature = hashlib.sha1(payload.encode()).hexdigest()
+
+    def __repr__(self):
+        return f"DeckSignature({self.signature[:12]}, {len(self.cards)} cards)"
+
+
+def _sort_key(features: Tuple) -> Tuple:
+    is_land, _, cmc, colors = features
+    return (not is_land, float(cmc or 0), colors)
+
+
+# Assinaturas por deck, liberadas junto com o deck
+_signatures = weakref.WeakKeyDictionary()
+
+
+def deck_signature(deck, colored_mana: bool = True) -> DeckSignature:
+    """Returns the simulation signature of a deck (computed once per deck object and mode)."""
+    by_mode = _signatures.get(deck)
+    if by_mode is None:
+        by_mode = _signatures[deck] = {}
+    signature = by_mode.get(colored_mana)
+    if signature is None:
+        signature = by_mode[colored_mana] = DeckSignature(deck, colored_mana)
+    return signature
+
+
+class SignatureDeck:
+    """
+    A positional deck with the features of a signature, to simulate it once for every deck
+    that shares it.
+
+    Card `i` is the `i`-th card in the canonical order, named by its position (zero-padded,
+    so the `card_ids` of the compact hand log are the positions), and each position is a
+    distinct card object. Lands lose their names, so the colors they produce are kept as
+    their color identity. A match of this deck logged in compact mode gives the positions of
+    the cards in each hand and graveyard, which `DeckSignature.cards` of any deck with the same
+    signature maps back to its own cards.
+
+    Attributes:
+    -----------
+    signature : str
+    deck_name : str
+    deck_colors : set of str
+    """
+
+    def __init__(self, deck, colored_mana: bool = True):
+        signature = deck_signature(deck, colored_mana)
+        self.signature = signature.signature
+        self.deck_name = f"Signature {self.signature[:12]}"
+        self.deck_colors = set(deck.deck_colors)
+        self._valid = bool(deck.is_valid())
+        width = len(str(len(signature.cards)))
+        self.cards = []
+        for position, card in enumerate(signature.cards):
+            color_identity = getattr(card, 'color_identity', None)
+            if 'Land' in card.type:
+                mask = land_color_mask(card)
+                color_identity = [
+                    color for color, bit in color_bits.items() if mask & bit
+                ]
+            self.cards.append(
+                CompiledCard(
+                    position,
+                    f"{position:0{width}d}",
+                    card.type,
+                    card.cmc,
+                    list(card.colors or []),
+                    getattr(card, 'mana_cost', None),
+                    color_identity,
+                )
+            )
+
+    def is_valid(self) -> bool:
+        return self._valid
+
+    def card_ids(self):
+        """The position of each card (its name), as `Deck.card_ids`."""
+        return {card.name: card.card_id for card in self.cards}
+
+    def __len__(self):
+        return len(self.cards)
+
+    def __repr__(self):
+        return f"SignatureDeck({self.signature[:12]}: {len(self)} cards)"
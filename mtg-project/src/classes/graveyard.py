@@ -21,6 +21,10 @@ class Graveyard:
     def __init__(self):
         self.cards = []
 
+    def reset(self):
+        """Empties the graveyard in place (see `MatchState`)."""
+        self.cards.clear()
+
     def add_card(self, card: Card):
         """
         Adds a card to the graveyard.
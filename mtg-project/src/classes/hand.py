@@ -1,6 +1,9 @@
+from typing import TYPE_CHECKING
+
 from mtgsdk import Card
 
-from classes.library import Library
+if TYPE_CHECKING:
+    from classes.library import Library
 
 
 class Hand:
@@ -20,6 +23,11 @@ class Hand:
         self.cards = []
         self.hand_size = 0
 
+    def reset(self):
+        """Empties the hand in place (see `MatchState`)."""
+        self.cards.clear()
+        self.hand_size = 0
+
     def add_card(self, card: Card):
         """Adiciona uma carta específica à mão."""
         self.cards.append(card)
@@ -48,9 +56,8 @@ class Hand:
         Organizes the hand by placing land cards at the beginning of the list
         and other cards at the end.
         """
-        lands = [card for card in self.cards if 'Land' in card.type]
-        non_lands = [card for card in self.cards if 'Land' not in card.type]
-        self.cards = lands + non_lands
+        # Ordenação estável e no lugar: mantém a ordem relativa de terrenos e não terrenos
+        self.cards.sort(key=lambda card: 'Land' not in card.type)
 
     def is_above_hand_limit(self) -> bool:
         """Verifica se o número de cartas na mão está acima do limite permitido."""
@@ -16,9 +16,15 @@ class Library:
     -----------
     cards : list of Card
         The cards currently in the library (deck).
+    deck_cards : list of Card
+        The cards of the deck, in the deck order, restored by `reset`.
+    rng : random.Random or None
+        The random number generator used to shuffle. If None, the global `random` module is used.
     """
 
-    def __init__(self, deck: Deck):
+    rng = None
+
+    def __init__(self, deck: Deck, rng: random.Random = None):
         """
         Constructs all the necessary attributes for the Library object.
 
@@ -26,13 +32,31 @@ class Library:
         -----------
         deck : Deck
             The deck from which the library will be constructed. It must be a valid deck.
+        rng : random.Random, optional
+            The random number generator used to shuffle (e.g. seeded per match).
         """
         if not deck.is_valid():
             raise ValueError("The deck provided is not valid.")
 
+        self.rng = rng
+        self.deck_cards = deck.cards
         self.cards = deck.cards[:]
         self.library_size = len(self.cards)
 
+    def reset(self, rng: random.Random = None):
+        """
+        Puts every card of the deck back in the library, in the deck order (unshuffled),
+        reusing the same list.
+
+        Parameters:
+        -----------
+        rng : random.Random, optional
+            The random number generator used by the following shuffles.
+        """
+        self.rng = rng
+        self.cards[:] = self.deck_cards
+        self.library_size = len(self.cards)
+
     def draw_card(self):
         """
         Draws a single card from the library.
@@ -68,7 +92,7 @@ class Library:
         """
         Shuffles the library.
         """
-        random.shuffle(self.cards)
+        (self.rng or random).shuffle(self.cards)
 
     def __len__(self):
         """
@@ -0,0 +1,170 @@
+import re
+import weakref
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from classes.constants import color_bits, land_colors
+
+# Símbolos de custo de mana (ex.: "{2}{G}{G/W}")
+MANA_SYMBOL = re.compile(r'\{([^}]*)\}')
+
+
+def color_mask(colors: Iterable[str]) -> int:
+    """The bitmask of a set of colors (see `classes.constants.color_bits`)."""
+    mask = 0
+    for color in colors or ():
+        mask |= color_bits.get(color, 0)
+    return mask
+
+
+def land_color_mask(card) -> int:
+    """
+    The colors of mana a land produces, as a bitmask.
+
+    Basic lands (and lands named after them, e.g. "Snow-Covered Forest") produce the colors in
+    `classes.constants.land_colors`; other lands produce their color identity, when the card
+    data has one. A land with no known color only pays generic costs.
+    """
+    for land_name, colors in land_colors.items():
+        if land_name in card.name:
+            return color_mask(colors)
+    return color_mask(getattr(card, 'color_identity', None))
+
+
+def spell_color_pips(card) -> List[int]:
+    """
+    The colored pips of a spell's cost, one bitmask per pip.
+
+    A hybrid pip ({G/W}) is a mask of both colors. Generic, colorless ({C}), {X}, Phyrexian
+    ({G/P}) and two-brid ({2/W}) symbols only count in the mana value, as they can all be paid
+    without that color. Cards without a mana cost in their data (e.g. synthetic cards) need
+    one pip of each of their colors, up to their mana value.
+    """
+    mana_cost = getattr(card, 'mana_cost', None)
+    if mana_cost is None:
+        colors = sorted(card.colors or [], key=lambda color: color_bits.get(color, 0))
+        return [color_bits[color] for color in colors if color in color_bits][
+            : int(card.cmc or 0)
+        ]
+
+    pips = []
+    for symbol in MANA_SYMBOL.findall(mana_cost):
+        parts = symbol.split('/')
+        if any(part not in color_bits for part in parts):
+            continue
+        pips.append(color_mask(parts))
+    return pips
+
+
+class DeckMana:
+    """
+    The colored mana model of a deck, precomputed once per deck.
+
+    Castability is a bipartite matching between the colored pips of the spells and the lands
+    on the battlefield (each land pays one pip of a color it produces; the remaining lands pay
+    the generic part). By Hall's theorem, the pips can be paid if and only if, for every set
+    of colors T, the pips whose colors are all in T are no more than the lands that produce
+    some color of T. Only the sets of colors the deck's spells require matter, so each spell
+    carries its pip counts and each land its contribution over those sets (`subsets`), and a
+    castability check is one comparison per set.
+
+    Attributes:
+    -----------
+    subsets : tuple of int
+        The nonempty subsets (bitmasks) of the colors required by the deck's spells.
+    land_supply : Dict[str, tuple of int]
+        For each land name, 1 for each subset with a color the land produces.
+    spell_needs : Dict[str, tuple of int]
+        For each spell name with colored pips, the number of pips within each subset.
+    """
+
+    def __init__(self, cards: Iterable):
+        cards = list(cards)
+        lands = {card.name: card for card in cards if 'Land' in card.type}
+        spells = {card.name: card for card in cards if 'Land' not in card.type}
+
+        pips = {name: spell_color_pips(card) for name, card in spells.items()}
+        required = 0
+        for spell_pips in pips.values():
+            for pip in spell_pips:
+                required |= pip
+        self.subsets = tuple(
+            subset for subset in range(1, 32) if subset & required == subset
+        )
+
+        self.land_supply: Dict[str, Tuple[int, ...]] = {
+            name: tuple(
+                int(land_color_mask(card) & subset != 0) for subset in self.subsets
+            )
+            for name, card in lands.items()
+        }
+        self.spell_needs: Dict[str, Tuple[int, ...]] = {
+            name: tuple(
+                sum(1 for pip in spell_pips if pip & subset == pip)
+                for subset in self.subsets
+            )
+            for name, spell_pips in pips.items()
+            if spell_pips
+        }
+
+    def empty_supply(self) -> List[int]:
+        """The supply of an empty battlefield (one count per subset)."""
+        return [0] * len(self.subsets)
+
+    def add_land(self, supply: List[int], card):
+        """Adds a land to a battlefield's supply, in place."""
+        land_supply = self.land_supply.get(card.name)
+        if land_supply is None:
+            land_supply = self.land_supply[card.name] = tuple(
+                int(land_color_mask(card) & subset != 0) for subset in self.subsets
+            )
+        for idx, count in enumerate(land_supply):
+            supply[idx] += count
+
+    def commit(self, committed: List[int], card, supply: List[int]) -> bool:
+        """
+        Checks if a spell's colored pips can be paid along with the pips already committed
+        this turn and, if so, commits them (in place).
+
+        Parameters:
+        -----------
+        committed : list of int
+            The pips committed this turn, per subset (starts as `empty_supply()`).
+        card : Card
+            The spell.
+        supply : list of int
+            The battlefield's supply (see `Battlefield.color_supply`).
+
+        Returns:
+        --------
+        bool
+            Whether the spell's colors can be paid (the generic part is checked by the caller).
+        """
+        need = self.spell_needs.get(card.name)
+        if need is None:
+            return True
+        for used, count, available in zip(committed, need, supply):
+            if used + count > available:
+                return False
+        for idx, count in enumerate(need):
+            committed[idx] += count
+        return True
+
+    def __repr__(self):
+        return (
+            f"DeckMana({len(self.subsets)} color subsets, {len(self.land_supply)} lands, "
+            f"{len(self.spell_needs)} colored spells)"
+        )
+
+
+# Modelo de mana por deck, liberado junto com o deck
+_deck_mana = weakref.WeakKeyDictionary()
+
+
+def deck_mana(deck) -> Optional[DeckMana]:
+    """Returns the colored mana model of a deck (built once per deck object), or None."""
+    if deck is None:
+        return None
+    mana = _deck_mana.get(deck)
+    if mana is None:
+        mana = _deck_mana[deck] = DeckMana(deck.cards)
+    return mana
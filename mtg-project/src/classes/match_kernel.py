@@ -0,0 +1,767 @@
+"""
+Compiled match kernel: the rules of `Player.play_a_match` over integer arrays.
+
+The kernel plays whole matches (opening hand, mulligans and turns) on card keys instead of
+`Card` objects, and draws its random numbers from a port of CPython's Mersenne Twister, so a
+match seeded with the state of a `random.Random` consumes the same random stream, and produces
+the same tracker rows, as the Player engine. Colored mana follows `classes.mana.DeckMana`: each
+card key carries its land supply or spell pip counts over the deck's color subsets. With Numba installed, the kernel is compiled in
+nopython mode; without it, the same functions run as (slow) plain Python, which is only useful
+to check the rules (see `classes.match_kernel.NUMBA_AVAILABLE`).
+"""
+
+import random
+import weakref
+from typing import List, Sequence
+
+import numpy as np
+
+from classes.mana import deck_mana
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Stand-in for `numba.njit` when Numba is not installed: returns the function as is."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+# Mersenne Twister (MT19937), como no módulo random do CPython
+MT_N = 624
+MT_M = 397
+MT_MATRIX_A = 0x9908B0DF
+MT_UPPER_MASK = 0x80000000
+MT_LOWER_MASK = 0x7FFFFFFF
+
+OPENING_HAND_SIZE = 7
+MAX_HAND_SIZE = 7
+
+# Colunas de `stats`, na ordem do PlayerTracker
+STAT_COLUMNS = (
+    'turn',
+    'mulligan_count',
+    'lands_played',
+    'spells_played',
+    'mana_pool',
+    'spent_mana',
+    'hand_size',
+    'library_size',
+    'graveyard_size',
+)
+(
+    TURN,
+    MULLIGAN_COUNT,
+    LANDS_PLAYED,
+    SPELLS_PLAYED,
+    MANA_POOL,
+    SPENT_MANA,
+    HAND_SIZE,
+    LIBRARY_SIZE,
+    GRAVEYARD_SIZE,
+) = range(len(STAT_COLUMNS))
+
+# Códigos de retorno do kernel
+OK = 0
+EMPTY_LIBRARY = 1
+
+
+@njit(cache=True)
+def _genrand_uint32(state):
+    """Next 32-bit output of the generator (`state`: 624 words plus the position)."""
+    idx = state[MT_N]
+    if idx >= MT_N:
+        for kk in range(MT_N - MT_M):
+            y = (state[kk] & MT_UPPER_MASK) | (state[kk + 1] & MT_LOWER_MASK)
+            state[kk] = state[kk + MT_M] ^ (y >> 1) ^ (MT_MATRIX_A if y & 1 else 0)
+        for kk in range(MT_N - MT_M, MT_N - 1):
+            y = (state[kk] & MT_UPPER_MASK) | (state[kk + 1] & MT_LOWER_MASK)
+            state[kk] = (
+                state[kk + (MT_M - MT_N)] ^ (y >> 1) ^ (MT_MATRIX_A if y & 1 else 0)
+            )
+        y = (state[MT_N - 1] & MT_UPPER_MASK) | (state[0] & MT_LOWER_MASK)
+        state[MT_N - 1] = state[MT_M - 1] ^ (y >> 1) ^ (MT_MATRIX_A if y & 1 else 0)
+        idx = 0
+
+    y = state[idx]
+    state[MT_N] = idx + 1
+    y ^= y >> 11
+    y ^= (y << 7) & 0x9D2C5680
+    y ^= (y << 15) & 0xEFC60000
+    y ^= y >> 18
+    return y
+
+
+@njit(cache=True)
+def _random(state):
+    """Same as `random.Random.random`."""
+    a = _genrand_uint32(state) >> 5
+    b = _genrand_uint32(state) >> 6
+    return (a * 67108864.0 + b) * (1.0 / 9007199254740992.0)
+
+
+@njit(cache=True)
+def _randbelow(state, n):
+    """Same as `random.Random._randbelow` (rejection sampling over `n.bit_length()` bits)."""
+    k = 0
+    while (n >> k) > 0:
+        k += 1
+    r = _genrand_uint32(state) >> (32 - k)
+    while r >= n:
+        r = _genrand_uint32(state) >> (32 - k)
+    return r
+
+
+@njit(cache=True)
+def _shuffle(state, cards, start, end):
+    """Same as `random.Random.shuffle` on `cards[start:end]`."""
+    for i in range(end - start - 1, 0, -1):
+        j = _randbelow(state, i + 1)
+        tmp = cards[start + i]
+        cards[start + i] = cards[start + j]
+        cards[start + j] = tmp
+
+
+@njit(cache=True)
+def _remove_first(cards, length, card):
+    """Removes the first occurrence of `card` (as `list.remove`) and returns the new length."""
+    for i in range(length):
+        if cards[i] == card:
+            for k in range(i, length - 1):
+                cards[k] = cards[k + 1]
+            return length - 1
+    return length
+
+
+@njit(cache=True)
+def _first_max_cmc(hand, hand_len, cmc):
+    """First card with the highest mana value (as `max(cards, key=cmc)`)."""
+    best = hand[0]
+    for i in range(1, hand_len):
+        if cmc[hand[i]] > cmc[best]:
+            best = hand[i]
+    return best
+
+
+@njit(cache=True)
+def _organize(hand, hand_len, is_land, scratch):
+    """`Hand.organize`: lands first, keeping the relative order of lands and non-lands."""
+    n = 0
+    for i in range(hand_len):
+        if is_land[hand[i]]:
+            scratch[n] = hand[i]
+            n += 1
+    for i in range(hand_len):
+        if not is_land[hand[i]]:
+            scratch[n] = hand[i]
+            n += 1
+    for i in range(hand_len):
+        hand[i] = scratch[i]
+
+
+@njit(cache=True)
+def _draw_opening_hand(state, deck_keys, library, hand, is_land, scratch):
+    """
+    `Player.draw_initial_hand`: the whole deck back in the library, shuffled, and 7 cards
+    drawn. Returns the library start and end and the hand length.
+    """
+    n_cards = len(deck_keys)
+    library[:n_cards] = deck_keys
+    _shuffle(state, library, 0, n_cards)
+    for i in range(OPENING_HAND_SIZE):
+        hand[i] = library[i]
+    _organize(hand, OPENING_HAND_SIZE, is_land, scratch)
+    return OPENING_HAND_SIZE, n_cards, OPENING_HAND_SIZE
+
+
+@njit(cache=True)
+def _add_supply(supply, color_mana, land):
+    """`Battlefield.add_land`: adds a land's colors to the battlefield supply."""
+    for subset in range(supply.shape[0]):
+        supply[subset] += color_mana[land, subset]
+
+
+@njit(cache=True)
+def _commit_colors(committed, color_mana, spell, supply):
+    """`DeckMana.commit`: commits a spell's colored pips if the lands can pay them."""
+    for subset in range(supply.shape[0]):
+        if committed[subset] + color_mana[spell, subset] > supply[subset]:
+            return False
+    for subset in range(supply.shape[0]):
+        committed[subset] += color_mana[spell, subset]
+    return True
+
+
+@njit(cache=True)
+def _log_row(
+    stats, hands, graveyards, row, counters, hand, hand_len, graveyard, gy_len, lib_len
+):
+    """`PlayerTracker.log_turn`: copies the counters and zones into row `row`."""
+    for column in range(SPENT_MANA + 1):
+        stats[row, column] = counters[column]
+    stats[row, HAND_SIZE] = hand_len
+    stats[row, LIBRARY_SIZE] = lib_len
+    stats[row, GRAVEYARD_SIZE] = gy_len
+    hands[row, :hand_len] = hand[:hand_len]
+    graveyards[row, :gy_len] = graveyard[:gy_len]
+
+
+@njit(cache=True)
+def play_match_kernel(
+    state,
+    deck_keys,
+    is_land,
+    cmc,
+    colored_mana,
+    color_mana,
+    has_colors,
+    max_mulligans,
+    mulligan_prob,
+    max_turns,
+    hand_size_stop,
+    extra_land_prob,
+    stats,
+    hands,
+    graveyards,
+    final_zones,
+    final_lengths,
+    final_counters,
+):
+    """
+    Plays one match with the rules of `Player.play_a_match`.
+
+    Parameters:
+    -----------
+    state : np.ndarray (int64, 625)
+        Mersenne Twister state (`random.Random.getstate()[1]`), advanced in place.
+    deck_keys : np.ndarray (int32)
+        The card key of each card of the deck, in the deck order.
+    is_land, cmc : np.ndarray
+        Whether each card key is a land, and its mana value.
+    colored_mana : bool
+        Whether spells need lands of their colors (as `Player.colored_mana`).
+    color_mana : np.ndarray (int32, keys x color subsets)
+        The land supply or spell pip counts of each card key (see `KernelDeck`).
+    has_colors : np.ndarray (bool)
+        Whether each card key is a spell with colored pips.
+    stats : np.ndarray (float64, rows x len(STAT_COLUMNS))
+        Output: the tracker rows (`STAT_COLUMNS`), one per logged state.
+    hands, graveyards : np.ndarray (int32, rows x deck size)
+        Output: the hand and graveyard card keys of each row.
+    final_zones : np.ndarray (int32, 4 x 2 * deck size)
+        Output: the hand, library, battlefield and graveyard at the end of the match.
+    final_lengths : np.ndarray (int64, 5)
+        Output: the lengths of `final_zones`, then the total cards drawn.
+    final_counters : np.ndarray (float64, 6)
+        Output: the counters at the end of the match (the first six `STAT_COLUMNS`).
+
+    Returns:
+    --------
+    (int, int)
+        The status (`OK` or `EMPTY_LIBRARY`) and the number of logged rows.
+    """
+    n_cards = len(deck_keys)
+    capacity = 2 * n_cards
+    hand = np.empty(capacity, dtype=np.int32)
+    library = np.empty(capacity, dtype=np.int32)
+    battlefield = np.empty(capacity, dtype=np.int32)
+    graveyard = np.empty(capacity, dtype=np.int32)
+    scratch = np.empty(capacity, dtype=np.int32)
+    spells = np.empty(capacity, dtype=np.int32)
+    supply = np.zeros(color_mana.shape[1], dtype=np.int32)
+    committed = np.zeros(color_mana.shape[1], dtype=np.int32)
+
+    # turn, mulligan_count, lands_played, spells_played, mana_pool, spent_mana
+    counters = np.zeros(SPENT_MANA + 1, dtype=np.float64)
+    bf_len = 0
+    gy_len = 0
+    cards_drawn = 0
+    row = 0
+    status = OK
+
+    lib_start, lib_end, hand_len = _draw_opening_hand(
+        state, deck_keys, library, hand, is_land, scratch
+    )
+    cards_drawn += OPENING_HAND_SIZE
+    _log_row(
+        stats,
+        hands,
+        graveyards,
+        row,
+        counters,
+        hand,
+        hand_len,
+        graveyard,
+        gy_len,
+        lib_end - lib_start,
+    )
+    row += 1
+
+    # Mulligans
+    n_mulligans = 0
+    while n_mulligans < max_mulligans:
+        if _random(state) >= mulligan_prob:
+            break
+
+        counters[MULLIGAN_COUNT] += 1
+        lib_start, lib_end, hand_len = _draw_opening_hand(
+            state, deck_keys, library, hand, is_land, scratch
+        )
+        cards_drawn += OPENING_HAND_SIZE
+
+        cards_to_return = int(counters[MULLIGAN_COUNT])
+        while cards_to_return > 0 and hand_len > 0:
+            n_lands = 0
+            last_land = -1
+            for i in range(hand_len):
+                if is_land[hand[i]]:
+                    n_lands += 1
+                    last_land = hand[i]
+            if n_lands > 0 and not (2 <= n_lands <= 4) and n_lands > 2:
+                card = last_land
+            else:
+                card = _first_max_cmc(hand, hand_len, cmc)
+
+            hand_len = _remove_first(hand, hand_len, card)
+            library[lib_end] = card
+            lib_end += 1
+            _shuffle(state, library, lib_start, lib_end)
+            cards_to_return -= 1
+
+        n_mulligans += 1
+        _log_row(
+            stats,
+            hands,
+            graveyards,
+            row,
+            counters,
+            hand,
+            hand_len,
+            graveyard,
+            gy_len,
+            lib_end - lib_start,
+        )
+        row += 1
+
+    # Turnos
+    for _ in range(max_turns):
+        # Player.next_turn
+        counters[TURN] += 1
+        counters[SPENT_MANA] = 0
+        counters[LANDS_PLAYED] = 0
+
+        if lib_start >= lib_end:
+            status = EMPTY_LIBRARY
+            break
+        hand[hand_len] = library[lib_start]
+        lib_start += 1
+        hand_len += 1
+        cards_drawn += 1
+
+        for i in range(hand_len):
+            if is_land[hand[i]]:
+                land = hand[i]
+                hand_len = _remove_first(hand, hand_len, land)
+                counters[LANDS_PLAYED] += 1
+                battlefield[bf_len] = land
+                bf_len += 1
+                _add_supply(supply, color_mana, land)
+                counters[MANA_POOL] = bf_len
+                break
+
+        # Player.play_spell: mágicas da maior para a menor (ordenação estável), gulosamente
+        n_spells = 0
+        for i in range(hand_len):
+            if not is_land[hand[i]]:
+                spell = hand[i]
+                k = n_spells
+                while k > 0 and cmc[spells[k - 1]] < cmc[spell]:
+                    spells[k] = spells[k - 1]
+                    k -= 1
+                spells[k] = spell
+                n_spells += 1
+
+        available_mana = counters[MANA_POOL]
+        mana_used = 0.0
+        n_chosen = 0
+        committed[:] = 0
+        for i in range(n_spells):
+            spell = spells[i]
+            if mana_used + cmc[spell] > available_mana:
+                continue
+            if colored_mana and has_colors[spell]:
+                if not _commit_colors(committed, color_mana, spell, supply):
+                    continue
+            scratch[n_chosen] = spell
+            n_chosen += 1
+            mana_used += cmc[spell]
+        for i in range(n_chosen):
+            hand_len = _remove_first(hand, hand_len, scratch[i])
+            counters[SPELLS_PLAYED] += 1
+            counters[SPENT_MANA] += cmc[scratch[i]]
+            graveyard[gy_len] = scratch[i]
+            gy_len += 1
+
+        if hand_len > MAX_HAND_SIZE:
+            card = _first_max_cmc(hand, hand_len, cmc)
+            hand_len = _remove_first(hand, hand_len, card)
+            graveyard[gy_len] = card
+            gy_len += 1
+
+        _organize(hand, hand_len, is_land, scratch)
+
+        if hand_len <= hand_size_stop:
+            break
+
+        # Terreno extra
+        if _random(state) < extra_land_prob:
+            for i in range(hand_len):
+                if is_land[hand[i]]:
+                    land = hand[i]
+                    hand_len = _remove_first(hand, hand_len, land)
+                    counters[LANDS_PLAYED] += 1
+                    battlefield[bf_len] = land
+                    bf_len += 1
+                    _add_supply(supply, color_mana, land)
+                    counters[MANA_POOL] = bf_len
+                    break
+
+        _log_row(
+            stats,
+            hands,
+            graveyards,
+            row,
+            counters,
+            hand,
+            hand_len,
+            graveyard,
+            gy_len,
+            lib_end - lib_start,
+        )
+        row += 1
+
+    final_zones[0, :hand_len] = hand[:hand_len]
+    final_zones[1, : lib_end - lib_start] = library[lib_start:lib_end]
+    final_zones[2, :bf_len] = battlefield[:bf_len]
+    final_zones[3, :gy_len] = graveyard[:gy_len]
+    final_lengths[0] = hand_len
+    final_lengths[1] = lib_end - lib_start
+    final_lengths[2] = bf_len
+    final_lengths[3] = gy_len
+    final_lengths[4] = cards_drawn
+    final_counters[:] = counters
+    return status, row
+
+
+@njit(cache=True)
+def play_matches_kernel(
+    states,
+    deck_keys,
+    is_land,
+    cmc,
+    colored_mana,
+    color_mana,
+    has_colors,
+    max_mulligans,
+    mulligan_prob,
+    max_turns,
+    hand_size_stop,
+    extra_land_prob,
+    stats,
+    hands,
+    graveyards,
+    final_zones,
+    final_lengths,
+    final_counters,
+    statuses,
+    n_rows,
+):
+    """
+    Plays a batch of matches of the same deck (one generator state per match) with
+    `play_match_kernel`; every output has the batch as its first axis.
+    """
+    for match_idx in range(states.shape[0]):
+        status, rows = play_match_kernel(
+            states[match_idx],
+            deck_keys,
+            is_land,
+            cmc,
+            colored_mana,
+            color_mana,
+            has_colors,
+            max_mulligans,
+            mulligan_prob,
+            max_turns,
+            hand_size_stop,
+            extra_land_prob,
+            stats[match_idx],
+            hands[match_idx],
+            graveyards[match_idx],
+            final_zones[match_idx],
+            final_lengths[match_idx],
+            final_counters[match_idx],
+        )
+        statuses[match_idx] = status
+        n_rows[match_idx] = rows
+
+
+class KernelDeck:
+    """
+    The integer arrays of a deck used by the kernel.
+
+    Card keys follow object identity, as `list.remove` does on the Player engine's zones:
+    copies of a card that share one Card object share one key.
+
+    Attributes:
+    -----------
+    cards : list
+        The card object of each key.
+    deck_keys : np.ndarray (int32)
+        The key of each card of the deck, in the deck order.
+    is_land : np.ndarray (bool)
+    cmc : np.ndarray (float64)
+    cmc_is_int : bool
+        Whether every mana value is an int (so `spent_mana` is logged as int, as the Player
+        engine does).
+    card_ids : np.ndarray (int16)
+        The `Deck.card_ids` ID of each key (for the compact hand log).
+    color_mana : np.ndarray (int32, keys x color subsets)
+        For lands, `DeckMana.land_supply`; for spells, `DeckMana.spell_needs` (zeros if the
+        spell has no colored pips).
+    has_colors : np.ndarray (bool)
+    """
+
+    def __init__(self, deck):
+        keys = {}
+        self.cards = []
+        deck_keys = []
+        for card in deck.cards:
+            key = keys.get(id(card))
+            if key is None:
+                key = keys[id(card)] = len(self.cards)
+                self.cards.append(card)
+            deck_keys.append(key)
+
+        self.deck_keys = np.array(deck_keys, dtype=np.int32)
+        self.is_land = np.array(
+            ['Land' in card.type for card in self.cards], dtype=np.bool_
+        )
+        self.cmc = np.array([card.cmc for card in self.cards], dtype=np.float64)
+        self.cmc_is_int = all(isinstance(card.cmc, int) for card in self.cards)
+        card_ids = deck.card_ids()
+        self.card_ids = np.array(
+            [card_ids[card.name] for card in self.cards], dtype=np.int16
+        )
+
+        mana = deck_mana(deck)
+        self.color_mana = np.zeros((len(self.cards), len(mana.subsets)), dtype=np.int32)
+        self.has_colors = np.zeros(len(self.cards), dtype=np.bool_)
+        for key, card in enumerate(self.cards):
+            if self.is_land[key]:
+                supply = mana.empty_supply()
+                mana.add_land(supply, card)
+                self.color_mana[key] = supply
+            elif card.name in mana.spell_needs:
+                self.color_mana[key] = mana.spell_needs[card.name]
+                self.has_colors[key] = True
+
+
+# Arrays do kernel por deck, liberados junto com o deck
+_kernel_decks = weakref.WeakKeyDictionary()
+
+
+def kernel_deck(deck) -> KernelDeck:
+    """Returns the kernel arrays of a deck (built once per deck object)."""
+    compiled = _kernel_decks.get(deck)
+    if compiled is None:
+        compiled = _kernel_decks[deck] = KernelDeck(deck)
+    return compiled
+
+
+def play_matches(
+    player,
+    rngs: Sequence[random.Random],
+    match_numbers: Sequence[int],
+    max_mulligans: int,
+    mulligan_prob: float,
+    max_turns: int,
+    hand_size_stop: int,
+    extra_land_prob: float,
+    hand_log_mode: str = "verbose",
+    colored_mana: bool = True,
+) -> List[List[dict]]:
+    """
+    Plays a batch of matches of a player with the kernel, one generator per match.
+
+    Each generator is advanced as if the match had been played by `Player.play_a_match` with
+    it as `player.rng`, and the player ends in the state of the last match (counters, zones
+    and `rng`). The per-play log messages of the Player engine are not emitted.
+
+    Parameters:
+    -----------
+    player : Player
+        The player, with a deck assigned.
+    rngs : Sequence[random.Random]
+        The generator of each match.
+    match_numbers : Sequence[int]
+        The number of each match.
+    max_mulligans, mulligan_prob, max_turns, hand_size_stop, extra_land_prob :
+        As in `Player.play_a_match`.
+    hand_log_mode : str
+        As in `PlayerTracker` (off, compact or verbose).
+    colored_mana : bool
+        As in `Player.play_a_match`.
+
+    Returns:
+    --------
+    List[List[dict]]
+        The tracker records of each match (the rows `PlayerTracker.log_turn` would log).
+
+    Raises:
+    -------
+    ValueError:
+        If the player has no valid deck or a match runs out of cards to draw.
+    """
+    # Import local: evita o ciclo classes.player -> ... -> classes.match_kernel
+    from classes.graveyard import Graveyard
+    from classes.hand import Hand
+
+    if not player.valid_deck:
+        raise ValueError("Player is not ready to play. Please assign a valid deck.")
+
+    deck = kernel_deck(player.deck)
+    n_matches = len(rngs)
+    n_cards = len(deck.deck_keys)
+    max_rows = 1 + max_mulligans + max_turns
+
+    states = np.empty((n_matches, MT_N + 1), dtype=np.int64)
+    for match_idx, rng in enumerate(rngs):
+        states[match_idx] = rng.getstate()[1]
+
+    stats = np.zeros((n_matches, max_rows, len(STAT_COLUMNS)), dtype=np.float64)
+    hands = np.zeros((n_matches, max_rows, 2 * n_cards), dtype=np.int32)
+    graveyards = np.zeros((n_matches, max_rows, 2 * n_cards), dtype=np.int32)
+    final_zones = np.zeros((n_matches, 4, 2 * n_cards), dtype=np.int32)
+    final_lengths = np.zeros((n_matches, 5), dtype=np.int64)
+    final_counters = np.zeros((n_matches, SPENT_MANA + 1), dtype=np.float64)
+    statuses = np.zeros(n_matches, dtype=np.int64)
+    n_rows = np.zeros(n_matches, dtype=np.int64)
+
+    play_matches_kernel(
+        states,
+        deck.deck_keys,
+        deck.is_land,
+        deck.cmc,
+        colored_mana,
+        deck.color_mana,
+        deck.has_colors,
+        max_mulligans,
+        mulligan_prob,
+        max_turns,
+        hand_size_stop,
+        extra_land_prob,
+        stats,
+        hands,
+        graveyards,
+        final_zones,
+        final_lengths,
+        final_counters,
+        statuses,
+        n_rows,
+    )
+
+    for match_idx, rng in enumerate(rngs):
+        version, _, gauss_next = rng.getstate()
+        rng.setstate(
+            (version, tuple(int(word) for word in states[match_idx]), gauss_next)
+        )
+    if statuses.any():
+        raise ValueError("Cannot draw from an empty library.")
+
+    deck_colors = sorted(player.deck.deck_colors)
+    spent_mana_type = int if deck.cmc_is_int else float
+    scratch_hand, scratch_graveyard = Hand(), Graveyard()
+
+    matches = []
+    for match_idx, match_number in enumerate(match_numbers):
+        records = []
+        for row in range(n_rows[match_idx]):
+            row_stats = stats[match_idx, row]
+            record = {
+                'name': player.name,
+                'deck_name': player.deck_name,
+                'deck_colors': deck_colors,
+                'match': match_number,
+            }
+            for column, stat in enumerate(STAT_COLUMNS):
+                record[stat] = int(row_stats[column])
+            record['spent_mana'] = spent_mana_type(row_stats[SPENT_MANA])
+
+            hand = hands[match_idx, row, : record['hand_size']]
+            graveyard = graveyards[match_idx, row, : record['graveyard_size']]
+            if hand_log_mode == "compact":
+                record['hand_card_ids'] = deck.card_ids[hand]
+                record['graveyard_card_ids'] = deck.card_ids[graveyard]
+            elif hand_log_mode == "verbose":
+                # Mesma representação das zonas do motor Player
+                scratch_hand.cards = [deck.cards[key] for key in hand]
+                scratch_graveyard.cards = [deck.cards[key] for key in graveyard]
+                record['full_hand'] = repr(scratch_hand)
+                record['full_graveyard'] = repr(scratch_graveyard)
+            records.append(record)
+        matches.append(records)
+
+    player.colored_mana = colored_mana
+    _sync_player(
+        player,
+        deck,
+        rngs[-1],
+        match_numbers[-1],
+        final_zones[-1],
+        final_lengths[-1],
+        final_counters[-1],
+        spent_mana_type,
+    )
+    return matches
+
+
+def _sync_player(
+    player,
+    deck,
+    rng,
+    match_number,
+    final_zones,
+    final_lengths,
+    final_counters,
+    spent_mana_type,
+):
+    """Leaves the player in the state the Player engine would leave it after the match."""
+    state = player._ensure_match_state()
+    state.reset(rng)
+    zones = {0: state.hand.cards, 1: state.library.cards, 3: state.graveyard.cards}
+    for zone_idx, zone in zones.items():
+        zone[:] = [
+            deck.cards[key] for key in final_zones[zone_idx, : final_lengths[zone_idx]]
+        ]
+    # Terrenos pelo Battlefield, que mantém o suprimento de cores
+    for key in final_zones[2, : final_lengths[2]]:
+        state.battlefield.add_land(deck.cards[key])
+    state.library.library_size = len(state.library.cards)
+
+    player.rng = rng
+    player.match = match_number
+    player.cards_drawn = int(final_lengths[4])
+    player.turn = int(final_counters[TURN])
+    player.mulligan_count = int(final_counters[MULLIGAN_COUNT])
+    player.lands_played = int(final_counters[LANDS_PLAYED])
+    player.spells_played = int(final_counters[SPELLS_PLAYED])
+    player.mana_pool = int(final_counters[MANA_POOL])
+    player.spent_mana = spent_mana_type(final_counters[SPENT_MANA])
+    player.hand_size = OPENING_HAND_SIZE
+    player.extra_lands = 0
+    player.initial_hand_drawn = True
@@ -0,0 +1,71 @@
+import random
+
+from classes.battlefield import Battlefield
+from classes.deck import Deck
+from classes.graveyard import Graveyard
+from classes.hand import Hand
+from classes.library import Library
+from classes.mana import DeckMana, deck_mana
+
+
+class MatchState:
+    """
+    The zones of a player's matches, allocated once per deck and reset in place.
+
+    A player keeps one MatchState per assigned deck: every match and every mulligan resets the
+    same `Hand`, `Battlefield`, `Library` and `Graveyard` (and their card lists) instead of
+    creating new ones, so simulating a match allocates no new zone objects.
+
+    Attributes:
+    -----------
+    deck : Deck or None
+        The deck the library is restored from.
+    hand : Hand
+    battlefield : Battlefield
+    library : Library or None
+        None when there is no deck.
+    graveyard : Graveyard
+    mana : DeckMana or None
+        The colored mana model of the deck (shared by every player of the same deck object).
+    """
+
+    __slots__ = ('deck', 'hand', 'battlefield', 'library', 'graveyard', 'mana')
+
+    def __init__(self, deck: Deck = None):
+        self.deck = deck
+        self.mana: DeckMana = deck_mana(deck)
+        self.hand = Hand()
+        self.battlefield = Battlefield(self.mana)
+        self.library = Library(deck) if deck else None
+        self.graveyard = Graveyard()
+
+    def reset(self, rng: random.Random = None):
+        """
+        Prepares the zones for a new match: empties the hand, battlefield and graveyard and
+        puts the whole deck back in the library, unshuffled.
+
+        Parameters:
+        -----------
+        rng : random.Random, optional
+            The random number generator of the library's shuffles in this match.
+        """
+        self.hand.reset()
+        self.battlefield.reset()
+        self.graveyard.reset()
+        if self.library is not None:
+            self.library.reset(rng)
+
+    def reset_hand(self, rng: random.Random = None):
+        """
+        Returns the hand to the library before drawing a new opening hand (e.g. on a
+        mulligan): empties the hand and puts the whole deck back in the library, unshuffled.
+        """
+        self.hand.reset()
+        self.library.reset(rng)
+
+    def __repr__(self):
+        library_size = len(self.library) if self.library else 0
+        return (
+            f"MatchState(hand: {len(self.hand)}, battlefield: {len(self.battlefield.lands)}, "
+            f"library: {library_size}, graveyard: {len(self.graveyard)})"
+        )
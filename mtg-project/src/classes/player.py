@@ -3,11 +3,8 @@ import random
 
 from mtgsdk import Card
 
-from classes.battlefield import Battlefield
 from classes.deck import Deck
-from classes.graveyard import Graveyard
-from classes.hand import Hand
-from classes.library import Library
+from classes.match_state import MatchState
 
 logger = logging.getLogger(__name__)
 
@@ -38,8 +35,25 @@ class Player:
         Indicates if the player is ready to play (i.e., has a valid deck assigned).
     spent_mana : int
         The amount of mana the player has spent in the current turn.
+    cards_drawn : int
+        The number of cards drawn from the library in the current match (mulligans included).
+    rng : random.Random or None
+        The random number generator of the player's decisions and shuffles. If None, the
+        global `random` module is used; set a seeded generator to make a match reproducible.
+    match_state : MatchState
+        The zones of the player (`hand`, `battlefield`, `library` and `graveyard` refer to
+        them), reset in place at every match and mulligan.
+    colored_mana : bool
+        Whether spells need lands of their colors (see `classes.mana.DeckMana`) or any land
+        pays any cost, as in the original model.
     """
 
+    # Padrão de classe: jogadores serializados antes do atributo rng usam o `random` global
+    rng = None
+    # Idem para o match_state: criado na primeira partida dos jogadores serializados antes dele
+    match_state = None
+    colored_mana = True
+
     def __init__(
         self,
         name: str = "Untitled Player",
@@ -59,10 +73,8 @@ class Player:
         self.deck = deck
         self.deck_name = deck.deck_name if deck else None
 
-        self.hand = Hand()
-        self.battlefield = Battlefield()
-        self.library = Library(deck) if deck else None
-        self.graveyard = Graveyard()
+        self.match_state = MatchState(deck)
+        self._bind_zones()
 
         self.mulligan_count = 0
         self.turn = 0
@@ -73,6 +85,8 @@ class Player:
         self.hand_size = 0
         self.match = 0
         self.spent_mana = 0
+        self.cards_drawn = 0
+        self.rng = None
 
         self.valid_deck = deck.is_valid() if deck else False
         self.initial_hand_drawn = False
@@ -85,6 +99,8 @@ class Player:
         max_turns,
         hand_size_stop,
         extra_land_prob,
+        match_number=None,
+        colored_mana=True,
     ):
         """
         Simulates a Magic: The Gathering match for the player, including drawing an initial hand, performing mulligans,
@@ -104,14 +120,20 @@ class Player:
             Minimum hand size threshold. The simulation will stop if the player's hand size reaches this value.
         extra_land_prob : float
             Probability (between 0 and 1) that the player will play an additional land during each turn.
+        match_number : int, optional
+            Number of this match. If None, the player's match count is incremented; matches that
+            may run out of order (e.g. lazily, one per output partition) should set it explicitly.
+        colored_mana : bool
+            Whether spells need lands of their colors (see `colored_mana`).
 
         Returns:
         --------
         None
         """
-        # Increment the match count
+        # Increment the match count (or use the given match number)
+        self.colored_mana = colored_mana
         self.new_match()
-        self.match += 1
+        self.match = self.match + 1 if match_number is None else match_number
         logger.info(f"Starting match {self.match} for player {self.name}")
 
         # Draw initial hand
@@ -121,7 +143,7 @@ class Player:
         # Mulligan simulation
         mulligan_count = 0
         while mulligan_count < max_mulligans:
-            if random.random() < mulligan_prob:
+            if self._random.random() < mulligan_prob:
                 logger.info(
                     f"Player '{self.name}' is taking a mulligan in match {self.match}."
                 )
@@ -146,7 +168,7 @@ class Player:
                 break
 
             # Extra land play
-            if random.random() < extra_land_prob:
+            if self._random.random() < extra_land_prob:
                 self.extra_lands += 1
                 logger.info(
                     f"Player '{self.name}' plays an extra land in match {self.match}. Total extra lands this turn: {self.extra_lands}"
@@ -169,11 +191,29 @@ class Player:
         # End the match
         logger.info(f"Match {self.match} for player {self.name} completed.")
 
+    @property
+    def _random(self):
+        """The player's random number generator (the global `random` module if none was set)."""
+        return self.rng or random
+
+    def _bind_zones(self):
+        """Points the player's zone attributes to the zones of its match state."""
+        state = self.match_state
+        self.hand = state.hand
+        self.battlefield = state.battlefield
+        self.library = state.library
+        self.graveyard = state.graveyard
+
+    def _ensure_match_state(self) -> MatchState:
+        """Creates the match state of players serialized before it existed (or of a new deck)."""
+        if self.match_state is None or self.match_state.deck is not self.deck:
+            self.match_state = MatchState(self.deck)
+            self._bind_zones()
+        return self.match_state
+
     def new_match(self):
-        self.hand = Hand()
-        self.battlefield = Battlefield()
-        self.library = Library(self.deck)
-        self.graveyard = Graveyard()
+        # Reaproveita as zonas da partida anterior, esvaziadas no lugar
+        self._ensure_match_state().reset(self.rng)
         self.mulligan_count = 0
         self.turn = 0
         self.lands_played = 0
@@ -182,6 +222,7 @@ class Player:
         self.mana_pool = 0
         self.hand_size = 0
         self.spent_mana = 0
+        self.cards_drawn = 0
         self.initial_hand_drawn = False
 
     def assign_deck(self, deck: Deck):
@@ -208,7 +249,8 @@ class Player:
 
         self.deck = deck
         self.deck_name = deck.deck_name
-        self.library = Library(deck)
+        self.match_state = MatchState(deck)
+        self._bind_zones()
         self.valid_deck = True
 
     def draw_initial_hand(self):
@@ -229,13 +271,14 @@ class Player:
                 "Initial hand has already been drawn. Use the mulligan method to draw a new hand."
             )
 
-        self.library = Library(self.deck)
+        # A mão volta ao grimório (mesmas zonas, esvaziadas no lugar) antes de embaralhar
+        self._ensure_match_state().reset_hand(self.rng)
         self.library.shuffle()
-        self.hand = Hand()
 
         for _ in range(7):
             drawn_card = self.library.draw_card()
             self.hand.add_card(drawn_card)
+        self.cards_drawn += 7
 
         self.hand_size = len(self.hand.cards)
         self.initial_hand_drawn = True
@@ -299,6 +342,7 @@ class Player:
 
         drawn_card = self.library.draw_card()
         self.hand.add_card(drawn_card)
+        self.cards_drawn += 1
 
         land_card = next(
             (card for card in self.hand.cards if 'Land' in card.type), None
@@ -353,7 +397,9 @@ class Player:
     def play_spell(self, available_mana: int) -> bool:
         """
         Attempts to play one or more spells if the player is ready to play.
-        Optimizes mana usage by playing the best possible combination of spells.
+        Optimizes mana usage by playing the best possible combination of spells. With
+        `colored_mana`, a spell is only played if the lands on the battlefield can also pay
+        its colored pips along with those of the spells already chosen this turn.
 
         Parameters:
         -----------
@@ -377,13 +423,21 @@ class Player:
         spells = [card for card in self.hand.cards if 'Land' not in card.type]
         spells.sort(key=lambda card: card.cmc, reverse=True)
 
+        # Pips coloridos já comprometidos no turno (ver DeckMana)
+        mana = self.match_state.mana if self.colored_mana else None
+        supply = self.battlefield.color_supply
+        committed = mana.empty_supply() if mana else None
+
         # Tenta jogar a melhor combinação de cartas
         mana_used = 0
         cards_to_play = []
         for spell in spells:
-            if mana_used + spell.cmc <= available_mana:
-                cards_to_play.append(spell)
-                mana_used += spell.cmc
+            if mana_used + spell.cmc > available_mana:
+                continue
+            if mana is not None and not mana.commit(committed, spell, supply):
+                continue
+            cards_to_play.append(spell)
+            mana_used += spell.cmc
 
         if cards_to_play:
             for card in cards_to_play:
@@ -1,31 +1,83 @@
+import numpy as np
 import pandas as pd
 
+from classes.running_features import RUNNING_FEATURE_DTYPES, RunningFeatures
+
+# Modos de registro do estado da mao e do cemiterio a cada turno
+HAND_LOG_MODES = ("off", "compact", "verbose")
+
 
 class PlayerTracker:
     """
     A class to track and record the player's attributes during each turn.
+
+    The hand and graveyard contents can be logged in three modes:
+
+    - ``"off"``: no hand/graveyard contents are stored, only their sizes.
+    - ``"compact"``: ``hand_card_ids`` and ``graveyard_card_ids`` hold int16 arrays of
+      card IDs (see ``Deck.card_ids``), stored as Arrow list columns in Parquet.
+    - ``"verbose"``: ``full_hand`` and ``full_graveyard`` hold the ``repr()`` strings
+      of the zones, as in the original log format.
+
+    With ``running_features``, each row also gets the per-turn features of the modeling
+    pipeline (``RUNNING_FEATURE_COLUMNS``), computed as the turns are logged (see
+    ``classes.running_features``), so ``feature_engineering`` does not recompute them.
     """
 
-    def __init__(self):
+    def __init__(self, hand_log_mode: str = "verbose", running_features: bool = False):
+        if hand_log_mode not in HAND_LOG_MODES:
+            raise ValueError(
+                f"Invalid hand_log_mode '{hand_log_mode}'. Choose one of: {', '.join(HAND_LOG_MODES)}"
+            )
+
+        self.hand_log_mode = hand_log_mode
+        self.running_features = RunningFeatures() if running_features else None
+        self._card_ids = None
+        self._card_ids_deck = None
+
+        columns = [
+            'name',
+            'deck_name',
+            'deck_colors',
+            'match',
+            'turn',
+            'mulligan_count',
+            'lands_played',
+            'spells_played',
+            'mana_pool',
+            'spent_mana',
+            'hand_size',
+            'library_size',
+            'graveyard_size',
+        ]
+        if hand_log_mode == "compact":
+            columns += ['hand_card_ids', 'graveyard_card_ids']
+        elif hand_log_mode == "verbose":
+            columns += ['full_hand', 'full_graveyard']
+
         # Inicializa um DataFrame vazio com as colunas correspondentes aos atributos do Player
-        self.data = pd.DataFrame(
-            columns=[
-                'name',
-                'deck_name',
-                'deck_colors',
-                'match',
-                'turn',
-                'mulligan_count',
-                'lands_played',
-                'spells_played',
-                'mana_pool',
-                'spent_mana',
-                'hand_size',
-                'library_size',
-                'graveyard_size',
-                'full_hand',
-                'full_graveyard',
-            ]
+        if not running_features:
+            self.data = pd.DataFrame(columns=columns)
+        else:
+            # Com os tipos definidos, as features mantêm o tipo a cada linha concatenada
+            empty_columns = {column: np.empty(0, dtype=object) for column in columns}
+            for column, dtype in RUNNING_FEATURE_DTYPES.items():
+                empty_columns[column] = np.empty(0, dtype=dtype)
+            self.data = pd.DataFrame(empty_columns)
+
+    def _encode_cards(self, deck, cards) -> np.ndarray:
+        """
+        Encodes a list of cards as an int16 array of card IDs from the player's deck.
+
+        The name-to-ID mapping is built once per deck and reused on every turn.
+        """
+        if self._card_ids_deck is not deck:
+            self._card_ids = deck.card_ids()
+            self._card_ids_deck = deck
+
+        card_ids = self._card_ids
+        return np.fromiter(
+            (card_ids[card.name] for card in cards), dtype=np.int16, count=len(cards)
         )
 
     def log_turn(self, player):
@@ -40,7 +92,8 @@ class PlayerTracker:
         player_data = {
             'name': player.name,
             'deck_name': player.deck_name,
-            'deck_colors': player.deck.deck_colors,
+            # Ordenadas: a ordem de um set de strings muda de processo para processo
+            'deck_colors': sorted(player.deck.deck_colors),
             'match': player.match,
             'turn': player.turn,
             'mulligan_count': player.mulligan_count,
@@ -51,16 +104,42 @@ class PlayerTracker:
             'hand_size': len(player.hand.cards),
             'library_size': len(player.library),
             'graveyard_size': len(player.graveyard),
-            'full_hand': repr(player.hand),
-            'full_graveyard': repr(player.graveyard),
         }
 
+        if self.hand_log_mode == "compact":
+            player_data['hand_card_ids'] = self._encode_cards(
+                player.deck, player.hand.cards
+            )
+            player_data['graveyard_card_ids'] = self._encode_cards(
+                player.deck, player.graveyard.cards
+            )
+        elif self.hand_log_mode == "verbose":
+            player_data['full_hand'] = repr(player.hand)
+            player_data['full_graveyard'] = repr(player.graveyard)
+
+        if self.running_features is not None:
+            self.running_features.update(player_data)
+
         # Cria um DataFrame temporário para adicionar a nova linha
         new_row = pd.DataFrame([player_data])
 
         # Usa pd.concat para adicionar a nova linha ao DataFrame existente
         self.data = pd.concat([self.data, new_row], ignore_index=True)
 
+    def log_records(self, records):
+        """
+        Appends rows already in the `log_turn` format (e.g. from the compiled match kernel,
+        see `classes.match_kernel.play_matches`). With `running_features`, the features are
+        added to copies of the records, as `log_turn` does.
+
+        Args:
+            records (List[dict]): One dict per row, with the tracker columns.
+        """
+        if records and self.running_features is not None:
+            records = [self.running_features.update(dict(record)) for record in records]
+        if records:
+            self.data = pd.concat([self.data, pd.DataFrame(records)], ignore_index=True)
+
     def get_data(self):
         """
         Returns the DataFrame containing the logged player data.
@@ -0,0 +1,120 @@
+from collections import deque
+
+# Features por turno de `feature_engineering` (pipelines.modeling.nodes), na ordem em que são
+# criadas: acumulados, razões e eficiência da curva de mana...
+TURN_FEATURE_COLUMNS = (
+    'cum_mana_pool',
+    'cum_spent_mana',
+    'spell_ratio',
+    'land_ratio',
+    'mana_curve_efficiency',
+)
+# ... e lags e médias móveis, que dependem dos turnos anteriores
+TEMPORAL_FEATURE_COLUMNS = (
+    'mana_curve_efficiency_lag_1',
+    'mana_curve_efficiency_lag_2',
+    'spell_ratio_lag_1',
+    'land_ratio_lag_1',
+    'rolling_mean_mana_curve_efficiency_3',
+    'rolling_mean_spell_ratio_3',
+    'rolling_mean_land_ratio_3',
+)
+RUNNING_FEATURE_COLUMNS = TURN_FEATURE_COLUMNS + TEMPORAL_FEATURE_COLUMNS
+
+# Tipos das features (os acumulados são inteiros, como os cumsum de feature_engineering)
+RUNNING_FEATURE_DTYPES = {
+    column: 'int64' if column.startswith('cum_') else 'float64'
+    for column in RUNNING_FEATURE_COLUMNS
+}
+
+# Tamanho da janela das médias móveis
+ROLLING_WINDOW = 3
+
+
+def _round_2(value: float) -> float:
+    """Rounds to 2 decimals exactly as `np.round(value, 2)` (and pandas) do, without numpy."""
+    return round(value * 100) / 100
+
+
+class RunningFeatures:
+    """
+    Computes the per-turn features of `feature_engineering` while the turns are logged.
+
+    `feature_engineering` derives them from the tracker data with groupbys by player and
+    match: cumulative sums, ratios, lags and rolling means over the turns in the order they
+    were logged. The tracker already logs the turns of a match in that order, so the same
+    values can be kept as running state: two sums, and the last `ROLLING_WINDOW` values of each
+    lagged series in a ring buffer. The state restarts whenever the player or the match
+    changes.
+
+    The values match `feature_engineering` (same rounding, 0 for the lags and for an
+    efficiency without mana), except the rolling means, which may differ in the last bits
+    from the pandas running sum.
+    """
+
+    def __init__(self):
+        self._key = None
+
+    def _reset(self, key):
+        self._key = key
+        self.cum_mana_pool = 0
+        self.cum_spent_mana = 0
+        self._history = {
+            'mana_curve_efficiency': deque(maxlen=ROLLING_WINDOW),
+            'spell_ratio': deque(maxlen=ROLLING_WINDOW),
+            'land_ratio': deque(maxlen=ROLLING_WINDOW),
+        }
+
+    def update(self, row: dict) -> dict:
+        """
+        Adds the features of a turn to its row (in place).
+
+        Parameters:
+        -----------
+        row : dict
+            A row in the `PlayerTracker.log_turn` format.
+
+        Returns:
+        --------
+        dict
+            The same row, with the `RUNNING_FEATURE_COLUMNS`.
+        """
+        key = (row['name'], row['match'])
+        if key != self._key:
+            self._reset(key)
+
+        # Como em feature_engineering: spent_mana é convertido para int antes da soma
+        self.cum_mana_pool += int(row['mana_pool'])
+        self.cum_spent_mana += int(row['spent_mana'])
+        turns = row['turn'] + 1
+        row['cum_mana_pool'] = self.cum_mana_pool
+        row['cum_spent_mana'] = self.cum_spent_mana
+        row['spell_ratio'] = _round_2(row['spells_played'] / turns)
+        row['land_ratio'] = _round_2(row['lands_played'] / turns)
+        row['mana_curve_efficiency'] = (
+            _round_2(self.cum_spent_mana / self.cum_mana_pool)
+            if self.cum_mana_pool
+            else 0.0
+        )
+
+        # Lags: os valores dos turnos anteriores (0 antes do início da partida)
+        history = self._history
+        efficiency = history['mana_curve_efficiency']
+        row['mana_curve_efficiency_lag_1'] = efficiency[-1] if efficiency else 0.0
+        row['mana_curve_efficiency_lag_2'] = (
+            efficiency[-2] if len(efficiency) > 1 else 0.0
+        )
+        row['spell_ratio_lag_1'] = (
+            history['spell_ratio'][-1] if history['spell_ratio'] else 0.0
+        )
+        row['land_ratio_lag_1'] = (
+            history['land_ratio'][-1] if history['land_ratio'] else 0.0
+        )
+
+        # Médias móveis: os últimos ROLLING_WINDOW valores, incluindo o turno atual
+        for name in ('mana_curve_efficiency', 'spell_ratio', 'land_ratio'):
+            window = history[name]
+            window.append(row[name])
+            row[f'rolling_mean_{name}_{ROLLING_WINDOW}'] = sum(window) / len(window)
+
+        return row
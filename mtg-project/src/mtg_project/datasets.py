@@ -0,0 +1,195 @@
+"""Datasets do projeto."""
+
+import json
+import logging
+from copy import deepcopy
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from kedro_datasets.partitions import PartitionedDataset
+
+logger = logging.getLogger(__name__)
+
+# Rodapé ("magic number") de todo arquivo Parquet completo
+PARQUET_MAGIC = b"PAR1"
+
+
+def write_json_atomically(filesystem, path: str, payload: Any):
+    """
+    Grava um JSON em um arquivo temporário vizinho e o renomeia sobre `path`, para que uma
+    interrupção no meio da gravação não deixe o arquivo truncado.
+
+    Args:
+        filesystem: Sistema de arquivos do fsspec onde está `path`.
+        path (str): Caminho do arquivo (sem protocolo).
+        payload (Any): Conteúdo serializável em JSON.
+    """
+    tmp_path = f"{path}.tmp"
+    with filesystem.open(tmp_path, "w") as file:
+        json.dump(payload, file, indent=2)
+    filesystem.mv(tmp_path, path)
+
+
+class ShardPartition:
+    """
+    Partição preguiçosa que pertence a um shard: um grupo de partições gravado e registrado
+    em conjunto no manifesto do `CheckpointedPartitionedDataset`.
+
+    Args:
+        shard_id (str): Identificador do shard (o mesmo para todas as suas partições).
+        seed (int, optional): Semente com que o shard é gerado; um shard só é reaproveitado
+            se foi gravado com a mesma semente.
+        load (Callable[[], Any]): Gera os dados da partição.
+        skip (Callable[[], None], optional): Chamada no lugar de `load` quando a partição é
+            reaproveitada de uma execução anterior.
+        fingerprint (str, optional): Identificação das entradas do shard além da semente
+            (ex.: o deck do jogador); um shard só é reaproveitado se foi gravado com a mesma.
+    """
+
+    __slots__ = ("shard_id", "seed", "load", "skip", "fingerprint")
+
+    def __init__(
+        self,
+        shard_id: str,
+        seed: Optional[int],
+        load: Callable[[], Any],
+        skip: Optional[Callable[[], None]] = None,
+        fingerprint: Optional[str] = None,
+    ):
+        self.shard_id = shard_id
+        self.seed = seed
+        self.load = load
+        self.skip = skip
+        self.fingerprint = fingerprint
+
+    def __call__(self):
+        return self.load()
+
+
+class CheckpointedPartitionedDataset(PartitionedDataset):
+    """
+    `PartitionedDataset` que grava as partições por shard e registra os shards concluídos
+    (com as suas sementes e partições) em um manifesto na própria pasta do dataset.
+
+    Ao salvar novamente na mesma pasta (ex.: uma execução retomada após uma falha), os shards
+    que já constam do manifesto com a mesma semente e identificação (`fingerprint`) e cujas
+    partições estão íntegras (para Parquet, arquivo com o rodapé completo) são pulados sem
+    calcular as partições. Partições
+    que não são `ShardPartition` formam, cada uma, um shard sem semente.
+
+    O manifesto (`_manifest.json`) é regravado a cada shard concluído, por meio de um arquivo
+    temporário renomeado sobre o anterior; um manifesto ilegível é tratado como vazio (todos os
+    shards são recalculados). Ele não termina com o `filename_suffix` das partições, então não
+    aparece na carga do dataset.
+    """
+
+    MANIFEST_NAME = "_manifest.json"
+
+    @property
+    def _manifest_path(self) -> str:
+        return self._sep.join([self._path.rstrip(self._sep), self.MANIFEST_NAME])
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        if self._overwrite or not self._filesystem.exists(self._manifest_path):
+            return {"shards": {}}
+        try:
+            with self._filesystem.open(self._manifest_path, "r") as file:
+                return json.load(file)
+        except (OSError, ValueError) as exc:
+            logger.warning(
+                f"Manifesto {self._manifest_path} ilegível ({exc}); "
+                "os shards serão recalculados."
+            )
+            return {"shards": {}}
+
+    def _save_manifest(self, manifest: Dict[str, Any]):
+        manifest["updated_at"] = datetime.now(timezone.utc).isoformat()
+        self._filesystem.makedirs(self._path.rstrip(self._sep), exist_ok=True)
+        write_json_atomically(self._filesystem, self._manifest_path, manifest)
+
+    def _list_partitions(self) -> List[str]:
+        return [
+            path
+            for path in super()._list_partitions()
+            if not path.endswith((self.MANIFEST_NAME, f"{self.MANIFEST_NAME}.tmp"))
+        ]
+
+    def _is_complete(self, partition_id: str) -> bool:
+        """Verifica se a partição foi gravada por inteiro (para Parquet, pelo rodapé)."""
+        path = self._partition_to_path(partition_id)
+        if not self._filesystem.exists(path):
+            return False
+        if not path.endswith(".parquet"):
+            return True
+        if self._filesystem.size(path) < 2 * len(PARQUET_MAGIC) + 4:
+            return False
+        with self._filesystem.open(path, "rb") as file:
+            file.seek(-len(PARQUET_MAGIC), 2)
+            return file.read() == PARQUET_MAGIC
+
+    def _save_partition(self, partition_id: str, partition_data: Any):
+        kwargs = deepcopy(self._dataset_config)
+        partition = self._partition_to_path(partition_id)
+        kwargs[self._filepath_arg] = self._join_protocol(partition)
+        dataset = self._dataset_type(**kwargs)  # type: ignore
+        if callable(partition_data):
+            partition_data = partition_data()
+        dataset.save(partition_data)
+
+    def _save(self, data: Dict[str, Any]) -> None:
+        if self._overwrite and self._filesystem.exists(self._normalized_path):
+            self._filesystem.rm(self._normalized_path, recursive=True)
+
+        manifest = self._load_manifest()
+
+        # Agrupa as partições por shard, preservando a ordem das partições (como no PartitionedDataset)
+        shards: Dict[str, Dict[str, Any]] = {}
+        for partition_id, partition_data in sorted(data.items()):
+            if isinstance(partition_data, ShardPartition):
+                shard_id, seed = partition_data.shard_id, partition_data.seed
+                fingerprint = partition_data.fingerprint
+            else:
+                shard_id, seed, fingerprint = partition_id, None, None
+            shard = shards.setdefault(
+                shard_id, {"seed": seed, "fingerprint": fingerprint, "partitions": {}}
+            )
+            shard["partitions"][partition_id] = partition_data
+
+        n_skipped = 0
+        for shard_id, shard in shards.items():
+            done = manifest["shards"].get(shard_id)
+            if (
+                done is not None
+                and done["seed"] == shard["seed"]
+                and done.get("fingerprint") == shard["fingerprint"]
+                and sorted(done["partitions"]) == sorted(shard["partitions"])
+                and all(
+                    self._is_complete(partition_id)
+                    for partition_id in shard["partitions"]
+                )
+            ):
+                n_skipped += 1
+                for partition_data in shard["partitions"].values():
+                    if (
+                        isinstance(partition_data, ShardPartition)
+                        and partition_data.skip
+                    ):
+                        partition_data.skip()
+                continue
+
+            for partition_id, partition_data in shard["partitions"].items():
+                self._save_partition(partition_id, partition_data)
+
+            manifest["shards"][shard_id] = {
+                "seed": shard["seed"],
+                "fingerprint": shard["fingerprint"],
+                "partitions": list(shard["partitions"]),
+                "completed_at": datetime.now(timezone.utc).isoformat(),
+            }
+            self._save_manifest(manifest)
+
+        if n_skipped:
+            logger.info(
+                f"{n_skipped} de {len(shards)} shards já concluídos em {self._path} foram reaproveitados."
+            )
+        self._invalidate_caches()
@@ -0,0 +1,206 @@
+"""Project hooks."""
+
+import logging
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from kedro.framework.hooks import hook_impl
+
+from mtg_project.pipelines.utils import (
+    PeakMemoryMonitor,
+    collect_node_counters,
+    start_node_counters,
+)
+
+logger = logging.getLogger(__name__)
+
+# Dataset do catálogo que recebe as métricas (uma partição por execução)
+METRICS_DATASET = "node_metrics"
+
+
+def _count_rows(data: Any) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Conta linhas e partições de um input/output de nó, sem carregar partições preguiçosas.
+
+    Returns:
+        Tuple[Optional[int], Optional[int]]: Número de linhas (DataFrames já em memória) e de
+            partições (dicionários, como os do PartitionedDataset). None quando não se aplica.
+    """
+    # O pandas não é importado aqui: se nenhum nó o carregou, não há DataFrames a contar
+    pd = sys.modules.get("pandas")
+    if pd is None:
+        return (None, len(data)) if isinstance(data, dict) else (None, None)
+
+    if isinstance(data, (pd.DataFrame, pd.Series)):
+        return len(data), None
+
+    if isinstance(data, dict):
+        frames = [value for value in data.values() if isinstance(value, pd.DataFrame)]
+        rows = sum(len(frame) for frame in frames) if frames else None
+        return rows, len(data)
+
+    return None, None
+
+
+def _sum_counts(datasets: Dict[str, Any]) -> Dict[str, Optional[int]]:
+    """Soma linhas e partições de todos os datasets (ignorando os parâmetros)."""
+    total_rows, total_partitions = None, None
+    for name, data in datasets.items():
+        if name.startswith("params:") or name == "parameters":
+            continue
+        rows, partitions = _count_rows(data)
+        if rows is not None:
+            total_rows = (total_rows or 0) + rows
+        if partitions is not None:
+            total_partitions = (total_partitions or 0) + partitions
+    return {"rows": total_rows, "partitions": total_partitions}
+
+
+class PerformanceHooks:
+    """
+    Registra métricas de performance de cada nó e as salva por execução.
+
+    Para cada nó: tempo de parede e de CPU do processo, pico de RSS, linhas e partições de
+    entrada e de saída, tempo de carga e de gravação dos datasets e os contadores
+    registrados pelo próprio nó com `record_node_counters` (ex.: partidas, turnos e cartas
+    compradas na simulação), também convertidos em taxas por segundo.
+
+    A gravação das saídas é medida à parte porque o Kedro salva após o `after_node_run`
+    (e partições preguiçosas só são calculadas nesse momento). Contadores registrados durante
+    a gravação (ex.: partidas simuladas sob demanda) também entram nas métricas do nó, com as
+    taxas calculadas sobre o tempo de execução mais o de gravação. Ao fim da execução, as
+    métricas são salvas no dataset `node_metrics` do catálogo, com a execução como partição.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._running: Dict[str, Tuple[PeakMemoryMonitor, float, float]] = {}
+        self._io_started: Dict[Tuple[str, str], float] = {}
+        self._run_params: Dict[str, Any] = {}
+
+    def _record(self, node_name: str) -> Dict[str, Any]:
+        with self._lock:
+            return self._records.setdefault(
+                node_name, {"node": node_name, "load_seconds": 0.0, "save_seconds": 0.0}
+            )
+
+    @hook_impl
+    def before_pipeline_run(self, run_params: Dict[str, Any]):
+        self._records = {}
+        self._run_params = run_params
+
+    @hook_impl
+    def before_dataset_loaded(self, dataset_name: str, node):
+        self._io_started[(node.name, dataset_name)] = time.perf_counter()
+
+    @hook_impl
+    def after_dataset_loaded(self, dataset_name: str, node):
+        start = self._io_started.pop((node.name, dataset_name), None)
+        if start is not None:
+            self._record(node.name)["load_seconds"] += time.perf_counter() - start
+
+    @hook_impl
+    def before_node_run(self, node, inputs: Dict[str, Any]):
+        record = self._record(node.name)
+        record["started_at"] = datetime.now(timezone.utc)
+        record.update(
+            {f"input_{key}": value for key, value in _sum_counts(inputs).items()}
+        )
+
+        monitor = PeakMemoryMonitor(interval=0.05).__enter__()
+        start_node_counters()
+        self._running[node.name] = (monitor, time.perf_counter(), time.process_time())
+
+    @staticmethod
+    def _add_counters(record: Dict[str, Any], counters: Dict[str, Any]):
+        """Soma contadores ao registro do nó e recalcula as taxas por segundo."""
+        seconds = record.get("wall_seconds", 0.0) + record["save_seconds"]
+        for name, value in counters.items():
+            record[name] = record.get(name, 0) + value
+        for name in record.get("counters", []) + list(counters):
+            record[f"{name}_per_sec"] = record[name] / seconds if seconds else None
+        record["counters"] = sorted(set(record.get("counters", [])) | set(counters))
+
+    def _finish_node(self, node, status: str):
+        monitor, wall_start, cpu_start = self._running.pop(node.name)
+        wall_seconds = time.perf_counter() - wall_start
+        cpu_seconds = time.process_time() - cpu_start
+        monitor.__exit__(None, None, None)
+
+        record = self._record(node.name)
+        record.update(
+            {
+                "status": status,
+                "wall_seconds": wall_seconds,
+                "cpu_seconds": cpu_seconds,
+                "peak_rss_mb": monitor.peak_rss_mb,
+                "rss_delta_mb": monitor.peak_rss_delta_mb,
+            }
+        )
+        self._add_counters(record, collect_node_counters())
+        return record
+
+    @hook_impl
+    def after_node_run(self, node, outputs: Dict[str, Any]):
+        record = self._finish_node(node, "success")
+        record.update(
+            {f"output_{key}": value for key, value in _sum_counts(outputs).items()}
+        )
+
+    @hook_impl
+    def on_node_error(self, node):
+        if node.name in self._running:
+            self._finish_node(node, "error")
+
+    @hook_impl
+    def before_dataset_saved(self, dataset_name: str, node):
+        start_node_counters()
+        self._io_started[(node.name, dataset_name)] = time.perf_counter()
+
+    @hook_impl
+    def after_dataset_saved(self, dataset_name: str, node):
+        start = self._io_started.pop((node.name, dataset_name), None)
+        record = self._record(node.name)
+        if start is not None:
+            record["save_seconds"] += time.perf_counter() - start
+        counters = collect_node_counters()
+        if counters:
+            self._add_counters(record, counters)
+
+    def _save_metrics(self, catalog):
+        if not self._records:
+            return
+
+        import pandas as pd
+
+        session_id = self._run_params.get("session_id") or datetime.now(
+            timezone.utc
+        ).strftime("%Y-%m-%dT%H.%M.%S")
+        metrics = pd.DataFrame(list(self._records.values())).drop(
+            columns="counters", errors="ignore"
+        )
+        metrics.insert(0, "session_id", session_id)
+        metrics.insert(1, "pipeline_name", self._run_params.get("pipeline_name"))
+
+        if METRICS_DATASET not in catalog:
+            logger.warning(
+                f"Dataset '{METRICS_DATASET}' não está no catálogo; métricas de performance não salvas."
+            )
+            return
+
+        catalog.save(METRICS_DATASET, {session_id: metrics})
+        logger.info(
+            f"Métricas de performance de {len(metrics)} nós salvas ({session_id})."
+        )
+
+    @hook_impl
+    def after_pipeline_run(self, catalog):
+        self._save_metrics(catalog)
+
+    @hook_impl
+    def on_pipeline_error(self, catalog):
+        self._save_metrics(catalog)
@@ -1,25 +1,77 @@
 """Project pipelines."""
 
+import importlib
+from collections.abc import Mapping
+from typing import Callable
+
 from kedro.pipeline import Pipeline, pipeline
 
-from mtg_project.pipelines.modeling.pipeline import create_modeling_pipeline
-from mtg_project.pipelines.simulation.pipeline import create_simulation_pipeline
-from mtg_project.pipelines.webscraping.pipeline import create_webscraping_pipeline
+# Fábrica de cada pipeline: (módulo, função). Os módulos só são importados quando o
+# pipeline é usado, então `kedro run --pipeline webscraping` não carrega sklearn, shap etc.
+PIPELINE_FACTORIES = {
+    "webscraping": (
+        "mtg_project.pipelines.webscraping.pipeline",
+        "create_webscraping_pipeline",
+    ),
+    "simulation": (
+        "mtg_project.pipelines.simulation.pipeline",
+        "create_simulation_pipeline",
+    ),
+    "synthetic_simulation": (
+        "mtg_project.pipelines.simulation.pipeline",
+        "create_synthetic_simulation_pipeline",
+    ),
+    "modeling": (
+        "mtg_project.pipelines.modeling.pipeline",
+        "create_modeling_pipeline",
+    ),
+    "inference": (
+        "mtg_project.pipelines.inference.pipeline",
+        "create_inference_pipeline",
+    ),
+    "benchmark": (
+        "mtg_project.pipelines.benchmark.pipeline",
+        "create_benchmark_pipeline",
+    ),
+}
 
 
-def register_pipelines() -> dict[str, Pipeline]:
+def _create_pipeline(name: str) -> Pipeline:
+    module_name, factory_name = PIPELINE_FACTORIES[name]
+    return getattr(importlib.import_module(module_name), factory_name)()
 
-    webscraping_pipeline = create_webscraping_pipeline()
-    simulation_pipeline = create_simulation_pipeline()
-    modeling_pipeline = create_modeling_pipeline()
 
-    complete_pipeline = pipeline(
-        pipe=webscraping_pipeline + simulation_pipeline + modeling_pipeline
+def _create_complete_pipeline() -> Pipeline:
+    return pipeline(
+        pipe=_create_pipeline("webscraping")
+        + _create_pipeline("simulation")
+        + _create_pipeline("modeling")
     )
 
-    return {
-        "__default__": complete_pipeline,
-        "webscraping": webscraping_pipeline,
-        "simulation": simulation_pipeline,
-        "modeling": modeling_pipeline,
-    }
+
+class LazyPipelines(Mapping):
+    """Dicionário de pipelines que monta (e importa) cada pipeline apenas no primeiro acesso."""
+
+    def __init__(self, factories: dict[str, Callable[[], Pipeline]]):
+        self._factories = factories
+        self._pipelines: dict[str, Pipeline] = {}
+
+    def __getitem__(self, name: str) -> Pipeline:
+        if name not in self._pipelines:
+            self._pipelines[name] = self._factories[name]()
+        return self._pipelines[name]
+
+    def __iter__(self):
+        return iter(self._factories)
+
+    def __len__(self):
+        return len(self._factories)
+
+
+def register_pipelines() -> Mapping[str, Pipeline]:
+
+    factories = {"__default__": _create_complete_pipeline}
+    for name in PIPELINE_FACTORIES:
+        factories[name] = lambda name=name: _create_pipeline(name)
+
+    return LazyPipelines(factories)
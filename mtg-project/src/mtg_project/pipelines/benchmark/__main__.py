@@ -0,0 +1,85 @@
+"""Executa o benchmark fora do Kedro.
+
+Usa os parâmetros `benchmark` de `conf/base/parameters.yml` (sobrescrevíveis pela linha de
+comando), grava os resultados em JSON e compara com o baseline. Retorna código de saída 1
+se alguma métrica regredir além da tolerância.
+
+Uso:
+    python -m mtg_project.pipelines.benchmark --scales 5 20 --output results.json
+    python -m mtg_project.pipelines.benchmark --update-baseline
+    python -m mtg_project.pipelines.benchmark --imports-only
+"""
+
+import argparse
+import json
+import logging
+import sys
+
+import fsspec
+from kedro.config import OmegaConfigLoader
+
+from .nodes import compare_with_baseline, run_benchmarks
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--conf-source", default="conf", help="Pasta de configuração do Kedro"
+    )
+    parser.add_argument(
+        "--scales", type=int, nargs="+", help="Números de decks a medir"
+    )
+    parser.add_argument(
+        "--imports-only",
+        action="store_true",
+        help="Mede apenas os tempos de import contra os orçamentos",
+    )
+    parser.add_argument("--output", help="JSON onde gravar os resultados")
+    parser.add_argument("--baseline", help="JSON de baseline para comparação")
+    parser.add_argument("--tolerance", type=float)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Grava os resultados como o novo baseline em vez de comparar",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    params = OmegaConfigLoader(
+        args.conf_source, base_env="base", default_run_env="local"
+    )["parameters"]["benchmark"]
+    if args.scales:
+        params["scales"] = args.scales
+    if args.imports_only:
+        params["scales"] = []
+    if args.baseline:
+        params["baseline_path"] = args.baseline
+    if args.tolerance is not None:
+        params["tolerance"] = args.tolerance
+
+    benchmark_results = run_benchmarks(params)
+
+    output_paths = [args.output] if args.output else []
+    if args.update_baseline:
+        output_paths.append(params["baseline_path"])
+    for path in output_paths:
+        with fsspec.open(path, "w", auto_mkdir=True) as file:
+            json.dump(benchmark_results, file, indent=2)
+        logger.info(f"Resultados gravados em {path}.")
+
+    if args.update_baseline:
+        return 0
+
+    report = compare_with_baseline(
+        benchmark_results, params["baseline_path"], params["tolerance"]
+    )
+    print(report.to_string(index=False))
+
+    return 1 if report["regression"].any() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
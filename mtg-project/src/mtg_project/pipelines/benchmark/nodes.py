@@ -0,0 +1,705 @@
+"""Benchmark nodes."""
+
+import io
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from copy import deepcopy
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+import fsspec
+import numpy as np
+import pandas as pd
+
+from classes.deck import Deck
+from classes.deck_generator import SyntheticDeckGenerator
+from classes.player import Player
+from classes.player_tracker import HAND_LOG_MODES, PlayerTracker
+from classes.running_features import RUNNING_FEATURE_COLUMNS
+
+from ..modeling.nodes import (
+    compute_feature_corr_stats,
+    feature_engineering,
+    feature_selection,
+    fit_model,
+)
+from ..simulation.nodes import derive_seed
+from ..utils import PeakMemoryMonitor
+
+# Loggers silenciados durante as medições (o log por jogada domina o tempo da simulação)
+ENGINE_LOGGERS = (
+    "classes",
+    "mtg_project.pipelines.simulation",
+    "mtg_project.pipelines.modeling",
+)
+
+# Métricas comparadas com o baseline: True se maior é melhor
+COMPARED_METRICS = {"items_per_sec": True, "rows_per_sec": True, "peak_rss_mb": False}
+
+
+@contextmanager
+def _quiet_loggers(level: str):
+    """Eleva temporariamente o nível dos loggers do simulador e da modelagem."""
+    loggers = [logging.getLogger(name) for name in ENGINE_LOGGERS]
+    previous = [logger.level for logger in loggers]
+    for logger in loggers:
+        logger.setLevel(level)
+    try:
+        yield
+    finally:
+        for logger, old_level in zip(loggers, previous):
+            logger.setLevel(old_level)
+
+
+def _round_trip(match_df: pd.DataFrame) -> pd.DataFrame:
+    """Serializa em Parquet e lê de volta, como o PartitionedDataset faz entre os nós."""
+    buffer = io.BytesIO()
+    match_df.to_parquet(buffer)
+    buffer.seek(0)
+    return pd.read_parquet(buffer)
+
+
+def _measure(stage: str, scale: int, func: Callable[[], Any]) -> tuple:
+    """
+    Executa uma etapa medindo o tempo de parede e o pico de RSS.
+
+    `func` retorna `(resultado, n_itens, n_linhas)`.
+    """
+    with PeakMemoryMonitor() as monitor:
+        start = time.perf_counter()
+        result, n_items, n_rows = func()
+        seconds = time.perf_counter() - start
+
+    record = {
+        "stage": stage,
+        "scale": scale,
+        "items": n_items,
+        "rows": n_rows,
+        "seconds": round(seconds, 6),
+        "items_per_sec": round(n_items / seconds, 3) if seconds else None,
+        "rows_per_sec": round(n_rows / seconds, 3) if seconds and n_rows else None,
+        "peak_rss_mb": round(monitor.peak_rss_mb, 2),
+        "peak_rss_delta_mb": round(monitor.peak_rss_delta_mb, 2),
+    }
+    return result, record
+
+
+def measure_import_time(module: str) -> float:
+    """
+    Mede, em segundos, o tempo de import de um módulo em um interpretador novo, pelo
+    tempo cumulativo reportado por `python -X importtime` (sem o início do interpretador).
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+        check=True,
+    )
+
+    # Linhas no formato "import time: self [us] | cumulative | imported package"
+    for line in reversed(completed.stderr.splitlines()):
+        _, _, fields = line.partition("import time:")
+        parts = [part.strip() for part in fields.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1e6
+
+    raise ValueError(
+        f"Tempo de import de '{module}' não encontrado na saída do -X importtime."
+    )
+
+
+def _benchmark_imports(
+    budgets_ms: Dict[str, float], repeats: int
+) -> List[Dict[str, Any]]:
+    """Mede o tempo de import de cada módulo (melhor de `repeats`) contra o seu orçamento."""
+    records = []
+    for module, budget_ms in budgets_ms.items():
+        seconds = min(measure_import_time(module) for _ in range(repeats))
+        records.append(
+            {
+                "stage": f"import:{module}",
+                "scale": 1,
+                "items": 1,
+                "rows": None,
+                "seconds": round(seconds, 6),
+                "items_per_sec": round(1 / seconds, 3),
+                "rows_per_sec": None,
+                "peak_rss_mb": None,
+                "peak_rss_delta_mb": None,
+                "budget_seconds": budget_ms / 1000,
+            }
+        )
+    return records
+
+
+def _benchmark_scale(scale: int, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Mede todas as etapas para `scale` decks (um jogador por deck)."""
+    simulation = params["simulation"]
+    records = []
+
+    # Fora da medição: decks Standard do gerador sintético
+    generator = SyntheticDeckGenerator(seed=params["random_state"])
+    decklists = generator.generate_many(scale, formats=["Standard"])
+
+    # Remontagem e validação dos decks (Deck.add_card + Deck.is_valid)
+    def build_decks():
+        decks = []
+        for deck_name, decklist in decklists.items():
+            deck = Deck(deck_name=deck_name)
+            for card in decklist.cards:
+                deck.add_card(card)
+            deck.deck_colors.update(deck.colors_in_deck())
+            if not deck.is_valid():
+                raise ValueError(f"Deck sintético '{deck_name}' inválido no benchmark.")
+            decks.append(deck)
+        return decks, len(decks), sum(len(deck) for deck in decks)
+
+    decks, record = _measure("deck_building", scale, build_decks)
+    records.append(record)
+
+    # Registro de turnos isolado (PlayerTracker.log_turn)
+    def log_turns():
+        n_rows = 0
+        for deck in decks:
+            player = Player("Benchmark Player", deck)
+            player.new_match()
+            player.draw_initial_hand()
+            tracker = PlayerTracker(hand_log_mode=simulation["hand_log_mode"])
+            for _ in range(simulation["max_turns"]):
+                tracker.log_turn(player)
+            n_rows += len(tracker.get_data())
+        return None, n_rows, n_rows
+
+    _, record = _measure("tracker_logging", scale, log_turns)
+    records.append(record)
+
+    # Simulação de partidas completas (Player.play_a_match)
+    def simulate():
+        random.seed(params["random_state"])
+        match_dfs = {}
+        for deck_idx, deck in enumerate(decks):
+            player = Player(f"Player {deck_idx}", deck)
+            for match_num in range(1, simulation["matches_per_player"] + 1):
+                tracker = PlayerTracker(hand_log_mode=simulation["hand_log_mode"])
+                player.play_a_match(
+                    tracker,
+                    simulation["max_mulligans"],
+                    simulation["mulligan_prob"],
+                    simulation["max_turns"],
+                    simulation["hand_size_stop"],
+                    simulation["extra_land_prob"],
+                    colored_mana=simulation["colored_mana"],
+                )
+                partition_key = f"Player_{deck_idx}/match_{str(match_num).zfill(3)}"
+                match_dfs[partition_key] = tracker.get_data()
+        n_rows = sum(len(match_df) for match_df in match_dfs.values())
+        return match_dfs, len(match_dfs), n_rows
+
+    match_dfs, record = _measure("simulation", scale, simulate)
+    records.append(record)
+
+    # Simulação com o kernel compilado (sementes por partida), quando o Numba está instalado
+    from classes.match_kernel import NUMBA_AVAILABLE, play_matches
+
+    if NUMBA_AVAILABLE:
+        match_numbers = list(range(1, simulation["matches_per_player"] + 1))
+
+        def simulate_kernel():
+            n_matches, n_rows = 0, 0
+            for deck_idx, deck in enumerate(decks):
+                player = Player(f"Player {deck_idx}", deck)
+                rngs = [
+                    random.Random(
+                        derive_seed(params["random_state"], deck_idx, match_num)
+                    )
+                    for match_num in match_numbers
+                ]
+                matches = play_matches(
+                    player,
+                    rngs,
+                    match_numbers,
+                    simulation["max_mulligans"],
+                    simulation["mulligan_prob"],
+                    simulation["max_turns"],
+                    simulation["hand_size_stop"],
+                    simulation["extra_land_prob"],
+                    hand_log_mode=simulation["hand_log_mode"],
+                    colored_mana=simulation["colored_mana"],
+                )
+                for match_records in matches:
+                    tracker = PlayerTracker(hand_log_mode=simulation["hand_log_mode"])
+                    tracker.log_records(match_records)
+                    n_rows += len(tracker.get_data())
+                n_matches += len(matches)
+            return None, n_matches, n_rows
+
+        # Fora da medição: compilação (ou carga do cache) do kernel
+        play_matches(
+            Player("Warm-up", decks[0]), [random.Random(0)], [1], 0, 0.0, 1, 0, 0.0
+        )
+        _, record = _measure("simulation_kernel", scale, simulate_kernel)
+        records.append(record)
+
+    # Fora da medição: mesmo formato que o feature_engineering recebe do catálogo
+    partitions = {
+        key: (lambda match_df=_round_trip(match_df): match_df.copy())
+        for key, match_df in match_dfs.items()
+    }
+    del match_dfs
+
+    def engineer_features():
+        features_df = feature_engineering(partitions)
+        return features_df, len(partitions), len(features_df)
+
+    features_df, record = _measure("feature_engineering", scale, engineer_features)
+    records.append(record)
+
+    # Fora da medição: as mesmas partidas com as features por turno do tracker
+    def with_running_features(match_df):
+        tracker = PlayerTracker(
+            hand_log_mode=simulation["hand_log_mode"], running_features=True
+        )
+        tracker.log_records(match_df.to_dict("records"))
+        return _round_trip(tracker.get_data())
+
+    fused_partitions = {
+        key: (lambda match_df=with_running_features(load()): match_df.copy())
+        for key, load in partitions.items()
+    }
+
+    def engineer_fused_features():
+        fused_df = feature_engineering(fused_partitions)
+        return None, len(fused_partitions), len(fused_df)
+
+    _, record = _measure("feature_engineering_fused", scale, engineer_fused_features)
+    records.append(record)
+    fused_partitions.clear()
+
+    modeling = params["modeling"]
+    target = modeling["target_column"]
+
+    def select_features():
+        stats = compute_feature_corr_stats(
+            features_df, modeling["corr_chunk_size"], target
+        )
+        selected = feature_selection(
+            features_df, stats, modeling["feat_corr_threshold"], target
+        )
+        return selected, len(stats["columns"]), len(features_df)
+
+    (_, selected_cols), record = _measure("feature_selection", scale, select_features)
+    records.append(record)
+
+    def fit():
+        fit_model(
+            features_df[selected_cols],
+            features_df[[target]],
+            modeling["params_grid"],
+            modeling["search"],
+        )
+        return None, 1, len(features_df)
+
+    _, record = _measure("fit_model", scale, fit)
+    records.append(record)
+
+    return records
+
+
+def run_benchmarks(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Mede a vazão e o pico de memória das etapas críticas do projeto com decks sintéticos.
+
+    Para cada escala (número de decks/jogadores), mede a montagem e validação dos decks,
+    o registro de turnos do `PlayerTracker`, a simulação de partidas, a engenharia de
+    features, a seleção de features e o ajuste do modelo. Cada escala roda `repeats` vezes
+    e é mantida a rodada mais rápida de cada etapa. Nenhuma carta é consultada no
+    `mtgsdk`, então o benchmark roda offline e é reprodutível pela `random_state`.
+
+    Também mede o tempo de import, em um interpretador novo, de cada módulo em
+    `import_budgets_ms`, para acompanhar o tempo de início da CLI e dos workers.
+
+    Args:
+        params (Dict[str, Any]): Parâmetros do benchmark (ver `params:benchmark`).
+
+    Returns:
+        Dict[str, Any]: Metadados da execução e uma lista `results` com uma linha por
+            etapa e escala (`items_per_sec`, `rows_per_sec`, `peak_rss_mb`, ...).
+    """
+    logger = logging.getLogger(__name__)
+
+    records = []
+    with _quiet_loggers(params["engine_log_level"]):
+        for scale in params["scales"]:
+            logger.info(f"Executando o benchmark com {scale} decks...")
+            rounds = [_benchmark_scale(scale, params) for _ in range(params["repeats"])]
+
+            # Mantém a rodada mais rápida de cada etapa (menos sujeita a ruído da máquina)
+            for stage_rounds in zip(*rounds):
+                record = min(
+                    stage_rounds, key=lambda stage_round: stage_round["seconds"]
+                )
+                logger.info(
+                    f"{record['stage']} (escala {scale}): {record['items_per_sec']} itens/s, "
+                    f"{record['rows_per_sec']} linhas/s, pico de {record['peak_rss_mb']} MB"
+                )
+                records.append(record)
+
+    # Tempo de import dos módulos usados pela CLI, pelos pipelines e pelos workers
+    for record in _benchmark_imports(params["import_budgets_ms"], params["repeats"]):
+        logger.info(
+            f"{record['stage']}: {record['seconds'] * 1000:.0f} ms "
+            f"(orçamento de {record['budget_seconds'] * 1000:.0f} ms)"
+        )
+        records.append(record)
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "params": params,
+        "results": records,
+    }
+
+
+def check_kernel_parity(params: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Confere se o kernel compilado (`simulation.engine: kernel`) reproduz o motor python.
+
+    Para decks sintéticos de cada formato em `kernel_parity.formats` e cada modo de registro
+    da mão, simula as mesmas partidas (mesmas sementes, logo os mesmos embaralhamentos) com
+    `Player.play_a_match` e com `classes.match_kernel.play_matches`, e compara os DataFrames
+    do tracker (valores e tipos) e o estado final do jogador. Sem o Numba, o kernel roda como
+    Python puro: mais lento, mas as regras são conferidas da mesma forma.
+
+    Args:
+        params (Dict[str, Any]): Parâmetros do benchmark (ver `params:benchmark`), com
+            `kernel_parity.n_decks`, `kernel_parity.matches_per_deck` e `kernel_parity.formats`.
+
+    Returns:
+        pd.DataFrame: Uma linha por partida comparada, com `identical` e as colunas que divergem.
+
+    Raises:
+        RuntimeError: Se alguma partida divergir do motor python.
+    """
+    from classes.match_kernel import NUMBA_AVAILABLE, play_matches
+
+    logger = logging.getLogger(__name__)
+
+    simulation = params["simulation"]
+    parity = params["kernel_parity"]
+    generator = SyntheticDeckGenerator(seed=params["random_state"])
+    decks = generator.generate_many(parity["n_decks"], formats=parity["formats"])
+
+    def player_state(player):
+        return (
+            player.turn,
+            player.cards_drawn,
+            player.mulligan_count,
+            player.lands_played,
+            player.spells_played,
+            player.mana_pool,
+            player.spent_mana,
+            [card.name for card in player.hand.cards],
+            [card.name for card in player.library.cards],
+            [card.name for card in player.battlefield.lands],
+            list(player.battlefield.color_supply),
+            [card.name for card in player.graveyard.cards],
+            player.rng.getstate(),
+        )
+
+    rows = []
+    with _quiet_loggers(params["engine_log_level"]):
+        for hand_log_mode in HAND_LOG_MODES:
+            for deck_idx, (deck_name, deck) in enumerate(decks.items()):
+                python_player = Player(f"Player {deck_idx}", deck)
+                kernel_player = deepcopy(python_player)
+                for match_num in range(1, parity["matches_per_deck"] + 1):
+                    seed = derive_seed(params["random_state"], deck_idx, match_num)
+
+                    tracker = PlayerTracker(hand_log_mode=hand_log_mode)
+                    python_player.rng = random.Random(seed)
+                    python_player.play_a_match(
+                        tracker,
+                        simulation["max_mulligans"],
+                        simulation["mulligan_prob"],
+                        simulation["max_turns"],
+                        simulation["hand_size_stop"],
+                        simulation["extra_land_prob"],
+                        match_number=match_num,
+                        colored_mana=simulation["colored_mana"],
+                    )
+                    expected = tracker.get_data()
+
+                    [records] = play_matches(
+                        kernel_player,
+                        [random.Random(seed)],
+                        [match_num],
+                        simulation["max_mulligans"],
+                        simulation["mulligan_prob"],
+                        simulation["max_turns"],
+                        simulation["hand_size_stop"],
+                        simulation["extra_land_prob"],
+                        hand_log_mode=hand_log_mode,
+                        colored_mana=simulation["colored_mana"],
+                    )
+                    tracker = PlayerTracker(hand_log_mode=hand_log_mode)
+                    tracker.log_records(records)
+                    result = tracker.get_data()
+
+                    mismatched = [
+                        column
+                        for column in expected.columns
+                        if column not in result.columns
+                        or len(expected) != len(result)
+                        or expected[column].dtype != result[column].dtype
+                        or not expected[column]
+                        .astype(str)
+                        .equals(result[column].astype(str))
+                    ]
+                    if player_state(python_player) != player_state(kernel_player):
+                        mismatched.append("player_state")
+
+                    rows.append(
+                        {
+                            "hand_log_mode": hand_log_mode,
+                            "deck_name": deck_name,
+                            "match": match_num,
+                            "rows": len(expected),
+                            "identical": not mismatched,
+                            "mismatched": ", ".join(mismatched),
+                        }
+                    )
+
+    report = pd.DataFrame(rows)
+    n_mismatched = int((~report["identical"]).sum())
+    engine = "compilado" if NUMBA_AVAILABLE else "Python puro (Numba não instalado)"
+    if n_mismatched:
+        # Falha o `kedro run --pipeline benchmark` (o relatório não é salvo, então as
+        # divergências vão para o log)
+        mismatches = report.loc[~report["identical"]]
+        logger.error(f"Partidas divergentes:\n{mismatches.to_string(index=False)}")
+        raise RuntimeError(
+            f"Kernel ({engine}) divergiu do motor python em {n_mismatched} de {len(report)} partidas."
+        )
+
+    logger.info(
+        f"Kernel ({engine}) idêntico ao motor python em {len(report)} partidas."
+    )
+
+    return report
+
+
+def check_running_features_parity(params: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Confere se as features por turno do tracker (`simulation.running_features`) reproduzem as
+    do `feature_engineering`.
+
+    Simula partidas de decks sintéticos com o tracker calculando as features e roda o
+    `feature_engineering` sobre as partições com e sem essas colunas (após a ida e volta em
+    Parquet, como no catálogo). As duas saídas devem ter as mesmas linhas, colunas e tipos;
+    os valores devem ser idênticos, exceto as médias móveis, que podem diferir da soma
+    incremental do pandas em até `tolerance`.
+
+    Args:
+        params (Dict[str, Any]): Parâmetros do benchmark (ver `params:benchmark`), com
+            `running_features_parity.n_decks`, `running_features_parity.matches_per_deck`,
+            `running_features_parity.formats` e `running_features_parity.tolerance`.
+
+    Returns:
+        pd.DataFrame: Uma linha por coluna da saída, com a maior diferença absoluta,
+            `identical` e `within_tolerance`.
+
+    Raises:
+        RuntimeError: Se alguma coluna divergir além da tolerância.
+    """
+    logger = logging.getLogger(__name__)
+
+    simulation = params["simulation"]
+    parity = params["running_features_parity"]
+    generator = SyntheticDeckGenerator(seed=params["random_state"])
+    decks = generator.generate_many(parity["n_decks"], formats=parity["formats"])
+
+    fused_partitions, plain_partitions = {}, {}
+    with _quiet_loggers(params["engine_log_level"]):
+        for deck_idx, deck in enumerate(decks.values()):
+            player = Player(f"Player {deck_idx}", deck)
+            for match_num in range(1, parity["matches_per_deck"] + 1):
+                tracker = PlayerTracker(
+                    hand_log_mode=simulation["hand_log_mode"], running_features=True
+                )
+                player.rng = random.Random(
+                    derive_seed(params["random_state"], deck_idx, match_num)
+                )
+                player.play_a_match(
+                    tracker,
+                    simulation["max_mulligans"],
+                    simulation["mulligan_prob"],
+                    simulation["max_turns"],
+                    simulation["hand_size_stop"],
+                    simulation["extra_land_prob"],
+                    match_number=match_num,
+                    colored_mana=simulation["colored_mana"],
+                )
+                fused_df = _round_trip(tracker.get_data())
+                plain_df = fused_df.drop(columns=list(RUNNING_FEATURE_COLUMNS))
+
+                partition_key = f"Player_{deck_idx}/match_{str(match_num).zfill(3)}"
+                fused_partitions[partition_key] = (
+                    lambda match_df=fused_df: match_df.copy()
+                )
+                plain_partitions[partition_key] = (
+                    lambda match_df=plain_df: match_df.copy()
+                )
+
+        expected = feature_engineering(plain_partitions)
+        result = feature_engineering(fused_partitions)
+
+    if list(expected.columns) != list(result.columns) or not expected.index.equals(
+        result.index
+    ):
+        logger.error(
+            "Features do tracker com colunas ou linhas diferentes do feature_engineering."
+        )
+
+    rows = []
+    for column in expected.columns:
+        expected_values, result_values = expected[column], result.get(column)
+        same_dtype = (
+            result_values is not None and expected_values.dtype == result_values.dtype
+        )
+        identical = same_dtype and expected_values.equals(result_values)
+        max_abs_diff = None
+        if same_dtype and pd.api.types.is_numeric_dtype(expected_values):
+            max_abs_diff = float(
+                np.abs(
+                    expected_values.to_numpy(float) - result_values.to_numpy(float)
+                ).max()
+            )
+        rows.append(
+            {
+                "column": column,
+                "precomputed": column in RUNNING_FEATURE_COLUMNS,
+                "max_abs_diff": max_abs_diff,
+                "identical": identical,
+                "within_tolerance": identical
+                or (
+                    column.startswith("rolling_mean_")
+                    and max_abs_diff is not None
+                    and max_abs_diff <= parity["tolerance"]
+                ),
+            }
+        )
+
+    report = pd.DataFrame(rows)
+    n_mismatched = int((~report["within_tolerance"]).sum())
+    if n_mismatched:
+        # Como no check_kernel_parity, o relatório não chega ao catálogo
+        mismatches = report.loc[~report["within_tolerance"]]
+        logger.error(f"Colunas divergentes:\n{mismatches.to_string(index=False)}")
+        raise RuntimeError(
+            f"Features do tracker divergiram do feature_engineering em {n_mismatched} colunas: "
+            f"{', '.join(mismatches['column'])}."
+        )
+
+    logger.info(
+        f"Features do tracker equivalentes ao feature_engineering em {len(expected)} linhas "
+        f"({int(report['identical'].sum())} de {len(report)} colunas idênticas)."
+    )
+
+    return report
+
+
+def compare_with_baseline(
+    benchmark_results: Dict[str, Any], baseline_path: str, tolerance: float
+) -> pd.DataFrame:
+    """
+    Compara os resultados do benchmark com um baseline salvo anteriormente.
+
+    Uma métrica é marcada como regressão quando piora mais que `tolerance` (fração) em
+    relação ao baseline: vazão menor ou pico de memória maior. Sem baseline, o relatório
+    é gerado apenas com os valores atuais. Os tempos de import também são comparados com
+    o orçamento de cada módulo (métrica `seconds_vs_budget`), independente do baseline.
+
+    Args:
+        benchmark_results (Dict[str, Any]): Saída de `run_benchmarks`.
+        baseline_path (str): Caminho do JSON de baseline (local ou remoto, via fsspec).
+        tolerance (float): Piora relativa tolerada antes de acusar regressão (ex.: 0.2).
+
+    Returns:
+        pd.DataFrame: Uma linha por etapa, escala e métrica, com `current`, `baseline`,
+            `ratio` (atual / baseline) e `regression`.
+    """
+    logger = logging.getLogger(__name__)
+
+    baseline_records = []
+    fs, path = fsspec.core.url_to_fs(baseline_path)
+    if fs.exists(path):
+        with fs.open(path, "r") as file:
+            baseline_records = json.load(file)["results"]
+    else:
+        logger.warning(f"Baseline não encontrado em {baseline_path}.")
+
+    baseline = {
+        (record["stage"], record["scale"]): record for record in baseline_records
+    }
+
+    rows = []
+    for record in benchmark_results["results"]:
+        baseline_record = baseline.get((record["stage"], record["scale"]), {})
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            current = record.get(metric)
+            reference = baseline_record.get(metric)
+            if current is None:
+                continue
+
+            ratio = None
+            regression = False
+            if current is not None and reference:
+                ratio = current / reference
+                if higher_is_better:
+                    regression = ratio < 1 - tolerance
+                else:
+                    regression = ratio > 1 + tolerance
+
+            rows.append(
+                {
+                    "stage": record["stage"],
+                    "scale": record["scale"],
+                    "metric": metric,
+                    "current": current,
+                    "baseline": reference,
+                    "ratio": ratio,
+                    "regression": regression,
+                }
+            )
+
+        if record.get("budget_seconds") is not None:
+            rows.append(
+                {
+                    "stage": record["stage"],
+                    "scale": record["scale"],
+                    "metric": "seconds_vs_budget",
+                    "current": record["seconds"],
+                    "baseline": record["budget_seconds"],
+                    "ratio": record["seconds"] / record["budget_seconds"],
+                    "regression": record["seconds"] > record["budget_seconds"],
+                }
+            )
+
+    report = pd.DataFrame(rows)
+    for row in report[report["regression"]].itertuples():
+        logger.warning(
+            f"Regressão em {row.stage} (escala {row.scale}): {row.metric} = {row.current} "
+            f"contra {row.baseline} no baseline."
+        )
+
+    return report
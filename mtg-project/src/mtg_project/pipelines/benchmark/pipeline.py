@@ -0,0 +1,45 @@
+"""Benchmark pipeline."""
+
+from kedro.pipeline import Pipeline, node
+
+from .nodes import (
+    check_kernel_parity,
+    check_running_features_parity,
+    compare_with_baseline,
+    run_benchmarks,
+)
+
+
+def create_benchmark_pipeline(**kwargs) -> Pipeline:
+    return Pipeline(
+        [
+            node(
+                func=run_benchmarks,
+                inputs="params:benchmark",
+                outputs="benchmark_results",
+                name="run_benchmarks_node",
+            ),
+            node(
+                func=compare_with_baseline,
+                inputs=[
+                    "benchmark_results",
+                    "params:benchmark.baseline_path",
+                    "params:benchmark.tolerance",
+                ],
+                outputs="benchmark_report",
+                name="compare_with_baseline_node",
+            ),
+            node(
+                func=check_kernel_parity,
+                inputs="params:benchmark",
+                outputs="kernel_parity",
+                name="check_kernel_parity_node",
+            ),
+            node(
+                func=check_running_features_parity,
+                inputs="params:benchmark",
+                outputs="running_features_parity",
+                name="check_running_features_parity_node",
+            ),
+        ]
+    )
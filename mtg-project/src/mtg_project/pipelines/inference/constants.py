@@ -1,5 +0,0 @@
-"""Modeling constants."""
-
-derived_feats = ["cum_spent_mana", "cum_mana_pool", "spent_mana", "mana_pool"]
-
-key_cols = ["name", "deck_name", "match", "turn"]
@@ -1 +1,67 @@
-"""ML Modeling Pipeline."""
+"""Inference nodes."""
+
+import logging
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from ..modeling.compiled_tree import CompiledTree
+from ..modeling.constants import key_cols
+
+
+def predict_in_batches(
+    compiled_model: CompiledTree,
+    features_df: pd.DataFrame,
+    selected_features_cols: List[str],
+    batch_size: int,
+    target_column: str,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Pontua as partidas simuladas com o modelo treinado, sem retreinar, em lotes vetorizados.
+
+    As features são selecionadas na mesma ordem usada no treino e convertidas uma única vez
+    para uma matriz float32 contígua; o preditor compilado é chamado uma vez por lote de
+    `batch_size` linhas.
+
+    Args:
+        compiled_model (CompiledTree): Preditor compilado do `best_model`.
+        features_df (pd.DataFrame): Features das novas partidas (mesma engenharia de features do treino).
+        selected_features_cols (List[str]): Features usadas no treino do modelo.
+        batch_size (int): Número de linhas por chamada ao modelo.
+        target_column (str): Nome da variável prevista.
+
+    Returns:
+        Dict[str, pd.DataFrame]: Previsões particionadas por jogador, com as colunas-chave.
+    """
+    # Configura o logger geral
+    logger = logging.getLogger(__name__)
+
+    missing_cols = [col for col in selected_features_cols if col not in features_df]
+    if missing_cols:
+        raise ValueError(f"Features ausentes para a inferência: {missing_cols}")
+
+    # Matriz contígua com as features na ordem do treino
+    features = compiled_model.to_matrix(features_df[selected_features_cols])
+
+    logger.info(f"Pontuando {len(features)} linhas em lotes de {batch_size} linhas...")
+    predictions = np.empty(len(features), dtype=np.float64)
+    for start in range(0, len(features), batch_size):
+        predictions[start : start + batch_size] = compiled_model.predict(
+            features[start : start + batch_size]
+        )
+
+    predicted_df = features_df[key_cols + ["player_name", "match_id"]].copy()
+    predicted_df[f"predicted_{target_column}"] = predictions
+
+    # Uma partição por jogador
+    inference_predictions = {
+        player_name: player_df.reset_index(drop=True)
+        for player_name, player_df in predicted_df.groupby("player_name", sort=True)
+    }
+
+    logger.info(
+        f"Inferência concluída: {len(inference_predictions)} partições de previsões."
+    )
+
+    return inference_predictions
@@ -1,54 +1,56 @@
-from kedro.pipeline import Pipeline, node
+"""Inference pipeline."""
 
-from .nodes import feature_engineering, feature_selection, fit_model, train_test_split
+from kedro.pipeline import Pipeline, node, pipeline
 
+from ..modeling.nodes import feature_engineering
+from ..simulation.pipeline import create_simulation_pipeline
+from .nodes import predict_in_batches
 
-def create_modeling_pipeline(**kwargs) -> Pipeline:
-    return Pipeline(
+
+def create_inference_pipeline(**kwargs) -> Pipeline:
+    """
+    Simula partidas para os decks novos (`inference_decks`) e as pontua com o preditor
+    compilado do `best_model` já treinado, reaproveitando os nós de simulação e de engenharia de features.
+    """
+    simulation_pipeline = create_simulation_pipeline()
+
+    # Mesmos nós da simulação, gravando nos datasets de inferência
+    inference_simulation_pipeline = pipeline(
+        simulation_pipeline,
+        namespace="inference",
+        inputs={"sampled_decks": "inference_decks"},
+        outputs={
+            "players_with_decks": "inference_players_with_decks",
+            "matches_df": "inference_matches_df",
+        },
+        parameters={
+            dataset
+            for dataset in simulation_pipeline.inputs()
+            if dataset.startswith("params:")
+        },
+    )
+
+    scoring_pipeline = Pipeline(
         [
             node(
                 func=feature_engineering,
-                inputs=["matches_df"],
-                outputs="features_df",
-                name="feature_engineering_node",
-            ),
-            node(
-                func=feature_selection,
-                inputs=[
-                    "features_df",
-                    "params:modeling.feature_engineering.feat_corr_threshold",
-                ],
-                outputs=["selected_features_df", "selected_features_cols"],
-                name="feature_selection_node",
+                inputs=["inference_matches_df"],
+                outputs="inference_features_df",
+                name="inference_feature_engineering_node",
             ),
             node(
-                func=train_test_split,
+                func=predict_in_batches,
                 inputs=[
-                    "selected_features_df",
-                    "params:modeling.feature_selection.target_column",
+                    "compiled_model",
+                    "inference_features_df",
                     "selected_features_cols",
-                    "params:modeling.feature_selection.hide_players",
-                    "params:modeling.feature_selection.n_test_players",
-                    "params:modeling.feature_selection.hide_advanced_turns",
-                    "params:modeling.feature_selection.turn_threshold",
-                ],
-                outputs=[
-                    "train_features",
-                    "test_features",
-                    "train_target",
-                    "test_target",
-                ],
-                name="split_train_test_node",
-            ),
-            node(
-                func=fit_model,
-                inputs=[
-                    "train_features",
-                    "train_target",
-                    "params:modeling.model_selection.params_grid",
+                    "params:inference.batch_size",
+                    "params:modeling.feature_selection.target_column",
                 ],
-                outputs=["best_model", "best_hiper_params"],
-                name="fit_decision_tree_model_node",
+                outputs="inference_predictions",
+                name="predict_in_batches_node",
             ),
         ]
     )
+
+    return inference_simulation_pipeline + scoring_pipeline
@@ -0,0 +1,112 @@
+"""Preditor compilado (arrays NumPy contíguos) para árvores de decisão do scikit-learn."""
+
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+
+class CompiledTree:
+    """
+    Árvore de decisão achatada em arrays contíguos, com predição vetorizada sem pandas.
+
+    Cada nó guarda a feature, o limiar e os filhos; as folhas apontam para si mesmas. Todas as
+    linhas descem a árvore juntas, um nível por iteração, e saem do lote ao chegar a uma folha.
+    As comparações usam a matriz em float32 contra limiares em float64, exatamente como o
+    scikit-learn, então as previsões são idênticas às do `DecisionTreeRegressor`.
+
+    Attributes:
+        feature (np.ndarray): Índice da feature testada em cada nó (int32).
+        threshold (np.ndarray): Limiar de cada nó (float64).
+        children_left (np.ndarray): Filho esquerdo (`x <= limiar`) de cada nó (int32).
+        children_right (np.ndarray): Filho direito de cada nó (int32).
+        value (np.ndarray): Valor previsto em cada nó (float64).
+        feature_names (List[str]): Features na ordem esperada pelo modelo.
+        max_depth (int): Profundidade máxima da árvore.
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        children_left: np.ndarray,
+        children_right: np.ndarray,
+        value: np.ndarray,
+        feature_names: List[str],
+        max_depth: int,
+    ):
+        self.feature = np.ascontiguousarray(feature, dtype=np.int32)
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float64)
+        self.children_left = np.ascontiguousarray(children_left, dtype=np.int32)
+        self.children_right = np.ascontiguousarray(children_right, dtype=np.int32)
+        self.value = np.ascontiguousarray(value, dtype=np.float64)
+        self.feature_names = list(feature_names)
+        self.max_depth = int(max_depth)
+
+    @classmethod
+    def from_sklearn(cls, model) -> "CompiledTree":
+        """
+        Achata um `DecisionTreeRegressor` ajustado (com uma única saída).
+        """
+        tree = model.tree_
+        if tree.n_outputs != 1:
+            raise ValueError("Apenas árvores com uma única saída são suportadas.")
+
+        is_leaf = tree.children_left == -1
+        node_ids = np.arange(tree.node_count)
+
+        # Folhas apontam para si mesmas e testam a feature 0 (o resultado é descartado)
+        return cls(
+            feature=np.where(is_leaf, 0, tree.feature),
+            threshold=np.where(is_leaf, 0.0, tree.threshold),
+            children_left=np.where(is_leaf, node_ids, tree.children_left),
+            children_right=np.where(is_leaf, node_ids, tree.children_right),
+            value=tree.value[:, 0, 0],
+            feature_names=getattr(
+                model, "feature_names_in_", [str(i) for i in range(tree.n_features)]
+            ),
+            max_depth=tree.max_depth,
+        )
+
+    def to_matrix(self, features) -> np.ndarray:
+        """
+        Converte as features para a matriz float32 contígua usada na predição.
+
+        Aceita um DataFrame (as colunas são reordenadas por `feature_names`) ou uma matriz
+        já na ordem do modelo.
+        """
+        if isinstance(features, pd.DataFrame):
+            features = features[self.feature_names].to_numpy()
+        return np.ascontiguousarray(features, dtype=np.float32)
+
+    def predict(self, features) -> np.ndarray:
+        """
+        Prevê todas as linhas, descendo a árvore nível a nível.
+
+        Args:
+            features (pd.DataFrame | np.ndarray): Features (ver `to_matrix`).
+
+        Returns:
+            np.ndarray: Previsões (float64), idênticas às de `model.predict`.
+        """
+        matrix = self.to_matrix(features)
+        nodes = np.zeros(len(matrix), dtype=np.int32)
+
+        # Linhas que ainda não chegaram a uma folha (folhas apontam para si mesmas)
+        active = np.arange(len(matrix))
+        while active.size:
+            current = nodes[active]
+            goes_left = matrix[active, self.feature[current]] <= self.threshold[current]
+            following = np.where(
+                goes_left, self.children_left[current], self.children_right[current]
+            )
+            nodes[active] = following
+            active = active[following != current]
+
+        return self.value[nodes]
+
+    def __repr__(self):
+        return (
+            f"CompiledTree({len(self.feature)} nodes, depth {self.max_depth}, "
+            f"{len(self.feature_names)} features)"
+        )
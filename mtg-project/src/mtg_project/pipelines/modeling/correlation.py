@@ -0,0 +1,82 @@
+"""Estatísticas suficientes de covariância acumuladas em streaming."""
+
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+
+def accumulate_covariance_stats(
+    chunks: Iterable[pd.DataFrame], columns: List[str]
+) -> Dict[str, Any]:
+    """
+    Acumula, em uma única passada, as estatísticas suficientes para a matriz de correlação.
+
+    Cada parte é convertida para uma matriz float32 e contribui com `X.T @ X` e com a soma das
+    colunas. Os dados são deslocados pela média da primeira parte antes dos produtos, o que
+    mantém a precisão do float32 sem alterar a covariância.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): Partes das features (linhas), em qualquer ordem.
+        columns (List[str]): Colunas numéricas a considerar, na ordem da seleção.
+
+    Returns:
+        Dict[str, Any]: `columns`, `n_rows`, `shift`, `sum` e `cross` (somas dos produtos).
+    """
+    n_columns = len(columns)
+    n_rows = 0
+    shift = None
+    col_sum = np.zeros(n_columns, dtype=np.float64)
+    cross = np.zeros((n_columns, n_columns), dtype=np.float64)
+
+    for chunk in chunks:
+        values = chunk[columns].to_numpy(dtype=np.float32)
+        if len(values) == 0:
+            continue
+        if shift is None:
+            shift = values.mean(axis=0, dtype=np.float64).astype(np.float32)
+
+        values -= shift
+        n_rows += len(values)
+        col_sum += values.sum(axis=0, dtype=np.float64)
+        cross += values.T @ values
+
+    return {
+        "columns": list(columns),
+        "n_rows": n_rows,
+        "shift": shift if shift is not None else np.zeros(n_columns, np.float32),
+        "sum": col_sum,
+        "cross": cross,
+    }
+
+
+def correlation_from_stats(stats: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Calcula a matriz de correlação de Pearson a partir das estatísticas acumuladas.
+
+    Colunas constantes resultam em correlação NaN, como no `DataFrame.corr()`.
+    """
+    n_rows = stats["n_rows"]
+    mean = stats["sum"] / n_rows
+    cov = (stats["cross"] - n_rows * np.outer(mean, mean)) / (n_rows - 1)
+
+    std = np.sqrt(np.clip(np.diag(cov), 0, None))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = cov / np.outer(std, std)
+    corr[np.outer(std, std) == 0] = np.nan
+    np.fill_diagonal(corr, np.where(std > 0, 1.0, np.nan))
+
+    return pd.DataFrame(corr, index=stats["columns"], columns=stats["columns"])
+
+
+def highly_correlated_columns(stats: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Lista, em ordem determinística, as colunas a remover por alta correlação.
+
+    Uma coluna é removida se sua correlação absoluta com qualquer coluna anterior (na ordem
+    de `stats["columns"]`) for maior que `threshold`, a mesma regra do triângulo superior.
+    """
+    corr = np.abs(correlation_from_stats(stats).to_numpy())
+    upper = np.triu(np.nan_to_num(corr, nan=0.0), k=1)
+    columns = stats["columns"]
+    return [columns[j] for j in range(len(columns)) if (upper[:, j] > threshold).any()]
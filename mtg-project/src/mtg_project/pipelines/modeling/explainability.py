@@ -0,0 +1,125 @@
+"""Cálculo de valores SHAP em lotes para modelos de árvore."""
+
+import logging
+from typing import Any, Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+
+def stratified_sample(
+    strata: pd.Series, sample_size: int, random_state: int = None
+) -> pd.Index:
+    """
+    Amostra linhas proporcionalmente a cada estrato.
+
+    Args:
+        strata (pd.Series): Estrato de cada linha (indexado como as features).
+        sample_size (int): Número aproximado de linhas na amostra.
+        random_state (int, optional): Semente da amostragem.
+
+    Returns:
+        pd.Index: Índices das linhas amostradas, na ordem original.
+    """
+    if sample_size >= len(strata):
+        return strata.index
+
+    fraction = sample_size / len(strata)
+    sampled = strata.groupby(strata, observed=True, group_keys=False).apply(
+        lambda group: group.sample(
+            n=max(1, round(len(group) * fraction)), random_state=random_state
+        )
+    )
+    return strata.index[strata.index.isin(sampled.index)]
+
+
+def _tree_shap_batch(model, background, features: pd.DataFrame) -> pd.DataFrame:
+    """Calcula os valores SHAP de um lote com o TreeExplainer (executado em um worker)."""
+    import shap
+
+    if background is None:
+        explainer = shap.TreeExplainer(model)
+    else:
+        explainer = shap.TreeExplainer(
+            model, data=background, feature_perturbation="interventional"
+        )
+
+    values = explainer.shap_values(features, check_additivity=False)
+    return pd.DataFrame(values, index=features.index, columns=features.columns)
+
+
+def tree_shap_partitions(
+    model,
+    features: pd.DataFrame,
+    predictions: np.ndarray,
+    shap_params: Dict[str, Any],
+) -> Dict[str, Callable[[], pd.DataFrame]]:
+    """
+    Prepara o cálculo dos valores SHAP com TreeSHAP em partes, para salvar com PartitionedDataset.
+
+    Cada parte é uma função que só calcula seus valores quando o Kedro for salvá-la, dividindo
+    a parte em lotes avaliados em paralelo (`n_jobs`). Assim, apenas uma parte fica em memória
+    por vez. Opcionalmente, calcula apenas sobre uma amostra estratificada pelos quantis das
+    previsões, e usa um conjunto de background (perturbação intervencional).
+
+    Args:
+        model: Modelo de árvore ajustado (ex.: DecisionTreeRegressor).
+        features (pd.DataFrame): Features a explicar.
+        predictions (np.ndarray): Previsões do modelo para `features`, usadas na estratificação.
+        shap_params (Dict[str, Any]): `chunk_size`, `batch_size`, `n_jobs`, `sample_size`,
+            `stratify_bins`, `background_size` e `random_state`.
+
+    Returns:
+        Dict[str, Callable[[], pd.DataFrame]]: Funções que calculam cada parte dos valores SHAP.
+    """
+    from joblib import Parallel, delayed
+
+    logger = logging.getLogger(__name__)
+
+    chunk_size = shap_params["chunk_size"]
+    batch_size = shap_params["batch_size"]
+    n_jobs = shap_params["n_jobs"]
+    sample_size = shap_params["sample_size"]
+    background_size = shap_params["background_size"]
+    random_state = shap_params["random_state"]
+
+    if sample_size:
+        strata = pd.Series(
+            pd.qcut(
+                predictions,
+                q=shap_params["stratify_bins"],
+                labels=False,
+                duplicates="drop",
+            ),
+            index=features.index,
+        )
+        features = features.loc[stratified_sample(strata, sample_size, random_state)]
+        logger.info(f"Amostra estratificada de {len(features)} linhas para o SHAP.")
+
+    background = None
+    if background_size:
+        background = features.sample(
+            n=min(background_size, len(features)), random_state=random_state
+        )
+        logger.info(f"Usando {len(background)} linhas como background do TreeSHAP.")
+
+    def compute_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+        batches = [
+            chunk.iloc[start : start + batch_size]
+            for start in range(0, len(chunk), batch_size)
+        ]
+        results = Parallel(n_jobs=n_jobs)(
+            delayed(_tree_shap_batch)(model, background, batch) for batch in batches
+        )
+        return pd.concat(results)
+
+    partitions = {}
+    for chunk_idx, start in enumerate(range(0, len(features), chunk_size)):
+        chunk = features.iloc[start : start + chunk_size]
+        partitions[f"chunk_{str(chunk_idx).zfill(5)}"] = (
+            lambda chunk=chunk: compute_chunk(chunk)
+        )
+
+    logger.info(f"Valores SHAP serão calculados em {len(partitions)} partes.")
+
+    return partitions
@@ -5,14 +5,19 @@ import random
 from typing import Any, Dict, List
 import numpy as np
 import pandas as pd
-import shap
 import logging
 
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
-from sklearn.model_selection import GridSearchCV
-from sklearn.tree import DecisionTreeRegressor
+from classes.running_features import (
+    RUNNING_FEATURE_COLUMNS,
+    TEMPORAL_FEATURE_COLUMNS,
+    TURN_FEATURE_COLUMNS,
+)
 
+from .compiled_tree import CompiledTree
 from .constants import derived_feats, key_cols
+from .correlation import accumulate_covariance_stats, highly_correlated_columns
+from .explainability import tree_shap_partitions
+from .tuning import search_hyperparameters
 
 
 def feature_engineering(matches_partitions: Dict[str, Any]) -> pd.DataFrame:
@@ -37,42 +42,62 @@ def feature_engineering(matches_partitions: Dict[str, Any]) -> pd.DataFrame:
     # Concatenar todos os DataFrames em um único DataFrame
     matches_df = pd.concat(dataframes, ignore_index=True)
 
-    logger.info("Criando variáveis cumulativas por jogador e partida...")
+    # Features por turno já calculadas pelo tracker na simulação (simulation.running_features),
+    # reaproveitadas apenas se todas as partições as tiverem
+    running_columns = [
+        column for column in RUNNING_FEATURE_COLUMNS if column in matches_df.columns
+    ]
+    running_features = None
+    if running_columns:
+        if (
+            len(running_columns) == len(RUNNING_FEATURE_COLUMNS)
+            and matches_df[running_columns].notna().all().all()
+        ):
+            running_features = matches_df[running_columns]
+        matches_df = matches_df.drop(columns=running_columns)
 
     # Garantir que 'spent_mana' esteja no formato correto
     matches_df["spent_mana"] = matches_df["spent_mana"].astype(int)
 
-    # Criação de variáveis cumulativas por 'player_name' e 'match_id'
-    matches_df['cum_mana_pool'] = matches_df.groupby(['player_name', 'match_id'])[
-        'mana_pool'
-    ].cumsum()
-    matches_df["cum_spent_mana"] = matches_df.groupby(['player_name', 'match_id'])[
-        "spent_mana"
-    ].cumsum()
-
-    logger.info("Criando variáveis de razão...")
-
-    # Criação de variáveis baseadas em razões: feitiços por turno e terrenos por turno
-    matches_df['spell_ratio'] = (
-        matches_df['spells_played'] / (matches_df['turn'] + 1)
-    ).round(2)
-    matches_df['land_ratio'] = (
-        matches_df['lands_played'] / (matches_df['turn'] + 1)
-    ).round(2)
-
-    logger.info("Criando variável de eficiência da curva de mana...")
-
-    # Criação da variável de eficiência da curva de mana (razão entre mana gasto e mana acumulado)
-    matches_df['mana_curve_efficiency'] = (
-        matches_df['cum_spent_mana'] / matches_df['cum_mana_pool']
-    )
+    if running_features is not None:
+        logger.info("Usando as features por turno calculadas durante a simulação...")
+        for column in TURN_FEATURE_COLUMNS:
+            matches_df[column] = running_features[column]
+    else:
+        logger.info("Criando variáveis cumulativas por jogador e partida...")
+
+        # Criação de variáveis cumulativas por 'player_name' e 'match_id'
+        matches_df['cum_mana_pool'] = matches_df.groupby(['player_name', 'match_id'])[
+            'mana_pool'
+        ].cumsum()
+        matches_df["cum_spent_mana"] = matches_df.groupby(['player_name', 'match_id'])[
+            "spent_mana"
+        ].cumsum()
+
+        logger.info("Criando variáveis de razão...")
+
+        # Criação de variáveis baseadas em razões: feitiços por turno e terrenos por turno
+        matches_df['spell_ratio'] = (
+            matches_df['spells_played'] / (matches_df['turn'] + 1)
+        ).round(2)
+        matches_df['land_ratio'] = (
+            matches_df['lands_played'] / (matches_df['turn'] + 1)
+        ).round(2)
+
+        logger.info("Criando variável de eficiência da curva de mana...")
+
+        # Criação da variável de eficiência da curva de mana (razão entre mana gasto e mana acumulado)
+        matches_df['mana_curve_efficiency'] = (
+            matches_df['cum_spent_mana'] / matches_df['cum_mana_pool']
+        )
 
-    # Tratamento de valores infinitos e valores ausentes
-    matches_df['mana_curve_efficiency'].replace(
-        [float('inf'), -float('inf')], 0, inplace=True
-    )
-    matches_df['mana_curve_efficiency'].fillna(0, inplace=True)
-    matches_df['mana_curve_efficiency'] = matches_df['mana_curve_efficiency'].round(2)
+        # Tratamento de valores infinitos e valores ausentes
+        matches_df['mana_curve_efficiency'].replace(
+            [float('inf'), -float('inf')], 0, inplace=True
+        )
+        matches_df['mana_curve_efficiency'] = (
+            matches_df['mana_curve_efficiency'].fillna(0).round(2)
+        )
 
     # Codificação One-Hot para as cores de mana
     all_colors = ['W', 'U', 'B', 'R', 'G']
@@ -96,11 +121,18 @@ def feature_engineering(matches_partitions: Dict[str, Any]) -> pd.DataFrame:
     # Criar uma coluna com a quantidade de cores total do deck
     matches_df['n_colors'] = matches_df[all_colors].sum(axis=1)
 
-    logger.info("Criando lag features...")
-
     # Ordenar o DataFrame para garantir que os shifts e rollings funcionem corretamente
     matches_df.sort_values(by=['player_name', 'match_id', 'turn'], inplace=True)
 
+    if running_features is not None:
+        for column in TEMPORAL_FEATURE_COLUMNS:
+            matches_df[column] = running_features[column]
+        matches_df.fillna(0, inplace=True)
+        logger.info("Engenharia de features concluída.")
+        return matches_df
+
+    logger.info("Criando lag features...")
+
     # Lag Features: Captura os valores dos turnos anteriores
     matches_df['mana_curve_efficiency_lag_1'] = matches_df.groupby(
         ['player_name', 'match_id']
@@ -155,23 +187,88 @@ def feature_engineering(matches_partitions: Dict[str, Any]) -> pd.DataFrame:
     return matches_df
 
 
+def _candidate_feature_columns(
+    features_df: pd.DataFrame,
+    target: str,
+    derived_features: list,
+    key_columns: list,
+) -> List[str]:
+    """
+    Lista as colunas numéricas candidatas a features, sem as derivadas do target,
+    as colunas-chave e o próprio target, na ordem em que aparecem no DataFrame.
+    """
+    numeric_columns = features_df.select_dtypes(include=[np.number]).columns
+    excluded = set(derived_features or []) | set(key_columns or []) | {target}
+    return [column for column in numeric_columns if column not in excluded]
+
+
+def compute_feature_corr_stats(
+    features_df: pd.DataFrame,
+    chunk_size: int,
+    target: str = "mana_curve_efficiency",
+    derived_features: list = derived_feats,
+    key_columns: list = key_cols,
+) -> dict:
+    """
+    Acumula as estatísticas suficientes de covariância das features candidatas em uma passada.
+
+    As linhas são processadas em partes de `chunk_size` com produtos matriciais em float32.
+    As estatísticas são persistidas, de forma que alterar o limiar de correlação na seleção
+    de features não exige uma nova passada sobre os dados.
+
+    Args:
+        features_df (pd.DataFrame): DataFrame contendo as features.
+        chunk_size (int): Número de linhas por parte.
+        target (str): Nome da variável alvo.
+        derived_features (list, optional): Features derivadas do target, fora do cálculo.
+        key_columns (list, optional): Colunas-chave, fora do cálculo.
+
+    Returns:
+        dict: Estatísticas acumuladas (ver `correlation.accumulate_covariance_stats`).
+    """
+    # Configura o logger geral
+    logger = logging.getLogger(__name__)
+
+    columns = _candidate_feature_columns(
+        features_df, target, derived_features, key_columns
+    )
+    logger.info(
+        f"Acumulando estatísticas de covariância de {len(columns)} features em partes de {chunk_size} linhas..."
+    )
+
+    chunks = (
+        features_df.iloc[start : start + chunk_size]
+        for start in range(0, len(features_df), chunk_size)
+    )
+    feature_corr_stats = accumulate_covariance_stats(chunks, columns)
+
+    logger.info(f"Estatísticas acumuladas sobre {feature_corr_stats['n_rows']} linhas.")
+
+    return feature_corr_stats
+
+
 def feature_selection(
     features_df: pd.DataFrame,
+    feature_corr_stats: dict,
     threshold_features: float,
     target: str = "mana_curve_efficiency",
-    derived_features: list = derived_feats,
     key_columns: list = key_cols,
 ) -> pd.DataFrame:
     """
     Auxilia na seleção de features, removendo aquelas derivadas do target,
     colunas-chave, e features altamente correlacionadas entre si.
 
+    A correlação é obtida das estatísticas acumuladas por `compute_feature_corr_stats`, que
+    já excluem as features derivadas do target, as colunas-chave e o target. As features são
+    removidas em ordem determinística: uma coluna sai se for correlacionada acima do limiar
+    com qualquer coluna anterior.
+
     Args:
         features_df (pd.DataFrame): DataFrame contendo as features.
-        target (str): Nome da variável alvo.
+        feature_corr_stats (dict): Estatísticas suficientes de covariância das features.
         threshold_features (float): Limiar para remover features com alta correlação.
-        derived_features (list, optional): Lista de features derivadas do target para serem removidas.
-        key_columns (list, optional): Lista de colunas-chave para serem removidas (ex: 'match', 'turn').
+        target (str): Nome da variável alvo.
+        key_columns (list, optional): Lista de colunas-chave reinseridas no resultado (ex: 'match', 'turn').
 
     Returns:
         pd.DataFrame: DataFrame com as features selecionadas.
@@ -180,54 +277,31 @@ def feature_selection(
     logger = logging.getLogger(__name__)
     logger.info("Iniciando o processo de seleção de features...")
 
-    # Separar apenas colunas numéricas para o cálculo da correlação
-    numeric_features_df = features_df.select_dtypes(include=[np.number])
-
-    logger.info(f"Número inicial de features numéricas: {numeric_features_df.shape[1]}")
-
-    # Remover features derivadas do target, se fornecidas
-    if derived_features:
-        numeric_features_df = numeric_features_df.drop(
-            columns=derived_features, errors='ignore'
-        )
-        logger.info(f"Features derivadas do target removidas: {derived_features}")
-
-    # Remover colunas-chave nao categoricas ou string
-    if key_columns:
-        numeric_features_df = numeric_features_df.drop(
-            columns=key_columns, errors='ignore'
-        )
-        logger.info(f"Colunas-chave removidas: {key_columns}")
+    candidate_columns = feature_corr_stats["columns"]
+    logger.info(f"Número de features candidatas: {len(candidate_columns)}")
 
-    # Remover a variável alvo do conjunto de features
-    features_without_target = numeric_features_df.drop(
-        columns=[target], errors='ignore'
+    # Identificar colunas com alta correlação entre si, usando o limiar definido
+    to_drop_features = set(
+        highly_correlated_columns(feature_corr_stats, threshold_features)
     )
 
-    # Calcular a matriz de correlação entre as features (excluindo o target)
-    corr_matrix = features_without_target.corr().abs()
-
-    # Criar uma máscara para identificar as correlações acima do limiar entre as features, excluindo a diagonal
-    upper = corr_matrix.where(np.triu(np.ones(corr_matrix.shape), k=1).astype(bool))
-
-    # Identificar colunas com alta correlação entre si, usando o limiar definido
-    to_drop_features = [
-        column for column in upper.columns if any(upper[column] > threshold_features)
+    # Selecionar as colunas finais de features
+    selected_features_cols = [
+        column for column in candidate_columns if column not in to_drop_features
     ]
 
-    # Remover as colunas altamente correlacionadas entre si
-    features_cleaned = features_without_target.drop(columns=to_drop_features)
-
     logger.info(
-        f"Número de features após a remoção de correlação maior que {threshold_features}: {features_cleaned.shape[1]}"
+        f"Número de features após a remoção de correlação maior que {threshold_features}: {len(selected_features_cols)}"
     )
 
-    # Selecionar as colunas finais de features
-    selected_features_cols = features_cleaned.columns.tolist()
-
     # Reconstruir o DataFrame final, reinserindo key_columns e target
     features_cleaned = pd.concat(
-        [features_cleaned, features_df[key_columns], features_df[[target]]], axis=1
+        [
+            features_df[selected_features_cols],
+            features_df[key_columns],
+            features_df[[target]],
+        ],
+        axis=1,
     )
 
     logger.info("Processo de seleção de features concluído.")
@@ -335,21 +409,30 @@ def train_test_split(
 def fit_model(
     train_features: pd.DataFrame,
     train_target: pd.DataFrame,
-    param_grid: tuple,
-) -> str:
+    param_grid: dict,
+    search_params: dict,
+) -> tuple:
     """
-    Ajusta um modelo de árvore de decisão com suporte a features temporais e realiza tuning de hiperparâmetros com GridSearchCV.
-    O modelo ajustado é salvo em um arquivo .pkl.
+    Ajusta um modelo de árvore de decisão com suporte a features temporais e realiza tuning de hiperparâmetros.
+
+    O tuning avalia os folds em paralelo (`n_jobs`) e pode usar busca em grade, aleatória ou
+    successive halving (`strategy`). Os scores de cada fold ficam em cache no disco (`cache_dir`),
+    indexados pelo hash dos dados e pelos hiperparâmetros, então reexecuções e extensões da grade
+    avaliam apenas os candidatos novos.
 
     Args:
         train_features (pd.DataFrame): DataFrame com as features de treino.
         train_target (pd.DataFrame): DataFrame com a variável target de treino.
         param_grid (dict): Dicionário com os hiperparâmetros a serem ajustados.
-        model_path (str): Caminho para salvar o modelo ajustado (.pkl).
+        search_params (dict): Parâmetros da busca (ver `params:modeling.model_selection.search`).
 
     Returns:
-        model_path (str): Caminho do arquivo do modelo ajustado salvo.
+        Tuple: Melhor modelo ajustado nos dados de treino completos e seus hiperparâmetros.
     """
+    # O sklearn é importado apenas nos nós que o usam (reduz o tempo de início do Kedro)
+    from sklearn.base import clone
+    from sklearn.tree import DecisionTreeRegressor
+
     # Configurando o logger geral
     logger = logging.getLogger(__name__)
     logger.info("Iniciando o ajuste do modelo e o tuning de hiperparâmetros.")
@@ -357,24 +440,25 @@ def fit_model(
     # Criando o modelo base
     model = DecisionTreeRegressor(random_state=42)
 
-    logger.info("Configurando o GridSearchCV com a seguinte grade de hiperparâmetros:")
+    logger.info(
+        f"Configurando a busca '{search_params['strategy']}' com a seguinte grade de hiperparâmetros:"
+    )
     logger.info(param_grid)
 
-    # Configurando o GridSearchCV para tuning de hiperparâmetros
-    grid_search = GridSearchCV(
-        estimator=model,
-        param_grid=param_grid,
+    # Avaliando os candidatos (em paralelo e com cache de folds)
+    best_hiper_params, search_results = search_hyperparameters(
+        model,
+        train_features,
+        train_target,
+        param_grid,
+        search_params,
         scoring='neg_mean_squared_error',
-        cv=5,
-        verbose=1,
     )
+    logger.info(f"{len(search_results)} avaliações de candidatos concluídas.")
 
-    # Ajustando o modelo com os dados de treino e realizando tuning
-    grid_search.fit(train_features, train_target)
-
-    # Extraindo o melhor modelo e seus parâmetros
-    best_model = grid_search.best_estimator_
-    best_hiper_params = grid_search.best_params_
+    # Reajustando o melhor modelo nos dados de treino completos
+    best_model = clone(model).set_params(**best_hiper_params)
+    best_model.fit(train_features, train_target)
 
     logger.info("O melhor modelo foi encontrado com os seguintes hiperparâmetros:")
     logger.info(best_hiper_params)
@@ -382,22 +466,54 @@ def fit_model(
     return best_model, best_hiper_params
 
 
+def compile_model(model: pickle) -> CompiledTree:
+    """
+    Exporta a árvore ajustada para um preditor compilado em arrays NumPy contíguos
+    (feature, limiar, filhos e valores), salvo ao lado do `best_model.pkl`.
+
+    Args:
+        model (pickle): DecisionTreeRegressor ajustado.
+
+    Returns:
+        CompiledTree: Preditor vetorizado com previsões idênticas às do modelo.
+    """
+    # Configura o logger geral
+    logger = logging.getLogger(__name__)
+
+    compiled_model = CompiledTree.from_sklearn(model)
+    logger.info(f"Modelo compilado: {compiled_model}")
+
+    return compiled_model
+
+
 def predict_and_evaluate_model(
-    model: pickle, test_features: pd.DataFrame, test_target: pd.Series
+    model: pickle,
+    compiled_model: CompiledTree,
+    test_features: pd.DataFrame,
+    test_target: pd.Series,
+    shap_params: dict,
 ) -> tuple:
     """
     Carrega o modelo salvo, faz previsões nos dados de teste, avalia o modelo e calcula valores SHAP.
 
+    Os valores SHAP usam o TreeSHAP dedicado ao DecisionTreeRegressor, calculado em lotes paralelos
+    e salvo em partes (ver `explainability.tree_shap_partitions`), opcionalmente sobre uma amostra
+    estratificada das features de teste.
+
     Args:
         model (pickle): Arquivo do modelo ajustado.
+        compiled_model (CompiledTree): Preditor compilado do modelo, usado nas previsões.
         test_features (pd.DataFrame): DataFrame com as features de teste.
         test_labels (pd.Series): Rótulos reais para avaliação do modelo.
+        shap_params (dict): Parâmetros do cálculo SHAP (ver `params:modeling.shap`).
 
     Returns:
         y_pred (pd.Series): Previsões do modelo.
-        shap_values (pd.DataFrame): Valores SHAP para interpretação do modelo.
+        shap_values (Dict[str, Callable]): Partes dos valores SHAP, calculadas ao serem salvas.
         error_metrics (dict): Métricas de erro do modelo (MSE, MAE, R2).
     """
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
     # Configura o logger geral
     logger = logging.getLogger(__name__)
 
@@ -408,8 +524,8 @@ def predict_and_evaluate_model(
     test_features = test_features
     test_target = test_target
 
-    # Fazendo previsões
-    predicted_target = model.predict(test_features)
+    # Fazendo previsões com o preditor compilado (sem validação de colunas do pandas)
+    predicted_target = compiled_model.predict(test_features)
 
     # Calculando as métricas de erro
     logger.info("Calculando as métricas de erro...")
@@ -423,10 +539,11 @@ def predict_and_evaluate_model(
         "r2_score": r2,
     }
 
-    # Calculando os valores SHAP
-    logger.info("Calculando os valores SHAP...")
-    explainer = shap.Explainer(model)
-    shap_values = explainer(test_features)
+    # Preparando o cálculo dos valores SHAP (executado parte a parte ao salvar)
+    logger.info("Preparando o cálculo dos valores SHAP com TreeSHAP...")
+    shap_values = tree_shap_partitions(
+        model, test_features, predicted_target, shap_params
+    )
 
     logger.info("Previsões e avaliação completadas.")
 
@@ -434,7 +551,6 @@ def predict_and_evaluate_model(
     predicted_target = pd.DataFrame(predicted_target)
     predicted_target.rename(columns={0: "predicted_target"}, inplace=True)
 
-    shap_values = pd.DataFrame(shap_values.values)
     error_metrics = pd.DataFrame([error_metrics])
 
     return predicted_target, shap_values, error_metrics
@@ -1,6 +1,8 @@
 from kedro.pipeline import Pipeline, node
 
 from .nodes import (
+    compile_model,
+    compute_feature_corr_stats,
     feature_engineering,
     feature_selection,
     fit_model,
@@ -18,10 +20,20 @@ def create_modeling_pipeline(**kwargs) -> Pipeline:
                 outputs="features_df",
                 name="feature_engineering_node",
             ),
+            node(
+                func=compute_feature_corr_stats,
+                inputs=[
+                    "features_df",
+                    "params:modeling.feature_engineering.corr_chunk_size",
+                ],
+                outputs="feature_corr_stats",
+                name="compute_feature_corr_stats_node",
+            ),
             node(
                 func=feature_selection,
                 inputs=[
                     "features_df",
+                    "feature_corr_stats",
                     "params:modeling.feature_engineering.feat_corr_threshold",
                 ],
                 outputs=["selected_features_df", "selected_features_cols"],
@@ -52,13 +64,26 @@ def create_modeling_pipeline(**kwargs) -> Pipeline:
                     "train_features",
                     "train_target",
                     "params:modeling.model_selection.params_grid",
+                    "params:modeling.model_selection.search",
                 ],
                 outputs=["best_model", "best_hiper_params"],
                 name="fit_decision_tree_model_node",
             ),
+            node(
+                func=compile_model,
+                inputs="best_model",
+                outputs="compiled_model",
+                name="compile_model_node",
+            ),
             node(
                 func=predict_and_evaluate_model,
-                inputs=["best_model", "test_features", "test_target"],
+                inputs=[
+                    "best_model",
+                    "compiled_model",
+                    "test_features",
+                    "test_target",
+                    "params:modeling.shap",
+                ],
                 outputs=["predicted_target", "shap_values", "error_metrics"],
                 name="predict_and_evaluate_model_node",
             ),
@@ -0,0 +1,321 @@
+"""Busca de hiperparâmetros paralela e com cache de folds em disco."""
+
+import hashlib
+import json
+import logging
+import math
+import os
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+SEARCH_STRATEGIES = ("grid", "random", "halving")
+
+
+def hash_training_data(features: pd.DataFrame, target: pd.DataFrame) -> str:
+    """
+    Gera um hash estável dos dados de treino (valores, índices e nomes de colunas).
+
+    Args:
+        features (pd.DataFrame): DataFrame com as features de treino.
+        target (pd.DataFrame): DataFrame com a variável target de treino.
+
+    Returns:
+        str: Hash hexadecimal que identifica os dados usados no tuning.
+    """
+    digest = hashlib.sha1()
+    for df in (features, target):
+        digest.update(json.dumps(list(map(str, df.columns))).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _candidate_key(params: Dict[str, Any]) -> str:
+    """Serializa um candidato de hiperparâmetros de forma determinística."""
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+class FoldScoreCache:
+    """
+    Cache em disco dos scores de cada (candidato, fold), um arquivo JSON por hash de dados.
+
+    A chave de cada score combina o candidato, o fold, o número de folds, o estimador
+    base e a métrica, de forma que estender a grade reaproveita tudo o que já foi avaliado.
+    Folds que falharam (score NaN) não são guardados e voltam a ser avaliados na próxima busca.
+    """
+
+    def __init__(self, cache_dir: str, data_hash: str, context: Dict[str, Any]):
+        self.path = None
+        self.scores = {}
+        self.context_key = _candidate_key(context)
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self.path = os.path.join(cache_dir, f"{data_hash}.json")
+            if os.path.exists(self.path):
+                with open(self.path, "r", encoding="utf-8") as file:
+                    self.scores = json.load(file)
+
+    def key(self, params: Dict[str, Any], fold: int) -> str:
+        return f"{self.context_key}|{_candidate_key(params)}|{fold}"
+
+    def get(self, params: Dict[str, Any], fold: int):
+        score = self.scores.get(self.key(params, fold))
+        # Caches antigos podem ter NaN de um fold que falhou: trata como não avaliado
+        if score is None or math.isnan(score):
+            return None
+        return score
+
+    def update(self, new_scores: Dict[str, float]) -> None:
+        # A falha pode ser transitória (ex.: memória), então o NaN não é persistido
+        self.scores.update(
+            {key: score for key, score in new_scores.items() if not math.isnan(score)}
+        )
+        if self.path is None:
+            return
+
+        # Escrita atômica para não corromper o cache se o processo for interrompido
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(self.scores, file)
+        os.replace(tmp_path, self.path)
+
+
+def _fit_and_score(estimator, features, target, train_idx, test_idx, params, scoring):
+    """Ajusta um clone do estimador em um fold e retorna o score no fold de validação."""
+    from sklearn.base import clone
+    from sklearn.metrics import get_scorer
+
+    model = clone(estimator).set_params(**params)
+    try:
+        model.fit(features.iloc[train_idx], target.iloc[train_idx])
+        return float(
+            get_scorer(scoring)(model, features.iloc[test_idx], target.iloc[test_idx])
+        )
+    except Exception:
+        # Mesmo comportamento do GridSearchCV com error_score=np.nan
+        return float("nan")
+
+
+def evaluate_candidates(
+    estimator,
+    features: pd.DataFrame,
+    target: pd.DataFrame,
+    candidates: List[Dict[str, Any]],
+    cv: int,
+    scoring: str,
+    n_jobs: int,
+    cache_dir: str = None,
+) -> pd.DataFrame:
+    """
+    Avalia cada candidato com validação cruzada, em paralelo e reaproveitando o cache de folds.
+
+    Args:
+        estimator: Estimador base do scikit-learn.
+        features (pd.DataFrame): Features de treino.
+        target (pd.DataFrame): Target de treino.
+        candidates (List[Dict[str, Any]]): Candidatos de hiperparâmetros.
+        cv (int): Número de folds (KFold sem embaralhamento, como no GridSearchCV).
+        scoring (str): Métrica do scikit-learn (maior é melhor).
+        n_jobs (int): Número de processos para avaliar os folds.
+        cache_dir (str, optional): Pasta do cache em disco. Se None, não usa cache.
+
+    Returns:
+        pd.DataFrame: Uma linha por candidato com `params`, `mean_score` e `std_score`.
+    """
+    from joblib import Parallel, delayed
+    from sklearn.model_selection import KFold
+
+    logger = logging.getLogger(__name__)
+
+    context = {
+        "estimator": type(estimator).__name__,
+        "base_params": estimator.get_params(),
+        "cv": cv,
+        "scoring": scoring,
+    }
+    cache = FoldScoreCache(cache_dir, hash_training_data(features, target), context)
+    folds = list(KFold(n_splits=cv).split(features))
+
+    pending = [
+        (params, fold)
+        for params in candidates
+        for fold in range(cv)
+        if cache.get(params, fold) is None
+    ]
+    logger.info(
+        f"{len(candidates) * cv - len(pending)} folds recuperados do cache, "
+        f"{len(pending)} folds a avaliar com n_jobs={n_jobs}."
+    )
+
+    new_scores = {}
+    if pending:
+        scores = Parallel(n_jobs=n_jobs)(
+            delayed(_fit_and_score)(
+                estimator, features, target, *folds[fold], params, scoring
+            )
+            for params, fold in pending
+        )
+        new_scores = {
+            cache.key(params, fold): score
+            for (params, fold), score in zip(pending, scores)
+        }
+        cache.update(new_scores)
+
+    rows = []
+    for params in candidates:
+        # Os folds avaliados agora incluem os que falharam (NaN), que não ficam no cache
+        fold_scores = np.array(
+            [
+                new_scores.get(cache.key(params, fold), cache.get(params, fold))
+                for fold in range(cv)
+            ]
+        )
+        rows.append(
+            {
+                "params": params,
+                "mean_score": fold_scores.mean(),
+                "std_score": fold_scores.std(),
+            }
+        )
+
+    return pd.DataFrame(rows)
+
+
+def _best_candidate(results: pd.DataFrame) -> Dict[str, Any]:
+    """Retorna o candidato de maior score médio, ignorando os que falharam."""
+    valid_results = results.dropna(subset=["mean_score"])
+    if valid_results.empty:
+        raise ValueError("Nenhum candidato de hiperparâmetros pode ser avaliado.")
+    return valid_results.loc[valid_results["mean_score"].idxmax(), "params"]
+
+
+def successive_halving(
+    estimator,
+    features: pd.DataFrame,
+    target: pd.DataFrame,
+    candidates: List[Dict[str, Any]],
+    cv: int,
+    scoring: str,
+    n_jobs: int,
+    factor: int,
+    min_resources: int,
+    random_state: int,
+    cache_dir: str = None,
+) -> Tuple[Dict[str, Any], pd.DataFrame]:
+    """
+    Successive halving: avalia todos os candidatos em uma amostra pequena dos dados e
+    mantém apenas o melhor 1/`factor` a cada rodada, multiplicando a amostra por `factor`.
+
+    As amostras são prefixos de uma permutação fixa (semente `random_state`), de modo que
+    cada rodada tem seu próprio hash de dados e também é reaproveitada pelo cache.
+
+    Returns:
+        Tuple[Dict[str, Any], pd.DataFrame]: Melhor candidato e resultados de todas as rodadas.
+    """
+    logger = logging.getLogger(__name__)
+
+    n_samples = len(features)
+    order = np.random.RandomState(random_state).permutation(n_samples)
+    n_resources = max(min(min_resources, n_samples), cv)
+    n_rounds = 1 + max(0, math.ceil(math.log(len(candidates), factor)))
+
+    all_results = []
+    remaining = list(candidates)
+    for round_idx in range(n_rounds):
+        rows = np.sort(order[:n_resources])
+        logger.info(
+            f"Rodada {round_idx + 1}/{n_rounds} do successive halving: "
+            f"{len(remaining)} candidatos com {len(rows)} amostras."
+        )
+        results = evaluate_candidates(
+            estimator,
+            features.iloc[rows],
+            target.iloc[rows],
+            remaining,
+            cv,
+            scoring,
+            n_jobs,
+            cache_dir,
+        )
+        results["round"] = round_idx
+        results["n_resources"] = len(rows)
+        all_results.append(results)
+
+        if len(remaining) == 1 or n_resources >= n_samples:
+            break
+
+        n_keep = max(1, len(remaining) // factor)
+        ranked = results.sort_values("mean_score", ascending=False, na_position="last")
+        remaining = ranked["params"].head(n_keep).tolist()
+        n_resources = min(n_resources * factor, n_samples)
+
+    all_results = pd.concat(all_results, ignore_index=True)
+    return _best_candidate(all_results[all_results["round"] == round_idx]), all_results
+
+
+def search_hyperparameters(
+    estimator,
+    features: pd.DataFrame,
+    target: pd.DataFrame,
+    param_grid: Dict[str, list],
+    search_params: Dict[str, Any],
+    scoring: str = "neg_mean_squared_error",
+) -> Tuple[Dict[str, Any], pd.DataFrame]:
+    """
+    Executa a busca de hiperparâmetros com a estratégia configurada.
+
+    Args:
+        estimator: Estimador base do scikit-learn.
+        features (pd.DataFrame): Features de treino.
+        target (pd.DataFrame): Target de treino.
+        param_grid (Dict[str, list]): Grade de hiperparâmetros.
+        search_params (Dict[str, Any]): Parâmetros da busca (`strategy`, `n_jobs`, `cv`,
+            `n_iter`, `halving_factor`, `min_resources`, `random_state`, `cache_dir`).
+        scoring (str): Métrica do scikit-learn usada para ranquear os candidatos.
+
+    Returns:
+        Tuple[Dict[str, Any], pd.DataFrame]: Melhores hiperparâmetros e resultados da busca.
+    """
+    from sklearn.model_selection import ParameterGrid, ParameterSampler
+
+    strategy = search_params["strategy"]
+    if strategy not in SEARCH_STRATEGIES:
+        raise ValueError(
+            f"Estratégia de busca '{strategy}' não é válida. Escolha entre: {', '.join(SEARCH_STRATEGIES)}"
+        )
+
+    cv = search_params["cv"]
+    n_jobs = search_params["n_jobs"]
+    random_state = search_params["random_state"]
+    cache_dir = search_params["cache_dir"]
+
+    if strategy == "random":
+        candidates = list(
+            ParameterSampler(
+                param_grid, n_iter=search_params["n_iter"], random_state=random_state
+            )
+        )
+    else:
+        candidates = list(ParameterGrid(param_grid))
+
+    if strategy == "halving":
+        return successive_halving(
+            estimator,
+            features,
+            target,
+            candidates,
+            cv,
+            scoring,
+            n_jobs,
+            factor=search_params["halving_factor"],
+            min_resources=search_params["min_resources"],
+            random_state=random_state,
+            cache_dir=cache_dir,
+        )
+
+    results = evaluate_candidates(
+        estimator, features, target, candidates, cv, scoring, n_jobs, cache_dir
+    )
+    return _best_candidate(results), results
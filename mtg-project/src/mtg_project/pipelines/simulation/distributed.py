@@ -0,0 +1,776 @@
+"""Simulação distribuída: coordenador e workers ligados por uma fila de shards em SQLite.
+
+O coordenador divide as partidas em shards (os mesmos do `simulate_player_matches`, ver
+`plan_shards`), grava o deck de cada jogador em `<work_dir>/decks/` e enfileira um descritor por
+shard (referência do deck, semente, faixa de partidas e parâmetros da simulação) na fila
+`<work_dir>/queue.sqlite`. Os workers, em qualquer máquina que enxergue o `work_dir` e a saída,
+arrendam shards, gravam as partições em `<output>/<jogador>/match_<n>.parquet` e renovam o
+arrendamento (heartbeat) enquanto simulam. Shards de workers mortos voltam à fila quando o
+arrendamento expira; shards lentos (stragglers) podem ganhar uma cópia de reserva em um worker
+ocioso, e vale a primeira das duas a terminar.
+
+Os workers locais iniciados pelo coordenador não carregam os decks dos arquivos: o coordenador
+compila os decks uma vez em um `SharedDeckPool` (memória compartilhada) e os workers se ligam a
+ele pelo nome, então a memória e o tempo de início de cada worker não crescem com o número de
+decks.
+
+Ao fim, o coordenador grava o manifesto de shards do `CheckpointedPartitionedDataset`, então a
+saída pode ser usada como o `matches_df` do Kedro (e uma simulação do Kedro na mesma pasta
+reaproveita os shards já concluídos).
+
+Uso:
+    python -m mtg_project.pipelines.simulation.distributed coordinator \\
+        --players data/02_intermediate/players_with_decks/2024-09-25 \\
+        --output data/03_primary/matches_df/2024-09-25 --workers 4
+    python -m mtg_project.pipelines.simulation.distributed coordinator --synthetic 50 \\
+        --output /tmp/matches --workers 4
+    python -m mtg_project.pipelines.simulation.distributed worker --work-dir /shared/simulation_queue \\
+        --output /shared/matches
+"""
+
+import argparse
+import json
+import logging
+import os
+import pickle
+import socket
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import fsspec
+
+from classes.compiled_deck import SharedDeckPool
+from classes.player import Player
+
+from mtg_project.datasets import CheckpointedPartitionedDataset, write_json_atomically
+
+from .nodes import (
+    deck_fingerprint,
+    deck_signatures,
+    derive_seed,
+    match_partition_key,
+    play_match,
+    plan_shards,
+)
+from .profiling import merge_profiles, profile_run_folder, profile_simulation
+
+logger = logging.getLogger(__name__)
+
+# Módulo executado pelos workers locais (com `python -m`, `__name__` seria "__main__")
+MODULE = "mtg_project.pipelines.simulation.distributed"
+QUEUE_NAME = "queue.sqlite"
+DECKS_FOLDER = "decks"
+
+# Estados de um shard na fila
+PENDING, LEASED, DONE, FAILED = "pending", "leased", "done", "failed"
+
+
+class ShardQueue:
+    """
+    Fila de shards em SQLite, com arrendamento (lease) e heartbeat.
+
+    Um shard arrendado volta a ser arrendável quando o seu arrendamento expira (worker morto ou
+    sem heartbeat). Se `straggler_seconds` for definido, um shard arrendado há mais tempo que
+    isso, sem reserva e com menos de `max_attempts` tentativas, pode ser arrendado como reserva
+    (backup task) por um worker ocioso quando não há shards pendentes: o arrendamento do worker
+    original continua válido, os dois simulam o shard e o primeiro `complete` vence (o outro
+    perde o heartbeat e abandona o shard). Como as partidas são semeadas, as duas cópias gravam
+    as mesmas partições.
+
+    Args:
+        db_path (str): Arquivo SQLite da fila (local ou em um sistema de arquivos compartilhado).
+        lease_seconds (float): Duração de um arrendamento sem heartbeat.
+        straggler_seconds (float, optional): Tempo a partir do qual um shard arrendado pode
+            ganhar uma cópia de reserva em um worker ocioso. None desativa.
+        max_attempts (int): Tentativas de um shard antes de marcá-lo como falho.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        lease_seconds: float = 60.0,
+        straggler_seconds: Optional[float] = None,
+        max_attempts: int = 3,
+    ):
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.straggler_seconds = straggler_seconds
+        self.max_attempts = max_attempts
+
+        with self._connect() as connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS shards (
+                    shard_id TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    worker TEXT,
+                    backup_worker TEXT,
+                    leased_at REAL,
+                    lease_expires REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    completed_at REAL
+                )
+                """)
+            # Filas criadas antes das cópias de reserva
+            columns = [
+                row[1] for row in connection.execute("PRAGMA table_info(shards)")
+            ]
+            if "backup_worker" not in columns:
+                connection.execute("ALTER TABLE shards ADD COLUMN backup_worker TEXT")
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit; as transações de arrendamento usam BEGIN IMMEDIATE explicitamente
+        return sqlite3.connect(self.db_path, timeout=60, isolation_level=None)
+
+    def enqueue(self, shards: List[Dict[str, Any]]) -> int:
+        """
+        Enfileira shards ainda não conhecidos pela fila e retorna quantos entraram.
+
+        Um shard já conhecido com outro descritor (ex.: outra semente ou outro deck) volta a
+        ficar pendente com o novo descritor, para não reaproveitar partidas de outro plano.
+        """
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            before = connection.total_changes
+            connection.executemany(
+                """
+                INSERT INTO shards (shard_id, payload, status) VALUES (?, ?, ?)
+                ON CONFLICT (shard_id) DO UPDATE SET
+                    payload = excluded.payload,
+                    status = excluded.status,
+                    worker = NULL,
+                    backup_worker = NULL,
+                    leased_at = NULL,
+                    lease_expires = NULL,
+                    attempts = 0,
+                    error = NULL,
+                    completed_at = NULL
+                WHERE shards.payload != excluded.payload
+                """,
+                [(shard["shard_id"], json.dumps(shard), PENDING) for shard in shards],
+            )
+            n_enqueued = connection.total_changes - before
+            connection.execute("COMMIT")
+        return n_enqueued
+
+    def lease(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Arrenda o próximo shard disponível: pendente, com arrendamento expirado ou, não havendo
+        nenhum desses, um straggler como reserva. Retorna o descritor do shard ou None.
+        """
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute(
+                """
+                SELECT shard_id, payload FROM shards
+                WHERE status = ? OR (status = ? AND lease_expires < ?)
+                ORDER BY status DESC, shard_id LIMIT 1
+                """,
+                (PENDING, LEASED, now),
+            ).fetchone()
+            if row is not None:
+                connection.execute(
+                    """
+                    UPDATE shards SET status = ?, worker = ?, backup_worker = NULL,
+                        leased_at = ?, lease_expires = ?, attempts = attempts + 1
+                    WHERE shard_id = ?
+                    """,
+                    (LEASED, worker_id, now, now + self.lease_seconds, row[0]),
+                )
+            elif self.straggler_seconds is not None:
+                # Reserva: o worker original mantém o arrendamento
+                row = connection.execute(
+                    """
+                    SELECT shard_id, payload FROM shards
+                    WHERE status = ? AND leased_at < ? AND worker != ?
+                        AND backup_worker IS NULL AND attempts < ?
+                    ORDER BY leased_at LIMIT 1
+                    """,
+                    (
+                        LEASED,
+                        now - self.straggler_seconds,
+                        worker_id,
+                        self.max_attempts,
+                    ),
+                ).fetchone()
+                if row is not None:
+                    connection.execute(
+                        """
+                        UPDATE shards SET backup_worker = ?, attempts = attempts + 1
+                        WHERE shard_id = ?
+                        """,
+                        (worker_id, row[0]),
+                    )
+            connection.execute("COMMIT")
+        return json.loads(row[1]) if row is not None else None
+
+    def heartbeat(self, shard_id: str, worker_id: str) -> bool:
+        """
+        Renova o arrendamento; retorna False se o shard não pertence mais ao worker (ex.: a
+        outra cópia já o concluiu).
+        """
+        with self._connect() as connection:
+            cursor = connection.execute(
+                """
+                UPDATE shards SET lease_expires = ?
+                WHERE shard_id = ? AND ? IN (worker, backup_worker) AND status = ?
+                """,
+                (time.time() + self.lease_seconds, shard_id, worker_id, LEASED),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, shard_id: str, worker_id: str) -> bool:
+        """
+        Marca o shard como concluído, se ainda estiver arrendado pelo worker (como original ou
+        reserva); a primeira cópia a terminar vence.
+        """
+        with self._connect() as connection:
+            cursor = connection.execute(
+                """
+                UPDATE shards SET status = ?, worker = ?, backup_worker = NULL,
+                    completed_at = ?, error = NULL
+                WHERE shard_id = ? AND ? IN (worker, backup_worker) AND status = ?
+                """,
+                (DONE, worker_id, time.time(), shard_id, worker_id, LEASED),
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, shard_id: str, worker_id: str, error: str):
+        """
+        Registra a falha de uma cópia do shard. Se a outra cópia ainda estiver em andamento,
+        ela segue sozinha; senão, o shard volta à fila, ou é marcado como falho após
+        `max_attempts` tentativas.
+        """
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            # Falha da reserva: o worker original continua com o shard
+            cursor = connection.execute(
+                """
+                UPDATE shards SET backup_worker = NULL, error = ?
+                WHERE shard_id = ? AND backup_worker = ? AND status = ?
+                """,
+                (error, shard_id, worker_id, LEASED),
+            )
+            if cursor.rowcount == 0:
+                # Falha do original com uma reserva em andamento: a reserva assume o shard
+                cursor = connection.execute(
+                    """
+                    UPDATE shards SET worker = backup_worker, backup_worker = NULL, error = ?
+                    WHERE shard_id = ? AND worker = ? AND backup_worker IS NOT NULL
+                        AND status = ?
+                    """,
+                    (error, shard_id, worker_id, LEASED),
+                )
+            if cursor.rowcount == 0:
+                connection.execute(
+                    """
+                    UPDATE shards SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END,
+                        worker = NULL, lease_expires = NULL, error = ?
+                    WHERE shard_id = ? AND worker = ? AND status = ?
+                    """,
+                    (
+                        self.max_attempts,
+                        FAILED,
+                        PENDING,
+                        error,
+                        shard_id,
+                        worker_id,
+                        LEASED,
+                    ),
+                )
+            connection.execute("COMMIT")
+
+    def counts(self) -> Dict[str, int]:
+        """Número de shards em cada estado."""
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT status, COUNT(*) FROM shards GROUP BY status"
+            ).fetchall()
+        return {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0, **dict(rows)}
+
+    def finished(self) -> bool:
+        counts = self.counts()
+        return counts[PENDING] == 0 and counts[LEASED] == 0
+
+    def done_shards(self) -> List[Dict[str, Any]]:
+        """Descritores dos shards concluídos."""
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT payload, completed_at FROM shards WHERE status = ?", (DONE,)
+            ).fetchall()
+        return [
+            dict(json.loads(payload), completed_at=completed_at)
+            for payload, completed_at in rows
+        ]
+
+    def failures(self) -> Dict[str, str]:
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT shard_id, error FROM shards WHERE status = ?", (FAILED,)
+            ).fetchall()
+        return dict(rows)
+
+
+class _Heartbeat:
+    """Renova o arrendamento de um shard em uma thread enquanto o worker o simula."""
+
+    def __init__(
+        self, queue: ShardQueue, shard_id: str, worker_id: str, interval: float
+    ):
+        self.lost = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(queue, shard_id, worker_id, interval), daemon=True
+        )
+
+    def _run(self, queue, shard_id, worker_id, interval):
+        while not self._stop.wait(interval):
+            if not queue.heartbeat(shard_id, worker_id):
+                self.lost.set()
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+
+def _save_partition(output_path: str, partition_key: str, match_df, worker_id: str):
+    """
+    Grava a partição em um arquivo temporário do worker e o renomeia, já que as duas cópias
+    de um straggler podem gravar a mesma partição ao mesmo tempo.
+    """
+    from kedro_datasets.pandas import ParquetDataset
+
+    filepath = f"{output_path.rstrip('/')}/{partition_key}.parquet"
+    tmp_filepath = f"{filepath}.{worker_id}.tmp"
+    ParquetDataset(filepath=tmp_filepath).save(match_df)
+    filesystem, tmp_path = fsspec.core.url_to_fs(tmp_filepath)
+    filesystem.mv(tmp_path, fsspec.core.url_to_fs(filepath)[1])
+
+
+def run_worker(
+    work_dir: str,
+    output_path: str,
+    worker_id: Optional[str] = None,
+    distributed_params: Optional[dict] = None,
+    deck_pool: Optional[str] = None,
+) -> int:
+    """
+    Arrenda e simula shards até a fila terminar.
+
+    Args:
+        work_dir (str): Pasta compartilhada da fila e dos decks.
+        output_path (str): Pasta (local ou remota, via fsspec) onde as partições são gravadas.
+        worker_id (str, optional): Identificador do worker. Padrão: `<host>-<pid>`.
+        distributed_params (dict, optional): `lease_seconds`, `heartbeat_seconds`,
+            `straggler_seconds`, `max_attempts` e `poll_seconds` (ver
+            `params:simulation.distributed`). Os valores gravados pelo coordenador na pasta da
+            fila têm precedência.
+        deck_pool (str, optional): Nome do `SharedDeckPool` com os decks compilados (workers
+            na máquina do coordenador). Se None, os decks são carregados de `<work_dir>/decks/`.
+
+    Returns:
+        int: Número de shards concluídos por este worker.
+    """
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    with open(os.path.join(work_dir, "queue.json"), "r") as file:
+        settings = json.load(file)
+    distributed_params = {**(distributed_params or {}), **settings["distributed"]}
+    params = settings["simulation"]
+    profile_folder = settings.get("profile_folder") or profile_run_folder(
+        params["log_folder"]
+    )
+
+    queue = ShardQueue(
+        os.path.join(work_dir, QUEUE_NAME),
+        lease_seconds=distributed_params["lease_seconds"],
+        straggler_seconds=distributed_params["straggler_seconds"],
+        max_attempts=distributed_params["max_attempts"],
+    )
+
+    pool = SharedDeckPool.attach(deck_pool) if deck_pool else None
+    logger.info(f"Worker {worker_id} iniciado.")
+
+    try:
+        n_completed = _work(
+            queue,
+            worker_id,
+            work_dir,
+            output_path,
+            params,
+            distributed_params,
+            pool,
+            profile_folder,
+        )
+    finally:
+        if pool is not None:
+            pool.close()
+
+    logger.info(f"Worker {worker_id} encerrado após {n_completed} shards.")
+    return n_completed
+
+
+def _load_deck(work_dir: str, shard: Dict[str, Any], pool: Optional[SharedDeckPool]):
+    """Deck do shard: do pool compartilhado, se houver, ou do arquivo gravado pelo coordenador."""
+    if pool is not None and shard["player"] in pool:
+        return pool.deck(shard["player"])
+    with open(os.path.join(work_dir, shard["deck_ref"]), "rb") as file:
+        return pickle.load(file)
+
+
+def _work(
+    queue,
+    worker_id,
+    work_dir,
+    output_path,
+    params,
+    distributed_params,
+    pool,
+    profile_folder,
+) -> int:
+    """Loop do worker: arrenda, simula e grava shards até a fila terminar."""
+    players: Dict[str, Player] = {}
+    n_completed = 0
+
+    # Nome pelo worker_id: pids de máquinas diferentes podem coincidir numa pasta compartilhada
+    with profile_simulation(params["profiling"], profile_folder, f"worker_{worker_id}"):
+        while True:
+            shard = queue.lease(worker_id)
+            if shard is None:
+                if queue.finished():
+                    break
+                time.sleep(distributed_params["poll_seconds"])
+                continue
+
+            shard_id = shard["shard_id"]
+            try:
+                # Deck carregado uma vez por worker e reaproveitado entre shards do mesmo jogador
+                player = players.get(shard["deck_ref"])
+                if player is None:
+                    player = Player(shard["player_name"])
+                    player.assign_deck(_load_deck(work_dir, shard, pool))
+                    players[shard["deck_ref"]] = player
+
+                with _Heartbeat(
+                    queue, shard_id, worker_id, distributed_params["heartbeat_seconds"]
+                ) as heartbeat:
+                    for match_num in range(
+                        shard["match_start"], shard["match_end"] + 1
+                    ):
+                        if heartbeat.lost.is_set():
+                            break
+                        match_df = play_match(
+                            player,
+                            params,
+                            match_num,
+                            derive_seed(shard["seed"], match_num),
+                        )
+                        _save_partition(
+                            output_path,
+                            match_partition_key(shard["player"], match_num),
+                            match_df,
+                            worker_id,
+                        )
+            except Exception as exc:
+                logger.exception(f"Worker {worker_id}: shard {shard_id} falhou.")
+                queue.fail(shard_id, worker_id, repr(exc))
+                continue
+
+            if heartbeat.lost.is_set() or not queue.complete(shard_id, worker_id):
+                logger.warning(
+                    f"Worker {worker_id}: shard {shard_id} concluído por outro worker ou "
+                    "re-arrendado; abandonado."
+                )
+                continue
+
+            n_completed += 1
+            logger.info(f"Worker {worker_id}: shard {shard_id} concluído.")
+
+    return n_completed
+
+
+def _write_manifest(output_path: str, shards: List[Dict[str, Any]]):
+    """Grava o manifesto de shards no formato do `CheckpointedPartitionedDataset`."""
+    manifest = {
+        "shards": {
+            shard["shard_id"]: {
+                "seed": shard["seed"],
+                "fingerprint": shard.get("fingerprint"),
+                "partitions": [
+                    match_partition_key(shard["player"], match_num)
+                    for match_num in range(shard["match_start"], shard["match_end"] + 1)
+                ],
+                "completed_at": datetime.fromtimestamp(
+                    shard["completed_at"], timezone.utc
+                ).isoformat(),
+            }
+            for shard in sorted(shards, key=lambda shard: shard["shard_id"])
+        },
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+    }
+    filesystem, root = fsspec.core.url_to_fs(output_path)
+    filesystem.makedirs(root, exist_ok=True)
+    manifest_path = f"{root.rstrip('/')}/{CheckpointedPartitionedDataset.MANIFEST_NAME}"
+    write_json_atomically(filesystem, manifest_path, manifest)
+
+
+def run_coordinator(
+    players: Dict[str, Player],
+    simulation_params: dict,
+    distributed_params: dict,
+    output_path: str,
+    n_local_workers: int = 0,
+) -> Dict[str, int]:
+    """
+    Enfileira os shards da simulação, opcionalmente inicia workers locais e aguarda a fila.
+
+    Shards já presentes na fila (ex.: de um coordenador anterior com o mesmo `work_dir`) não
+    são enfileirados de novo, então reiniciar o coordenador retoma a simulação; os que mudaram
+    de semente ou de deck voltam a ficar pendentes.
+
+    Args:
+        players (Dict[str, Player]): Jogadores com deck, indexados pelo nome da partição.
+        simulation_params (dict): Parâmetros da simulação (ver `params:simulation`).
+        distributed_params (dict): Parâmetros da fila (ver `params:simulation.distributed`).
+        output_path (str): Pasta de saída das partições (a mesma passada aos workers).
+        n_local_workers (int): Workers a iniciar como processos locais (0 para apenas
+            coordenar workers iniciados em outras máquinas). Com `shared_memory`, eles leem os
+            decks de um `SharedDeckPool` criado pelo coordenador.
+
+    Returns:
+        Dict[str, int]: Número de shards em cada estado ao fim.
+
+    Raises:
+        RuntimeError: Se todos os workers locais terminarem antes da fila.
+    """
+    work_dir = distributed_params["work_dir"]
+    os.makedirs(os.path.join(work_dir, DECKS_FOLDER), exist_ok=True)
+
+    random_state = simulation_params["random_state"]
+    if random_state is None:
+        raise ValueError(
+            "A simulação distribuída exige simulation.random_state definido."
+        )
+
+    # Pasta de perfis desta execução, compartilhada pelos workers via queue.json
+    profile_folder = profile_run_folder(simulation_params["log_folder"])
+    with open(os.path.join(work_dir, "queue.json"), "w") as file:
+        json.dump(
+            {
+                "simulation": simulation_params,
+                "distributed": distributed_params,
+                "profile_folder": profile_folder,
+            },
+            file,
+        )
+
+    # Um arquivo por deck: a "referência" que os workers carregam
+    for player_partition, player in players.items():
+        with open(
+            os.path.join(work_dir, DECKS_FOLDER, f"{player_partition}.pkl"), "wb"
+        ) as file:
+            pickle.dump(player.deck, file)
+
+    shards = plan_shards(
+        list(players),
+        simulation_params["matches_per_player"],
+        simulation_params["shard_size"],
+        random_state,
+        deck_signatures(players, simulation_params),
+        {
+            player_partition: deck_fingerprint(player.deck)
+            for player_partition, player in players.items()
+        },
+    )
+    for shard in shards:
+        shard["player_name"] = players[shard["player"]].name
+        shard["deck_ref"] = f"{DECKS_FOLDER}/{shard['player']}.pkl"
+
+    queue = ShardQueue(
+        os.path.join(work_dir, QUEUE_NAME),
+        lease_seconds=distributed_params["lease_seconds"],
+        straggler_seconds=distributed_params["straggler_seconds"],
+        max_attempts=distributed_params["max_attempts"],
+    )
+    n_new = queue.enqueue(shards)
+    logger.info(f"{n_new} de {len(shards)} shards enfileirados em {work_dir}.")
+
+    # Decks compilados uma vez em memória compartilhada para os workers desta máquina
+    pool = None
+    if n_local_workers and distributed_params["shared_memory"]:
+        pool = SharedDeckPool.create(
+            {
+                player_partition: player.deck
+                for player_partition, player in players.items()
+            }
+        )
+        logger.info(f"Decks compilados para os workers locais: {pool}")
+
+    start = time.perf_counter()
+    try:
+        processes = [
+            subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    MODULE,
+                    "worker",
+                    "--work-dir",
+                    work_dir,
+                    "--output",
+                    output_path,
+                    "--worker-id",
+                    f"{socket.gethostname()}-local-{worker_idx}",
+                ]
+                + (["--deck-pool", pool.name] if pool is not None else [])
+            )
+            for worker_idx in range(n_local_workers)
+        ]
+
+        last_counts = None
+        exit_codes: Dict[int, int] = {}
+        while not queue.finished():
+            for worker_idx, process in enumerate(processes):
+                if worker_idx not in exit_codes and process.poll() is not None:
+                    exit_codes[worker_idx] = process.returncode
+                    log = logger.info if process.returncode == 0 else logger.error
+                    log(
+                        f"Worker local {worker_idx} terminou com código {process.returncode}."
+                    )
+            # Sem workers locais vivos, a fila não andaria mais (ex.: erro de import ou
+            # --deck-pool inválido nos workers)
+            if processes and len(exit_codes) == len(processes) and not queue.finished():
+                raise RuntimeError(
+                    "Todos os workers locais terminaram antes da fila (códigos de saída: "
+                    f"{[exit_codes[idx] for idx in range(len(processes))]}); {queue.counts()}."
+                )
+            time.sleep(distributed_params["poll_seconds"])
+            counts = queue.counts()
+            if counts != last_counts:
+                logger.info(f"Fila: {counts} ({time.perf_counter() - start:.0f}s)")
+                last_counts = counts
+
+        for process in processes:
+            process.wait()
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.unlink()
+
+    _write_manifest(output_path, queue.done_shards())
+    # Perfis dos workers (os desta máquina ou de pastas de log compartilhadas), combinados uma vez
+    merge_profiles(profile_folder)
+
+    counts = queue.counts()
+    for shard_id, error in queue.failures().items():
+        logger.error(f"Shard {shard_id} falhou: {error}")
+    logger.info(
+        f"Simulação distribuída concluída em {time.perf_counter() - start:.1f}s: {counts}"
+    )
+    return counts
+
+
+def _load_players(players_path: str) -> Dict[str, Player]:
+    """Carrega os jogadores de uma pasta no formato de `players_with_decks` (um .pkl por jogador)."""
+    filesystem, root = fsspec.core.url_to_fs(players_path)
+    players = {}
+    for path in sorted(filesystem.find(root)):
+        if path.endswith(".pkl"):
+            with filesystem.open(path, "rb") as file:
+                player = pickle.load(file)
+            # Mesmo nome de partição do simulate_player_matches
+            players[player.name.replace(" ", "_")] = player
+    return players
+
+
+def _synthetic_players(synthetic_params: dict, n_decks: int) -> Dict[str, Player]:
+    """Um jogador por deck sintético (ver `generate_synthetic_decks`), para testes offline."""
+    from .nodes import generate_synthetic_decks
+
+    decks = generate_synthetic_decks({**synthetic_params, "n_decks": n_decks})
+    players = {}
+    for deck_idx, deck in enumerate(decks.values()):
+        player = Player(f"Synthetic Player {deck_idx:06d}")
+        player.assign_deck(deck)
+        players[player.name.replace(" ", "_")] = player
+    return players
+
+
+def main():
+    from kedro.config import OmegaConfigLoader
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("role", choices=["coordinator", "worker"])
+    parser.add_argument(
+        "--conf-source", default="conf", help="Pasta de configuração do Kedro"
+    )
+    parser.add_argument(
+        "--work-dir", help="Pasta compartilhada da fila (padrão: parâmetros)"
+    )
+    parser.add_argument("--output", required=True, help="Pasta de saída das partidas")
+    parser.add_argument(
+        "--players", help="Pasta com os jogadores (.pkl) de players_with_decks"
+    )
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        help="Simula N jogadores com decks sintéticos em vez de --players",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=0, help="Workers locais a iniciar"
+    )
+    parser.add_argument("--worker-id")
+    parser.add_argument(
+        "--deck-pool", help="Nome do SharedDeckPool criado pelo coordenador"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    # As mensagens por partida e por turno das classes do jogo poluiriam o log dos workers
+    for name in ("classes", "mtg_project.pipelines.simulation.nodes"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    parameters = OmegaConfigLoader(
+        args.conf_source, base_env="base", default_run_env="local"
+    )["parameters"]
+    simulation_params = dict(parameters["simulation"])
+    distributed_params = dict(simulation_params.pop("distributed"))
+    if args.work_dir:
+        distributed_params["work_dir"] = args.work_dir
+
+    if args.role == "worker":
+        run_worker(
+            distributed_params["work_dir"],
+            args.output,
+            args.worker_id,
+            distributed_params,
+            args.deck_pool,
+        )
+        return 0
+
+    if args.synthetic:
+        players = _synthetic_players(parameters["synthetic_decks"], args.synthetic)
+    elif args.players:
+        players = _load_players(args.players)
+    else:
+        parser.error("O coordenador precisa de --players ou --synthetic.")
+
+    counts = run_coordinator(
+        players, simulation_params, distributed_params, args.output, args.workers
+    )
+    return 1 if counts[FAILED] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
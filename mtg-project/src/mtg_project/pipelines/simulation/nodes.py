@@ -1,32 +1,60 @@
 """Simulation nodes."""
 
+import hashlib
+import json
 import os
 import random
+import sys
+import time
 import warnings
 import logging
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Callable, Dict, List, Tuple, Union
 
-from faker import Faker
-from typing import Callable, Dict, List
+from mtgsdk import Card
 
+from classes.card_resolver import CardResolver
+from classes.card_store import CardStore
 from classes.deck import Deck
+from classes.deck_signature import deck_signature
+from classes.deck_generator import SyntheticDeckGenerator
 from classes.player import Player
 from classes.player_tracker import PlayerTracker
 
+from mtg_project.datasets import ShardPartition
+
+from ..utils import record_node_counters
+from .profiling import merge_profiles, profile_run_folder, profile_simulation
+from .signatures import SignatureSimulator
+
 warnings.filterwarnings("ignore")
 
-def create_players(n_players: int):
+# Motores de simulação das partidas (params:simulation.engine)
+SIMULATION_ENGINES = ("python", "kernel")
+
+
+def create_players(n_players: int, random_state: int = None):
     """
     Cria uma lista de objetos Player com nomes aleatórios.
 
+    Os nomes são gerados a partir de `random_state`, então uma execução retomada recria os
+    mesmos jogadores (e as mesmas partições) da execução interrompida.
+
     Args:
         n_players (int): Número de jogadores a serem criados.
+        random_state (int, optional): Semente dos nomes (None gera nomes diferentes a cada execução).
 
     Returns:
         List[Player]: Lista de objetos Player com nomes gerados aleatoriamente.
     """
-    # Inicializando o gerador de dados falsos Faker
+    # Import local: o Faker só é carregado quando os jogadores são criados
+    from faker import Faker
+
+    # Inicializando o gerador de dados falsos Faker, com semente própria (não a global)
     fake = Faker()
+    fake.seed_instance(random_state)
 
     # Gerando uma lista de nomes aleatórios usando o Faker
     player_names = [
@@ -40,70 +68,237 @@ def create_players(n_players: int):
     return players
 
 
-def assign_decks_to_players(
-    players: List[Player], sampled_decks: Dict[str, str], log_folder: str
-) -> List[Player]:
+def generate_synthetic_decks(params: dict) -> Dict[str, Deck]:
     """
-    Função para atribuir decks aleatórios a cada player na lista de players.
+    Gera decks válidos a partir de distribuições paramétricas, sem acessar o MTGJSON nem o mtgsdk.
 
-    A função tentará atribuir um deck a cada player chamando o método assign_deck().
-    Caso ocorra algum erro na atribuição, tentará com outro deck disponível.
+    Os decks alternam entre os formatos pedidos e passam no `Deck.is_valid` de cada formato.
+    A mesma semente gera os mesmos decks, o que permite testes de carga reprodutíveis e offline.
 
     Args:
-        players (list): Lista de objetos Player.
-        sampled_decks (dict): Dicionário com os nomes e caminhos dos decks.
-        log_folder (str): Caminho da pasta para salvar o log.
+        params (dict): Parâmetros do gerador (ver `params:synthetic_decks`): `n_decks`, `formats`,
+            `land_ratio_mean`, `land_ratio_std`, `cmc_weights`, `color_count_weights`,
+            `max_copies`, `cards_per_slot` e `random_state`.
 
     Returns:
-        List[Player]: Lista de objetos Player com decks atribuídos.
+        Dict[str, Deck]: Decks gerados, indexados pelo nome, prontos para o `assign_decks_to_players`.
     """
     # Configurar o logger para a função
     logger = logging.getLogger(__name__)
 
-    # Log de início da validação
-    logger.info("Validating decks...")
+    generator = SyntheticDeckGenerator(
+        land_ratio=(params["land_ratio_mean"], params["land_ratio_std"]),
+        cmc_weights=params["cmc_weights"],
+        color_count_weights=params["color_count_weights"],
+        max_copies=params["max_copies"],
+        cards_per_slot=params["cards_per_slot"],
+        seed=params["random_state"],
+    )
+    synthetic_decks = generator.generate_many(params["n_decks"], params["formats"])
 
-    # Convertemos as chaves do dicionário para uma lista de nomes de decks disponíveis
-    available_decks = list(sampled_decks.keys())
+    logger.info(f"{len(synthetic_decks)} decks sintéticos gerados: {generator}")
 
-    for player in players:
-        assigned = False
-        while not assigned and available_decks:
-            try:
-                # Seleciona um deck aleatório da lista de decks disponíveis
-                deck_name = random.choice(available_decks)
+    return synthetic_decks
 
-                # Obter o caminho completo do deck a partir do dicionário sampled_decks
-                deck_path = sampled_decks[deck_name]
 
-                # Cria um novo objeto Deck
-                deck = Deck()
+def create_card_resolver(resolver_params: dict) -> CardResolver:
+    """
+    Cria o resolvedor de cartas compartilhado pelos carregamentos de decks de uma execução.
 
-                # Carrega o deck a partir do arquivo .txt no caminho obtido
-                deck.load_deck_from_txt(deck_path)
+    Args:
+        resolver_params (dict): Parâmetros do resolvedor (ver `params:simulation.card_resolver`):
+            `base_url`, `max_connections`, `rate_limit`, `burst`, `max_retries`, `backoff`,
+            `timeout` e `card_store_path` (JSON do CardStore reaproveitado entre execuções,
+            ou None para manter as cartas só em memória).
 
-                # Atribui o deck ao player
-                player.assign_deck(deck)
-                logger.info(f"Deck '{deck_name}' assigned to player '{player.name}'")
+    Returns:
+        CardResolver: Resolvedor apoiado no CardStore indicado.
+    """
+    return CardResolver(
+        card_store=CardStore(resolver_params["card_store_path"]),
+        base_url=resolver_params["base_url"],
+        max_connections=resolver_params["max_connections"],
+        rate_limit=resolver_params["rate_limit"],
+        burst=resolver_params["burst"],
+        max_retries=resolver_params["max_retries"],
+        backoff=resolver_params["backoff"],
+        timeout=resolver_params["timeout"],
+    )
+
+
+def resolve_decklists(
+    resolver: CardResolver, decklist_texts: Dict[str, str]
+) -> Tuple[Dict[str, Card], Dict[str, str]]:
+    """
+    Resolve, em uma única passada concorrente, todas as cartas distintas de um conjunto de decklists.
 
-                # Remove o deck da lista de decks disponíveis para evitar reutilização
-                available_decks.remove(deck_name)
+    Args:
+        resolver (CardResolver): Resolvedor compartilhado da execução.
+        decklist_texts (Dict[str, str]): Conteúdo dos decklists, indexado pelo nome do deck.
 
-                assigned = True  # Deck atribuído com sucesso
-            except Exception as e:
-                # Em caso de erro, tenta outro deck
-                logger.error(
-                    f"Failed to assign deck '{deck_name}' to player '{player.name}': {e}"
-                )
-                continue
+    Returns:
+        Tuple[Dict[str, Card], Dict[str, str]]: Cartas resolvidas, indexadas pelo nome, e os
+            decks com alguma carta não resolvida, com o motivo.
+    """
+    logger = logging.getLogger(__name__)
 
-        # Se não houver mais decks disponíveis e não conseguir atribuir, lança um erro
-        if not assigned:
-            raise ValueError(
-                f"No available decks left to assign to player '{player.name}'."
+    deck_card_names = {
+        deck_name: Deck.parse_decklist(decklist_text)[1]
+        for deck_name, decklist_text in decklist_texts.items()
+    }
+    card_names = set()
+    for names in deck_card_names.values():
+        card_names.update(names)
+
+    start = time.perf_counter()
+    cards, failures = resolver.resolve_names(sorted(card_names))
+    logger.info(
+        f"{len(card_names)} cartas distintas de {len(decklist_texts)} decks resolvidas "
+        f"em {time.perf_counter() - start:.1f}s ({len(failures)} falhas): {resolver}"
+    )
+
+    if resolver.card_store.path:
+        resolver.card_store.save()
+
+    deck_failures = {}
+    for deck_name, names in deck_card_names.items():
+        card_name = next((name for name in names if name in failures), None)
+        if card_name is not None:
+            deck_failures[deck_name] = (
+                f"Card '{card_name}' generated an exception: {failures[card_name]}"
             )
 
-    players_with_decks = players
+    return cards, deck_failures
+
+
+def load_deck_pool(
+    sampled_decks: Dict[str, Union[str, Deck]], resolver_params: dict
+) -> Tuple[Dict[str, Deck], pd.DataFrame]:
+    """
+    Carrega e valida, de uma só vez, todos os decks amostrados.
+
+    Os decklists em .txt são lidos em paralelo e todas as suas cartas são resolvidas em uma única
+    passada concorrente (`resolve_decklists`); em seguida cada deck é montado em série com as
+    cartas já resolvidas, sem novas buscas, e validado (`Deck.is_valid`). Decks inválidos ou com
+    cartas não resolvidas ficam fora do pool, com o motivo da falha.
+
+    Args:
+        sampled_decks (dict): Dicionário com os nomes dos decks e seus caminhos (.txt)
+            ou os próprios objetos Deck (ex.: gerados por `generate_synthetic_decks`).
+        resolver_params (dict): Parâmetros do resolvedor de cartas (ver `create_card_resolver`).
+
+    Returns:
+        Tuple[Dict[str, Deck], pd.DataFrame]: Decks válidos, indexados pelo nome, e as falhas
+            (colunas `deck_name` e `reason`).
+    """
+    # Configurar o logger para a função
+    logger = logging.getLogger(__name__)
+
+    logger.info(f"Carregando e validando {len(sampled_decks)} decks...")
+
+    # Lê os decklists em .txt em paralelo (I/O)
+    deck_paths = {
+        deck_name: deck
+        for deck_name, deck in sampled_decks.items()
+        if not isinstance(deck, Deck)
+    }
+
+    def read_decklist(path):
+        # Erros de leitura viram falhas do deck, sem interromper a leitura dos demais
+        try:
+            with open(path, "r") as file:
+                return file.read()
+        except Exception as e:
+            return e
+
+    failures = []
+    decklist_texts = {}
+    with ThreadPoolExecutor(max_workers=resolver_params["max_connections"]) as executor:
+        for deck_name, text in zip(
+            deck_paths, executor.map(read_decklist, deck_paths.values())
+        ):
+            if isinstance(text, Exception):
+                failures.append({"deck_name": deck_name, "reason": str(text)})
+            else:
+                decklist_texts[deck_name] = text
+
+    # Resolve todas as cartas distintas dos decklists em uma única passada
+    resolver = create_card_resolver(resolver_params)
+    cards, unresolved_decks = {}, {}
+    try:
+        if decklist_texts:
+            cards, unresolved_decks = resolve_decklists(resolver, decklist_texts)
+    finally:
+        resolver.close()
+
+    deck_pool = {}
+    for deck_name, deck in sampled_decks.items():
+        if not isinstance(deck, Deck) and deck_name not in decklist_texts:
+            continue
+        try:
+            if not isinstance(deck, Deck):
+                if deck_name in unresolved_decks:
+                    raise ValueError(unresolved_decks[deck_name])
+
+                # Monta o deck a partir do .txt, com as cartas já resolvidas
+                deck = Deck()
+                deck.load_deck_from_text(decklist_texts[deck_name], cards=cards)
+
+            if not deck.is_valid():
+                raise ValueError("The deck does not meet the rules of its format.")
+        except Exception as e:
+            failures.append({"deck_name": deck_name, "reason": str(e)})
+            continue
+
+        deck_pool[deck_name] = deck
+
+    deck_failures = pd.DataFrame(failures, columns=["deck_name", "reason"])
+    logger.info(
+        f"{len(deck_pool)} decks válidos e {len(deck_failures)} inválidos de {len(sampled_decks)}."
+    )
+    for failure in failures:
+        logger.warning(f"Deck '{failure['deck_name']}' descartado: {failure['reason']}")
+
+    return deck_pool, deck_failures
+
+
+def assign_decks_to_players(
+    players: List[Player],
+    deck_pool: Dict[str, Deck],
+    log_folder: str,
+    random_state: int = None,
+) -> Dict[str, Player]:
+    """
+    Função para atribuir decks aleatórios a cada player na lista de players.
+
+    Os decks vêm do pool já carregado e validado por `load_deck_pool`, então a atribuição é uma
+    única amostragem sem reposição: cada player recebe um deck diferente. A amostragem usa um
+    gerador próprio semeado com `random_state`, então uma execução retomada atribui os mesmos
+    decks.
+
+    Args:
+        players (list): Lista de objetos Player.
+        deck_pool (dict): Decks válidos, indexados pelo nome (saída de `load_deck_pool`).
+        log_folder (str): Caminho da pasta para salvar o log.
+        random_state (int, optional): Semente da amostragem (None sorteia a cada execução).
+
+    Returns:
+        Dict[str, Player]: Players com decks atribuídos, indexados pelo nome da partição.
+    """
+    # Configurar o logger para a função
+    logger = logging.getLogger(__name__)
+
+    if len(deck_pool) < len(players):
+        raise ValueError(
+            f"Only {len(deck_pool)} valid decks for {len(players)} players; "
+            "not enough decks to assign."
+        )
+
+    # Sorteia, de uma vez, um deck distinto para cada player (em ordem estável dos nomes)
+    deck_names = random.Random(random_state).sample(sorted(deck_pool), len(players))
+    for player, deck_name in zip(players, deck_names):
+        player.assign_deck(deck_pool[deck_name])
+        logger.info(f"Deck '{deck_name}' assigned to player '{player.name}'")
 
     logger.info("Deck assignment process completed.")
 
@@ -121,12 +316,328 @@ def assign_decks_to_players(
 
     return players_with_decks
 
+
+class _MatchStream:
+    """
+    Partidas de uma execução do `simulate_player_matches`, simuladas sob demanda.
+
+    Cada partição de saída chama `play` para uma partida (ou `skip`, se a partida já foi gravada
+    em uma execução anterior); o profiling (se ativado) começa na primeira partida simulada e é
+    gravado ao fim da última, e os contadores de throughput vão para as métricas do nó a cada
+    partida.
+    """
+
+    def __init__(self, params: dict, n_matches: int):
+        self.params = params
+        self.remaining = n_matches
+        self.n_matches = 0
+        self.n_skipped = 0
+        self.n_turns = 0
+        self._profile = None
+        self._profile_folder = None
+        self._start = None
+
+    def _finish(self, exc_info=(None, None, None)):
+        """Encerra o profiling e registra o throughput de toda a simulação."""
+        if self._profile is not None:
+            self._profile.__exit__(*exc_info)
+            self._profile = None
+            merge_profiles(self._profile_folder)
+
+        logger = logging.getLogger(__name__)
+        if self._start is None:
+            logger.info(f"Todas as {self.n_skipped} partidas já haviam sido simuladas.")
+            return
+
+        elapsed = time.perf_counter() - self._start
+        if self.params["dedup"]["enabled"]:
+            signature_simulator(self.params).log_stats()
+        logger.info(
+            f"{self.n_matches} partidas simuladas em {elapsed:.1f}s "
+            f"({self.n_matches / elapsed:.1f} partidas/s, {self.n_turns / elapsed:.1f} turnos/s); "
+            f"{self.n_skipped} reaproveitadas de execuções anteriores."
+        )
+
+    def _match_done(self):
+        self.remaining -= 1
+        if self.remaining == 0:
+            self._finish()
+
+    def skip(self):
+        """Conta uma partida já gravada em uma execução anterior."""
+        self.n_skipped += 1
+        self._match_done()
+
+    def play(self, player: Player, match_num: int, seed: int) -> pd.DataFrame:
+        """
+        Simula uma partida do jogador e retorna o DataFrame do tracker.
+
+        O gerador aleatório do jogador é semeado com a semente da partida, então o resultado
+        depende apenas da semente (e não da ordem em que as partidas são simuladas).
+        """
+        params = self.params
+
+        if self._start is None:
+            self._start = time.perf_counter()
+            self._profile_folder = profile_run_folder(params["log_folder"])
+            self._profile = profile_simulation(
+                params["profiling"], self._profile_folder
+            )
+            self._profile.__enter__()
+
+        try:
+            match_df = play_match(player, params, match_num, seed)
+        except BaseException:
+            if self._profile is not None:
+                self._finish(sys.exc_info())
+            raise
+
+        self.n_matches += 1
+        self.n_turns += player.turn
+        self._match_done()
+
+        return match_df
+
+
+@lru_cache(maxsize=None)
+def match_engine(engine: str) -> str:
+    """
+    Resolve o motor de simulação pedido (`params:simulation.engine`).
+
+    `kernel` usa o kernel compilado com Numba (`classes.match_kernel`); se o Numba não estiver
+    instalado, avisa uma vez e usa o motor `python` (Player.play_a_match).
+    """
+    if engine not in SIMULATION_ENGINES:
+        raise ValueError(
+            f"Motor de simulação '{engine}' inválido. Escolha entre: {', '.join(SIMULATION_ENGINES)}"
+        )
+    if engine == "kernel":
+        from classes.match_kernel import NUMBA_AVAILABLE
+
+        if not NUMBA_AVAILABLE:
+            logging.getLogger(__name__).warning(
+                "Numba não instalado; simulando com o motor python em vez do kernel compilado."
+            )
+            return "python"
+    return engine
+
+
+@lru_cache(maxsize=None)
+def _signature_simulator(params_key: str) -> SignatureSimulator:
+    return SignatureSimulator(json.loads(params_key), simulate=simulate_match)
+
+
+def signature_simulator(params: dict) -> SignatureSimulator:
+    """O `SignatureSimulator` do processo para estes parâmetros (um por conjunto de parâmetros)."""
+    return _signature_simulator(json.dumps(params, sort_keys=True, default=str))
+
+
+def deck_signatures(
+    players: Dict[str, Player], params: dict
+) -> Union[Dict[str, str], None]:
+    """
+    Assinatura de simulação do deck de cada jogador (`classes.deck_signature`), por partição,
+    ou None se a deduplicação (`params:simulation.dedup.enabled`) estiver desligada.
+    """
+    if not params["dedup"]["enabled"]:
+        return None
+
+    signatures = {
+        player_partition: deck_signature(player.deck, params["colored_mana"]).signature
+        for player_partition, player in players.items()
+    }
+    logging.getLogger(__name__).info(
+        f"{len(signatures)} decks com {len(set(signatures.values()))} assinaturas de simulação distintas."
+    )
+    return signatures
+
+
+def play_match(player: Player, params: dict, match_num: int, seed: int) -> pd.DataFrame:
+    """
+    Simula uma partida do jogador com uma semente própria e retorna o DataFrame do tracker.
+
+    O gerador aleatório do jogador é semeado com a semente da partida, então o resultado
+    depende apenas da semente (e não da ordem em que as partidas são simuladas nem do
+    processo que as simula). Os dois motores (`params:simulation.engine`) consomem o mesmo
+    gerador da mesma forma e produzem os mesmos dados.
+
+    Com `params:simulation.dedup.enabled`, a partida é simulada uma vez por assinatura do deck
+    e semente (ver `SignatureSimulator`) e replicada para os decks com a mesma assinatura.
+
+    Args:
+        player (Player): Jogador com deck atribuído.
+        params (dict): Parâmetros da simulação (ver `params:simulation`).
+        match_num (int): Número da partida.
+        seed (int): Semente da partida (ver `plan_shards`).
+
+    Returns:
+        pd.DataFrame: Dados da partida, turno a turno.
+    """
+    logger = logging.getLogger(__name__)
+    logger.info(f"Simulando partida {match_num} para o jogador '{player.name}'...")
+
+    if params["dedup"]["enabled"]:
+        match_df = signature_simulator(params).play(player, match_num, seed)
+        # A partida pode ter vindo do cache: o estado final do jogador sai do último turno
+        # registrado. Antes de max_turns, a partida parou por hand_size_stop em um turno
+        # seguinte (não registrado); as compras são 7 cartas na mão inicial e em cada
+        # mulligan, mais uma por turno.
+        last_turn = match_df.iloc[-1]
+        player.match = match_num
+        player.turn = min(int(last_turn["turn"]) + 1, params["max_turns"])
+        player.mulligan_count = int(last_turn["mulligan_count"])
+        player.cards_drawn = 7 * (1 + player.mulligan_count) + player.turn
+    else:
+        match_df = simulate_match(player, params, match_num, seed)
+
+    record_node_counters(matches=1, turns=player.turn, cards_drawn=player.cards_drawn)
+
+    return match_df
+
+
+def simulate_match(
+    player: Player, params: dict, match_num: int, seed: int
+) -> pd.DataFrame:
+    """
+    Simula uma partida do jogador com o motor de `params:simulation.engine`, sem deduplicação
+    nem contadores do nó (ver `play_match`).
+    """
+    # Inicializa o tracker para armazenar os dados da partida atual
+    tracker = PlayerTracker(
+        hand_log_mode=params["hand_log_mode"],
+        running_features=params["running_features"],
+    )
+
+    # Simula a partida, com o número e a semente definidos pela partição
+    player.rng = random.Random(seed)
+    if match_engine(params["engine"]) == "kernel":
+        from classes.match_kernel import play_matches
+
+        [records] = play_matches(
+            player,
+            [player.rng],
+            [match_num],
+            params["max_mulligans"],
+            params["mulligan_prob"],
+            params["max_turns"],
+            params["hand_size_stop"],
+            params["extra_land_prob"],
+            hand_log_mode=params["hand_log_mode"],
+            colored_mana=params["colored_mana"],
+        )
+        tracker.log_records(records)
+    else:
+        player.play_a_match(
+            tracker,
+            params["max_mulligans"],
+            params["mulligan_prob"],
+            params["max_turns"],
+            params["hand_size_stop"],
+            params["extra_land_prob"],
+            match_number=match_num,
+            colored_mana=params["colored_mana"],
+        )
+
+    return tracker.get_data()
+
+
+def derive_seed(*parts) -> int:
+    """
+    Deriva uma semente de 64 bits, estável entre execuções e processos, a partir de uma
+    semente base e de identificadores (ex.: jogador e partida).
+    """
+    key = "/".join(str(part) for part in parts).encode()
+    return int.from_bytes(hashlib.sha256(key).digest()[:8], "big")
+
+
+def deck_fingerprint(deck) -> str:
+    """
+    Identifica o conteúdo de um deck (nome e cartas, com as cópias), para que um shard só seja
+    reaproveitado se foi simulado com o mesmo deck.
+    """
+    payload = json.dumps([deck.deck_name, sorted(card.name for card in deck.cards)])
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def match_partition_key(player_partition: str, match_num: int) -> str:
+    """Nome da partição de uma partida em `matches_df` (ex.: `Jeremy_Wiggins/match_001`)."""
+    return f"{player_partition}/match_{str(match_num).zfill(3)}"
+
+
+def plan_shards(
+    player_partitions: List[str],
+    matches_per_player: int,
+    shard_size: int,
+    random_state: int,
+    signatures: Dict[str, str] = None,
+    fingerprints: Dict[str, str] = None,
+) -> List[dict]:
+    """
+    Divide as partidas de cada jogador em shards de até `shard_size` partidas consecutivas.
+
+    A semente de cada shard deriva de `random_state`, do jogador, do deck (`fingerprints`) e
+    da primeira partida do shard (e a de cada partida, da semente do shard), então o mesmo
+    plano sai igual em qualquer processo ou máquina. Com `signatures`, a semente deriva da
+    assinatura do deck no lugar do jogador e do deck: jogadores com decks de mesma assinatura
+    jogam as mesmas partidas. Cada shard leva o `fingerprint` do deck, que o manifesto
+    confere antes de reaproveitá-lo.
+
+    Args:
+        player_partitions (List[str]): Nomes das partições dos jogadores (ex.: `Jeremy_Wiggins`).
+        matches_per_player (int): Número de partidas por jogador.
+        shard_size (int): Número máximo de partidas por shard.
+        random_state (int): Semente base da simulação.
+        signatures (Dict[str, str], optional): Assinatura do deck de cada jogador (ver
+            `deck_signatures`).
+        fingerprints (Dict[str, str], optional): Identificação do deck de cada jogador (ver
+            `deck_fingerprint`).
+
+    Returns:
+        List[dict]: Shards com `shard_id`, `player`, `seed`, `fingerprint`, `match_start` e
+            `match_end`.
+    """
+    shards = []
+    for player_partition in player_partitions:
+        fingerprint = fingerprints[player_partition] if fingerprints else None
+        if signatures:
+            seed_parts = (signatures[player_partition],)
+        elif fingerprint:
+            seed_parts = (player_partition, fingerprint)
+        else:
+            seed_parts = (player_partition,)
+
+        for shard_start in range(1, matches_per_player + 1, shard_size):
+            shard_end = min(shard_start + shard_size - 1, matches_per_player)
+            shards.append(
+                {
+                    "shard_id": f"{player_partition}/matches_{shard_start:03d}-{shard_end:03d}",
+                    "player": player_partition,
+                    "seed": derive_seed(random_state, *seed_parts, shard_start),
+                    "fingerprint": fingerprint,
+                    "match_start": shard_start,
+                    "match_end": shard_end,
+                }
+            )
+    return shards
+
+
 def simulate_player_matches(
     params: dict, players_with_decks: Dict[str, Callable]
-) -> Dict[str, pd.DataFrame]:
+) -> Dict[str, Callable[[], pd.DataFrame]]:
     """
     Simula partidas de Magic: The Gathering para uma lista de jogadores com base nos parâmetros fornecidos.
 
+    As partidas são simuladas sob demanda: cada partição de saída é uma função que simula a
+    sua partida quando chamada. O PartitionedDataset chama e grava uma partição por vez, então
+    só uma partida fica em memória, a gravação intercala com a simulação e, se a execução
+    falhar, as partidas já gravadas são mantidas.
+
+    As partidas de cada jogador são agrupadas em shards de `shard_size` partidas, cada um com
+    uma semente derivada de `random_state`, do jogador e da primeira partida do shard (e cada
+    partida com uma semente derivada da do shard). Com o `CheckpointedPartitionedDataset`, os
+    shards concluídos ficam registrados em um manifesto e uma execução retomada pula esses
+    shards, produzindo a mesma saída de uma execução sem interrupções.
+
     Parâmetros:
     -----------
     params : dict
@@ -134,72 +645,76 @@ def simulate_player_matches(
 
     players_with_decks : Dict[str, Callable]
         Dicionário onde as chaves são os nomes dos arquivos (e.g., 'Jeremy_Wiggins.pkl')
-        e os valores são métodos que carregam objetos Player.
+        e os valores são métodos que carregam objetos Player (ou os próprios objetos Player,
+        quando o dataset fica em memória).
 
     Retorna:
     --------
-    Dict[str, pd.DataFrame]
+    Dict[str, Callable[[], pd.DataFrame]]
         Dicionário onde as chaves são combinações nome do jogador e número da partida,
-        e os valores são DataFrames contendo os dados das partidas.
+        e os valores são funções que simulam a partida e retornam o DataFrame com os seus dados.
     """
     # Carregar os jogadores chamando os métodos de carregamento
     loaded_players = {}
     for partition_name, load_method in players_with_decks.items():
-        player = load_method()  # Chama o método _load para obter o objeto Player
+        # Chama o método _load para obter o objeto Player (se já não estiver em memória)
+        player = load_method if isinstance(load_method, Player) else load_method()
         loaded_players[partition_name] = player
 
     # Verificar se há jogadores carregados
     if not loaded_players:
         raise ValueError("Nenhum jogador foi carregado.")
 
-    # Atribuir os parâmetros
-    max_mulligans = params["max_mulligans"]
-    mulligan_prob = params["mulligan_prob"]
-    hand_size_stop = params["hand_size_stop"]
-    max_turns = params["max_turns"]
-    extra_land_prob = params["extra_land_prob"]
     matches_per_player = params["matches_per_player"]
-    log_folder = params["log_folder"]
+    shard_size = params["shard_size"]
+    random_state = params["random_state"]
 
     # Configurar o logger para a função
     logger = logging.getLogger(__name__)
 
-    # Log de início da simulação
-    logger.info("Iniciando simulações...")
+    if random_state is None:
+        random_state = random.randrange(2**32)
+        logger.warning(
+            f"simulation.random_state não definido; usando {random_state}. Defina-o para que "
+            "uma execução interrompida possa ser retomada com a mesma saída."
+        )
+
+    stream = _MatchStream(params, len(loaded_players) * matches_per_player)
+
+    # Uma partição preguiçosa por partida, com o número e a semente fixados na própria partição
+    players_by_partition = {
+        player.name.replace(' ', '_'): player for player in loaded_players.values()
+    }
+    shards = plan_shards(
+        list(players_by_partition),
+        matches_per_player,
+        shard_size,
+        random_state,
+        deck_signatures(players_by_partition, params),
+        {
+            player_partition: deck_fingerprint(player.deck)
+            for player_partition, player in players_by_partition.items()
+        },
+    )
 
-    # Dicionário para armazenar os resultados de cada partida
     matches_data = {}
-
-    # Loop através dos jogadores e realizar as simulações de partidas
-    for partition_name, player in loaded_players.items():
-        for match_num in range(1, matches_per_player + 1):
-            logger.info(
-                f"Simulando partida {match_num} para o jogador '{player.name}'..."
+    for shard in shards:
+        player = players_by_partition[shard["player"]]
+        for match_num in range(shard["match_start"], shard["match_end"] + 1):
+            partition_key = match_partition_key(shard["player"], match_num)
+            match_seed = derive_seed(shard["seed"], match_num)
+            matches_data[partition_key] = ShardPartition(
+                shard["shard_id"],
+                shard["seed"],
+                partial(stream.play, player, match_num, match_seed),
+                skip=stream.skip,
+                fingerprint=shard["fingerprint"],
             )
 
-            # Inicializa o tracker para armazenar os dados da partida atual
-            tracker = PlayerTracker()
-
-            # Simula uma partida
-            player.play_a_match(
-                tracker,
-                max_mulligans,
-                mulligan_prob,
-                max_turns,
-                hand_size_stop,
-                extra_land_prob,
-            )
-
-            # Obter os dados da partida atual
-            match_dataframe = tracker.get_data()
-
-            # Construir o nome da partição usando nome do jogador e número da partida
-            player_name_sanitized = player.name.replace(' ', '_')
-            match_num_filled = str(match_num).zfill(3)
-            partition_key = f"{player_name_sanitized}/match_{match_num_filled}"
-
-            # Armazena o DataFrame da partida atual no dicionário de resultados
-            matches_data[partition_key] = match_dataframe
+    logger.info(
+        f"{len(matches_data)} partidas de {len(loaded_players)} jogadores serão simuladas "
+        f"à medida que forem gravadas (shards de {shard_size} partidas, random_state {random_state})."
+    )
 
     # Remover o handler para evitar problemas futuros
     for handler in logger.handlers:
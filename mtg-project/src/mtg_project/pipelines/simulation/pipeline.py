@@ -1,8 +1,14 @@
 """Simulation pipeline."""
 
-from kedro.pipeline import Pipeline, node
+from kedro.pipeline import Pipeline, node, pipeline
 
-from .nodes import assign_decks_to_players, create_players, simulate_player_matches
+from .nodes import (
+    assign_decks_to_players,
+    create_players,
+    generate_synthetic_decks,
+    load_deck_pool,
+    simulate_player_matches,
+)
 
 
 def create_simulation_pipeline(**kwargs) -> Pipeline:
@@ -10,13 +16,27 @@ def create_simulation_pipeline(**kwargs) -> Pipeline:
         [
             node(
                 func=create_players,
-                inputs="params:simulation.n_players",
+                inputs=[
+                    "params:simulation.n_players",
+                    "params:simulation.random_state",
+                ],
                 outputs="players",
                 name="create_players_node",
             ),
+            node(
+                func=load_deck_pool,
+                inputs=["sampled_decks", "params:simulation.card_resolver"],
+                outputs=["deck_pool", "deck_failures"],
+                name="load_deck_pool_node",
+            ),
             node(
                 func=assign_decks_to_players,
-                inputs=["players", "sampled_decks", "params:simulation.log_folder"],
+                inputs=[
+                    "players",
+                    "deck_pool",
+                    "params:simulation.log_folder",
+                    "params:simulation.random_state",
+                ],
                 outputs="players_with_decks",
                 name="assign_decks_node",
             ),
@@ -28,3 +48,40 @@ def create_simulation_pipeline(**kwargs) -> Pipeline:
             ),
         ]
     )
+
+
+def create_synthetic_simulation_pipeline(**kwargs) -> Pipeline:
+    """
+    Simula partidas com decks gerados sinteticamente (um jogador por deck), sem I/O de decks
+    nem consultas ao mtgsdk, para testes de carga. Decks e jogadores ficam em memória; as
+    partidas são gravadas em disco à medida que são simuladas.
+    """
+    generation_pipeline = Pipeline(
+        [
+            node(
+                func=generate_synthetic_decks,
+                inputs="params:synthetic_decks",
+                outputs="synthetic_decks",
+                name="generate_synthetic_decks_node",
+            ),
+        ]
+    )
+
+    simulation_pipeline = create_simulation_pipeline()
+
+    synthetic_simulation_pipeline = pipeline(
+        simulation_pipeline,
+        namespace="synthetic",
+        inputs={"sampled_decks": "synthetic_decks"},
+        parameters={
+            "params:simulation.n_players": "params:synthetic_decks.n_decks",
+            **{
+                dataset: dataset
+                for dataset in simulation_pipeline.inputs()
+                if dataset.startswith("params:")
+                and dataset != "params:simulation.n_players"
+            },
+        },
+    )
+
+    return generation_pipeline + synthetic_simulation_pipeline
@@ -0,0 +1,299 @@
+"""Profiling opcional da simulação de partidas.
+
+Dois modos, escolhidos em `params:simulation.profiling.mode`:
+
+- `sampling`: a pilha da thread da simulação é amostrada a cada `interval` segundos
+  (baixo overhead; tempos estimados pelo número de amostras).
+- `deterministic`: `cProfile`, com contagem exata de chamadas. As pilhas colapsadas são
+  montadas a partir das arestas chamador -> função (dois níveis), já que o cProfile não
+  guarda as pilhas completas.
+
+Cada execução grava seus perfis em uma pasta própria, `<log_folder>/profiles/<run_id>/`
+(`profile_run_folder`), onde cada worker (processo) grava um arquivo de pilhas colapsadas
+(`worker_<pid>.collapsed`, compatível com o flamegraph.pl e o speedscope) e os agregados por
+função (`worker_<pid>_functions.csv`). Ao fim da execução, quem a conduziu (o nó ou o
+coordenador distribuído) combina uma única vez os workers da pasta em `merged.collapsed` e
+`merged_functions.csv`.
+"""
+
+import cProfile
+import glob
+import logging
+import os
+import pstats
+import signal
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+PROFILING_MODES = ("off", "sampling", "deterministic")
+
+MERGED_NAME = "merged"
+
+
+def _frame_label(code) -> str:
+    """Rótulo de uma função nas pilhas colapsadas (sem ';', que separa os níveis)."""
+    file_name = os.path.basename(code.co_filename)
+    return f"{code.co_name} ({file_name}:{code.co_firstlineno})".replace(";", ":")
+
+
+def _function_stats_from_stacks(stacks: Counter, interval: float) -> pd.DataFrame:
+    """
+    Agrega as amostras por função: `self_samples` (no topo da pilha) e `total_samples`
+    (em qualquer nível, uma vez por amostra), convertidos em segundos por `interval`.
+    """
+    self_samples = Counter()
+    total_samples = Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(";")
+        self_samples[frames[-1]] += count
+        for frame in set(frames):
+            total_samples[frame] += count
+
+    function_stats = pd.DataFrame(
+        {
+            "function": list(total_samples),
+            "self_samples": [self_samples[frame] for frame in total_samples],
+            "total_samples": list(total_samples.values()),
+        }
+    )
+    function_stats["self_seconds"] = function_stats["self_samples"] * interval
+    function_stats["total_seconds"] = function_stats["total_samples"] * interval
+    return function_stats.sort_values(
+        "self_seconds", ascending=False, ignore_index=True
+    )
+
+
+class SamplingProfiler:
+    """
+    Amostra periodicamente a pilha de uma thread, acumulando pilhas colapsadas.
+
+    Na thread principal de sistemas Unix, usa o timer `ITIMER_PROF` (sinal SIGPROF a cada
+    `interval` segundos de CPU), que interrompe o interpretador em qualquer ponto. Nos demais
+    casos, uma thread auxiliar lê `sys._current_frames()`; como ela só roda quando a thread
+    perfilada libera o GIL, as amostras tendem a cair em chamadas que liberam o GIL.
+
+    Args:
+        interval (float): Intervalo entre amostras, em segundos.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks = Counter()
+        self._target_thread = None
+        self._previous_handler = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _record(self, frame):
+        labels = []
+        while frame is not None:
+            labels.append(_frame_label(frame.f_code))
+            frame = frame.f_back
+        if labels:
+            self.stacks[";".join(reversed(labels))] += 1
+
+    def _handle_signal(self, signum, frame):
+        self._record(frame)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._record(sys._current_frames().get(self._target_thread))
+
+    def start(self):
+        """Passa a amostrar a thread que chamou `start`."""
+        self._target_thread = threading.get_ident()
+        if (
+            hasattr(signal, "setitimer")
+            and threading.current_thread() is threading.main_thread()
+        ):
+            self._previous_handler = signal.signal(signal.SIGPROF, self._handle_signal)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        else:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self._previous_handler)
+        else:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def function_stats(self) -> pd.DataFrame:
+        return _function_stats_from_stacks(self.stacks, self.interval)
+
+
+class DeterministicProfiler:
+    """Perfil determinístico com `cProfile`, no mesmo formato de saída do `SamplingProfiler`."""
+
+    # Resolução das pilhas colapsadas: os pesos são microssegundos
+    interval = 1e-6
+
+    def __init__(self):
+        self._profile = cProfile.Profile()
+        self._stats = None
+
+    def start(self):
+        self._profile.enable()
+
+    def stop(self):
+        self._profile.disable()
+        self._stats = pstats.Stats(self._profile)
+
+    @staticmethod
+    def _label(func) -> str:
+        file_name, line, name = func
+        return f"{name} ({os.path.basename(file_name)}:{line})".replace(";", ":")
+
+    @property
+    def stacks(self) -> Counter:
+        """Pilhas `chamador;função` ponderadas pelo tempo próprio da função (em microssegundos)."""
+        stacks = Counter()
+        for func, (_, _, _, _, callers) in self._stats.stats.items():
+            label = self._label(func)
+            if not callers:
+                continue
+            for caller, (_, _, caller_tottime, _) in callers.items():
+                weight = round(caller_tottime / self.interval)
+                if weight:
+                    stacks[f"{self._label(caller)};{label}"] += weight
+        return stacks
+
+    def function_stats(self) -> pd.DataFrame:
+        rows = [
+            {
+                "function": self._label(func),
+                "calls": n_calls,
+                "self_seconds": tottime,
+                "total_seconds": cumtime,
+            }
+            for func, (_, n_calls, tottime, cumtime, _) in self._stats.stats.items()
+        ]
+        return pd.DataFrame(rows).sort_values(
+            "self_seconds", ascending=False, ignore_index=True
+        )
+
+
+def _write_collapsed(stacks: Counter, path: str):
+    with open(path, "w", encoding="utf-8") as file:
+        for stack, count in sorted(stacks.items()):
+            file.write(f"{stack} {count}\n")
+
+
+def _read_collapsed(path: str) -> Counter:
+    stacks = Counter()
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            if stack:
+                stacks[stack] += int(count)
+    return stacks
+
+
+def profile_run_folder(log_folder: str, run_id: Optional[str] = None) -> str:
+    """
+    Pasta dos perfis de uma execução: `<log_folder>/profiles/<run_id>`.
+
+    Args:
+        log_folder (str): Pasta de logs da simulação.
+        run_id (str, optional): Identificador da execução. Padrão: data e hora UTC atuais.
+    """
+    run_id = run_id or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    return os.path.join(log_folder, "profiles", run_id)
+
+
+def merge_profiles(profile_folder: str):
+    """
+    Combina os perfis dos workers de uma execução em `merged.collapsed` e
+    `merged_functions.csv` (somando pilhas, contagens e tempos por função).
+
+    Não faz nada se a pasta não tiver perfis (ex.: profiling desligado).
+    """
+    worker_files = sorted(glob.glob(os.path.join(profile_folder, "worker_*.collapsed")))
+    if not worker_files:
+        return
+
+    stacks = Counter()
+    for path in worker_files:
+        stacks.update(_read_collapsed(path))
+    _write_collapsed(stacks, os.path.join(profile_folder, f"{MERGED_NAME}.collapsed"))
+
+    function_files = [
+        path.replace(".collapsed", "_functions.csv")
+        for path in worker_files
+        if os.path.exists(path.replace(".collapsed", "_functions.csv"))
+    ]
+    if function_files:
+        function_stats = (
+            pd.concat([pd.read_csv(path) for path in function_files])
+            .groupby("function", as_index=False)
+            .sum(numeric_only=True)
+            .sort_values("self_seconds", ascending=False)
+        )
+        function_stats.to_csv(
+            os.path.join(profile_folder, f"{MERGED_NAME}_functions.csv"), index=False
+        )
+
+
+@contextmanager
+def profile_simulation(
+    profiling_params: Optional[Dict[str, Any]],
+    profile_folder: str,
+    worker_name: Optional[str] = None,
+):
+    """
+    Perfila o trecho envolvido (o loop de partidas) quando o profiling está ligado.
+
+    Grava apenas o perfil deste processo; a combinação com os demais workers da execução
+    (`merge_profiles`) fica a cargo de quem conduz a execução.
+
+    Args:
+        profiling_params (Dict[str, Any], optional): `mode` (off | sampling | deterministic)
+            e `interval` (segundos entre amostras, no modo sampling). None equivale a off.
+        profile_folder (str): Pasta dos perfis da execução (ver `profile_run_folder`).
+        worker_name (str, optional): Nome dos arquivos deste processo na pasta (precisa
+            começar com `worker_`). Padrão: `worker_<pid>`.
+    """
+    logger = logging.getLogger(__name__)
+
+    mode = (profiling_params or {}).get("mode", "off")
+    if mode not in PROFILING_MODES:
+        raise ValueError(
+            f"Modo de profiling '{mode}' inválido. Escolha entre: {', '.join(PROFILING_MODES)}"
+        )
+
+    if mode == "off":
+        yield
+        return
+
+    if mode == "sampling":
+        profiler = SamplingProfiler(interval=profiling_params["interval"])
+    else:
+        profiler = DeterministicProfiler()
+
+    profiler.start()
+    try:
+        yield
+    finally:
+        profiler.stop()
+
+        os.makedirs(profile_folder, exist_ok=True)
+        worker_name = worker_name or f"worker_{os.getpid()}"
+
+        _write_collapsed(
+            profiler.stacks, os.path.join(profile_folder, f"{worker_name}.collapsed")
+        )
+        profiler.function_stats().to_csv(
+            os.path.join(profile_folder, f"{worker_name}_functions.csv"), index=False
+        )
+
+        logger.info(f"Perfil '{mode}' de {worker_name} salvo em {profile_folder}.")
@@ -0,0 +1,243 @@
+"""Deduplicação da simulação por assinatura de deck, com cache de resultados em disco."""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from classes.deck_signature import (
+    RULES_VERSION,
+    DeckSignature,
+    SignatureDeck,
+    deck_signature,
+)
+from classes.graveyard import Graveyard
+from classes.hand import Hand
+from classes.player import Player
+from classes.player_tracker import PlayerTracker
+
+# Parâmetros que mudam o resultado de uma partida (a chave do cache, junto da assinatura e da semente)
+RULE_PARAMS = (
+    "max_mulligans",
+    "mulligan_prob",
+    "max_turns",
+    "hand_size_stop",
+    "extra_land_prob",
+    "colored_mana",
+)
+
+# Colunas do tracker que não dependem dos nomes do jogador, do deck ou das cartas
+STAT_COLUMNS = (
+    "turn",
+    "mulligan_count",
+    "lands_played",
+    "spells_played",
+    "mana_pool",
+    "spent_mana",
+    "hand_size",
+    "library_size",
+    "graveyard_size",
+)
+
+
+class SimulationResultCache:
+    """
+    Cache em disco das partidas simuladas por assinatura, um arquivo pickle por chave.
+
+    Os arquivos ficam em `<cache_dir>/<2 primeiros caracteres da chave>/<chave>.pkl` e são
+    gravados de forma atômica, então vários processos (ex.: os workers da simulação
+    distribuída) podem compartilhar a mesma pasta. Sem `cache_dir`, nada é guardado.
+    """
+
+    def __init__(self, cache_dir: Optional[str]):
+        self.cache_dir = cache_dir
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.pkl")
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(key), "rb") as file:
+                return pickle.load(file)
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, match_df: pd.DataFrame):
+        if not self.cache_dir:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Escrita atômica para não corromper o cache se o processo for interrompido
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as file:
+            pickle.dump(match_df, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+
+def fan_out(
+    match_df: pd.DataFrame,
+    player: Player,
+    signature: DeckSignature,
+    match_num: int,
+    hand_log_mode: str,
+    running_features: bool = False,
+) -> pd.DataFrame:
+    """
+    Converte uma partida simulada sobre o `SignatureDeck` (mão e cemitério como posições
+    canônicas) na partida de um jogador cujo deck tem a mesma assinatura.
+
+    Args:
+        match_df (pd.DataFrame): Partida do deck da assinatura, no modo de registro compact.
+        player (Player): Jogador de destino.
+        signature (DeckSignature): Assinatura do deck do jogador (com as suas cartas na ordem
+            canônica).
+        match_num (int): Número da partida.
+        hand_log_mode (str): Modo de registro da mão da saída (off, compact ou verbose).
+        running_features (bool): Se as features por turno são calculadas no tracker da saída.
+
+    Returns:
+        pd.DataFrame: Os dados da partida, com as colunas e tipos do `PlayerTracker`.
+    """
+    cards = signature.cards
+    if hand_log_mode == "compact":
+        card_ids = player.deck.card_ids()
+        position_ids = np.array([card_ids[card.name] for card in cards], dtype=np.int16)
+    scratch_hand, scratch_graveyard = Hand(), Graveyard()
+
+    deck_colors = sorted(player.deck.deck_colors)
+    records = []
+    for row in match_df.to_dict("records"):
+        record = {
+            "name": player.name,
+            "deck_name": player.deck_name,
+            "deck_colors": deck_colors,
+            "match": match_num,
+        }
+        for column in STAT_COLUMNS:
+            record[column] = row[column]
+
+        hand, graveyard = row["hand_card_ids"], row["graveyard_card_ids"]
+        if hand_log_mode == "compact":
+            record["hand_card_ids"] = position_ids[hand]
+            record["graveyard_card_ids"] = position_ids[graveyard]
+        elif hand_log_mode == "verbose":
+            scratch_hand.cards = [cards[position] for position in hand]
+            scratch_graveyard.cards = [cards[position] for position in graveyard]
+            record["full_hand"] = repr(scratch_hand)
+            record["full_graveyard"] = repr(scratch_graveyard)
+        records.append(record)
+
+    tracker = PlayerTracker(
+        hand_log_mode=hand_log_mode, running_features=running_features
+    )
+    tracker.log_records(records)
+    return tracker.get_data()
+
+
+class SignatureSimulator:
+    """
+    Simula cada partida uma vez por assinatura de deck (`classes.deck_signature`) e a replica
+    para todos os jogadores cujos decks têm a mesma assinatura.
+
+    Uma partida é identificada pela assinatura, pelos parâmetros das regras (`RULE_PARAMS`),
+    pela semente e pela versão das regras (`RULES_VERSION`). Ela é procurada primeiro em
+    memória (as últimas `memory_size` partidas), depois no `SimulationResultCache` (que
+    sobrevive entre execuções) e, se não estiver em nenhum dos dois, é simulada com o motor
+    configurado sobre o `SignatureDeck`. O resultado não depende do motor.
+
+    Args:
+        params (dict): Parâmetros da simulação (ver `params:simulation`), com `dedup.cache_dir`
+            e `dedup.memory_size`.
+        simulate (Callable): Simula uma partida (`simulate_match`), chamada com os parâmetros sem
+            deduplicação, no modo de registro compact e sem as features por turno.
+    """
+
+    def __init__(self, params: Dict[str, Any], simulate: Callable[..., pd.DataFrame]):
+        self.params = params
+        self.simulate = simulate
+        self.colored_mana = params["colored_mana"]
+        self.cache = SimulationResultCache(params["dedup"]["cache_dir"])
+        self.memory_size = params["dedup"]["memory_size"]
+
+        self._simulation_params = dict(
+            params,
+            hand_log_mode="compact",
+            running_features=False,
+            dedup=dict(params["dedup"], enabled=False),
+        )
+        self._rules_key = json.dumps(
+            {param: params[param] for param in RULE_PARAMS}, sort_keys=True
+        )
+        self._memory: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        self._players: Dict[str, Player] = {}
+        self.stats = {"simulated": 0, "memory": 0, "disk": 0}
+
+    def key(self, signature: str, seed: int) -> str:
+        """Chave de uma partida no cache."""
+        payload = f"{RULES_VERSION}|{signature}|{self._rules_key}|{seed}"
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    def _signature_player(self, player: Player, signature: str) -> Player:
+        signature_player = self._players.get(signature)
+        if signature_player is None:
+            signature_player = self._players[signature] = Player(
+                f"Signature {signature[:12]}",
+                SignatureDeck(player.deck, self.colored_mana),
+            )
+        return signature_player
+
+    def play(self, player: Player, match_num: int, seed: int) -> pd.DataFrame:
+        """
+        Retorna a partida `match_num` do jogador com a semente `seed`, simulando-a apenas se
+        a assinatura do seu deck ainda não a tiver simulado.
+        """
+        signature = deck_signature(player.deck, self.colored_mana)
+        key = self.key(signature.signature, seed)
+
+        match_df = self._memory.get(key)
+        if match_df is not None:
+            self._memory.move_to_end(key)
+            self.stats["memory"] += 1
+        else:
+            match_df = self.cache.get(key)
+            if match_df is not None:
+                self.stats["disk"] += 1
+            else:
+                match_df = self.simulate(
+                    self._signature_player(player, signature.signature),
+                    self._simulation_params,
+                    match_num,
+                    seed,
+                )
+                self.cache.put(key, match_df)
+                self.stats["simulated"] += 1
+
+            self._memory[key] = match_df
+            if len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+        return fan_out(
+            match_df,
+            player,
+            signature,
+            match_num,
+            self.params["hand_log_mode"],
+            self.params["running_features"],
+        )
+
+    def log_stats(self):
+        """Registra quantas partidas foram simuladas e quantas foram reaproveitadas."""
+        logging.getLogger(__name__).info(
+            f"Deduplicação por assinatura: {self.stats['simulated']} partidas simuladas "
+            f"({len(self._players)} assinaturas), {self.stats['memory']} reaproveitadas da "
+            f"memória e {self.stats['disk']} do cache em disco."
+        )
@@ -1,6 +1,9 @@
 """General utils file for pp."""
 
 import logging
+import threading
+
+import psutil
 
 
 def setup_logger(logger_name: str, log_folder: str = None) -> logging.Logger:
@@ -67,3 +70,85 @@ def get_last_file(partitioned_data):
     data = partitioned_data[latest_partition]
 
     return data
+
+
+class PeakMemoryMonitor:
+    """
+    Mede o pico de memória residente (RSS) do processo enquanto um trecho de código executa.
+
+    Uma thread em segundo plano amostra o RSS a cada `interval` segundos; o pico inclui
+    as amostras de início e de fim do trecho.
+
+    Exemplo:
+        with PeakMemoryMonitor() as monitor:
+            executar_etapa()
+        logger.info(f"Pico de RSS: {monitor.peak_rss_mb:.1f} MB")
+    """
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.start_rss = 0
+        self.peak_rss = 0
+        self._process = psutil.Process()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        self.peak_rss = max(self.peak_rss, self._process.memory_info().rss)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self.start_rss = self._process.memory_info().rss
+        self.peak_rss = self.start_rss
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+        return False
+
+    @property
+    def peak_rss_mb(self) -> float:
+        return self.peak_rss / 2**20
+
+    @property
+    def peak_rss_delta_mb(self) -> float:
+        return (self.peak_rss - self.start_rss) / 2**20
+
+
+# Contadores do nó em execução na thread atual (coletados pelos hooks de performance)
+_node_counters = threading.local()
+
+
+def start_node_counters():
+    """Inicia a coleta de contadores para o nó que vai executar na thread atual."""
+    _node_counters.values = {}
+
+
+def record_node_counters(**counters):
+    """
+    Soma contadores específicos de um nó (ex.: partidas, turnos, cartas compradas) às
+    métricas do nó em execução. Fora de uma execução instrumentada, não faz nada.
+
+    Exemplo:
+        record_node_counters(matches=10, turns=120)
+    """
+    values = getattr(_node_counters, "values", None)
+    if values is None:
+        return
+    for name, value in counters.items():
+        values[name] = values.get(name, 0) + value
+
+
+def collect_node_counters() -> dict:
+    """Encerra a coleta da thread atual e retorna os contadores registrados."""
+    values = getattr(_node_counters, "values", None) or {}
+    _node_counters.values = None
+    return values
@@ -0,0 +1,169 @@
+"""Detecção de decks quase duplicados com MinHash e LSH (locality-sensitive hashing)."""
+
+import hashlib
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+# Primo de Mersenne 2^31 - 1: a * x + b cabe em 64 bits para a, b e x menores que ele
+MERSENNE_PRIME = (1 << 31) - 1
+
+
+def deck_tokens(card_quantities: Dict[str, int]) -> List[str]:
+    """
+    Converte o multiconjunto de cartas de um deck em um conjunto de tokens, um por cópia
+    (ex.: 4 "Shock" viram "Shock#0" ... "Shock#3").
+
+    A similaridade de Jaccard entre esses conjuntos é a Jaccard ponderada dos multiconjuntos:
+    a soma das cópias em comum sobre a soma do máximo de cópias de cada carta.
+    """
+    return [
+        f"{card_name}#{copy}"
+        for card_name, quantity in card_quantities.items()
+        for copy in range(quantity)
+    ]
+
+
+class MinHasher:
+    """
+    Gera sketches MinHash de conjuntos de tokens com `num_perm` funções de hash universais
+    `h(x) = (a * x + b) mod MERSENNE_PRIME`.
+
+    A fração de posições iguais entre dois sketches estima a similaridade de Jaccard entre os
+    conjuntos. Os hashes dos tokens são estáveis entre processos (blake2b) e os coeficientes
+    vêm de `random_state`, então o mesmo deck tem o mesmo sketch em qualquer execução.
+    """
+
+    def __init__(self, num_perm: int = 128, random_state: int = 42):
+        self.num_perm = num_perm
+        rng = np.random.default_rng(random_state)
+        self.a = rng.integers(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._token_hashes: Dict[str, int] = {}
+
+    def hash_tokens(self, tokens: Iterable[str]) -> np.ndarray:
+        """Hashes dos tokens, reduzidos módulo MERSENNE_PRIME (com cache por token)."""
+        token_hashes = self._token_hashes
+        values = []
+        for token in tokens:
+            value = token_hashes.get(token)
+            if value is None:
+                digest = hashlib.blake2b(token.encode(), digest_size=8).digest()
+                value = token_hashes[token] = (
+                    int.from_bytes(digest, "big") % MERSENNE_PRIME
+                )
+            values.append(value)
+        return np.array(values, dtype=np.uint64)
+
+    def sketch(self, token_hashes: np.ndarray) -> np.ndarray:
+        """O sketch MinHash (uint32, `num_perm` posições) de um conjunto de hashes de tokens."""
+        if len(token_hashes) == 0:
+            return np.full(self.num_perm, MERSENNE_PRIME, dtype=np.uint32)
+        hashed = (np.outer(self.a, token_hashes) + self.b[:, None]) % MERSENNE_PRIME
+        return hashed.min(axis=1).astype(np.uint32)
+
+
+def lsh_bands(
+    num_perm: int, threshold: float, false_negative_weight: float = 0.9
+) -> Tuple[int, int]:
+    """
+    Escolhe o número de faixas (bands) e de linhas por faixa (rows) do LSH para um threshold.
+
+    Dois decks viram candidatos se alguma faixa dos seus sketches for idêntica, o que acontece
+    com probabilidade `P(s) = 1 - (1 - s^rows)^bands` para Jaccard `s`, uma curva em S. Entre
+    as combinações com `bands * rows <= num_perm`, usa a que minimiza a área de falsos
+    positivos (`P(s)` abaixo do threshold) e de falsos negativos (`1 - P(s)` acima dele),
+    ponderadas. Os candidatos são verificados pela Jaccard exata, então falsos positivos só
+    custam comparações e os falsos negativos (duplicatas perdidas) pesam mais por padrão.
+    """
+    below = np.linspace(0, threshold, 200)
+    above = np.linspace(threshold, 1, 200)
+    best, best_error = None, None
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            false_positives = (1 - (1 - below**rows) ** bands).mean() * threshold
+            false_negatives = ((1 - above**rows) ** bands).mean() * (1 - threshold)
+            error = (
+                1 - false_negative_weight
+            ) * false_positives + false_negative_weight * false_negatives
+            if best_error is None or error < best_error:
+                best, best_error = (bands, rows), error
+    return best
+
+
+class _UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, item: int) -> int:
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, first: int, second: int):
+        first, second = self.find(first), self.find(second)
+        if first != second:
+            # A raiz é sempre o menor índice (clusters estáveis para a mesma entrada)
+            self.parent[max(first, second)] = min(first, second)
+
+
+def jaccard(first: set, second: set) -> float:
+    """Similaridade de Jaccard entre dois conjuntos."""
+    if not first and not second:
+        return 1.0
+    return len(first & second) / len(first | second)
+
+
+def cluster_near_duplicates(
+    token_sets: List[set], sketches: np.ndarray, threshold: float, bands: int, rows: int
+) -> Tuple[np.ndarray, int]:
+    """
+    Agrupa os conjuntos com Jaccard maior ou igual a `threshold` (ligação simples).
+
+    As primeiras `bands * rows` posições dos sketches são divididas em `bands` faixas de `rows`
+    posições; conjuntos com uma faixa idêntica caem no mesmo balde e são candidatos. Em cada
+    balde, cada conjunto é comparado (Jaccard exata) com todos os membros anteriores do balde
+    que ainda não estão no seu cluster, então todo par candidato acima do threshold liga os
+    dois clusters. Pares já ligados não são comparados de novo: listas idênticas repetidas
+    muitas vezes custam uma comparação cada, e não todos os pares.
+
+    Args:
+        token_sets (List[set]): Conjunto de hashes de tokens de cada deck.
+        sketches (np.ndarray): Sketches MinHash (decks x `num_perm`).
+        threshold (float): Jaccard mínima para dois decks ficarem no mesmo cluster.
+        bands, rows (int): Faixas do LSH e posições por faixa (ver `lsh_bands`).
+
+    Returns:
+        Tuple[np.ndarray, int]: O cluster de cada deck (o índice do primeiro deck do cluster)
+            e o número de comparações exatas feitas.
+    """
+    n_decks = sketches.shape[0]
+    union_find = _UnionFind(n_decks)
+    n_comparisons = 0
+
+    for band in range(bands):
+        band_rows = np.ascontiguousarray(sketches[:, band * rows : (band + 1) * rows])
+        buckets: Dict[bytes, List[int]] = {}
+        for deck_idx in range(n_decks):
+            buckets.setdefault(band_rows[deck_idx].tobytes(), []).append(deck_idx)
+
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            for member_idx, deck_idx in enumerate(members):
+                for other_idx in members[:member_idx]:
+                    if union_find.find(other_idx) == union_find.find(deck_idx):
+                        continue
+                    n_comparisons += 1
+                    if (
+                        jaccard(token_sets[deck_idx], token_sets[other_idx])
+                        >= threshold
+                    ):
+                        union_find.union(deck_idx, other_idx)
+
+    labels = np.array(
+        [union_find.find(deck_idx) for deck_idx in range(n_decks)], dtype=np.int64
+    )
+    return labels, n_comparisons
@@ -1,10 +1,34 @@
 """Preprocessing nodes."""
 
 import os
-import random
+import time
 import zipfile
-import requests
 import logging
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from classes.constants import color_bits, color_combinations, land_colors, mtg_formats
+
+# pandas, numpy e o Deck são importados apenas nos nós que os usam (reduz o tempo de início
+# do `kedro run --pipeline webscraping`)
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Faixas de custo de mana do histograma do índice (a última acumula os custos maiores)
+INDEX_CMC_BINS = 7
+
+
+def _color_combination_by_bits() -> Dict[int, str]:
+    """Nome da combinação de cores (ex.: "izzet") de cada máscara de cores."""
+    names = {0: "colorless"}
+    for name, colors in color_combinations.items():
+        bits = sum(
+            color_bits[color.upper()] for color, present in colors.items() if present
+        )
+        names.setdefault(bits, name)
+    return names
+
+
+COLOR_COMBINATION_BY_BITS = _color_combination_by_bits()
 
 
 def get_deck_zip_from_web(project_path: str, zip_url: str, zip_folder: str) -> None:
@@ -20,6 +44,9 @@ def get_deck_zip_from_web(project_path: str, zip_url: str, zip_folder: str) -> N
     Returns:
         None: A função salva os arquivos JSON na pasta especificada e não retorna nada.
     """
+    # Import local: o requests só é carregado quando o download roda
+    import requests
+
     # Configura o logger geral com o nome "get_deck_zip_logger"
     logger = logging.getLogger(__name__)
 
@@ -73,22 +100,118 @@ def get_deck_zip_from_web(project_path: str, zip_url: str, zip_folder: str) -> N
         logger.removeHandler(handler)
 
 
+def deck_index_row(deck_key: str, deck_data) -> dict:
+    """
+    Resume um deck do MTGJSON em uma linha do índice de decks, usando os dados das cartas que
+    já vêm no JSON (sem consultas à API).
+
+    As contagens seguem as regras do `Deck`: terrenos são as cartas com "Land" no tipo, as cores
+    do deck vêm das mágicas e as cores dos terrenos, dos nomes dos terrenos básicos.
+
+    Args:
+        deck_key (str): Nome do arquivo .txt do deck (chave em `decks_txt_partitioned`).
+        deck_data: Campo `data` do JSON do deck.
+
+    Returns:
+        dict: Formato e nome do deck no MTGJSON, número de cartas e de terrenos, máscaras de cores
+            das mágicas e dos terrenos (ver `classes.constants.color_bits`), combinação de cores,
+            maior número de cópias de uma mágica e histograma de custo de mana das mágicas.
+    """
+    n_cards, n_lands, total_cmc, colors, land_color_set = 0, 0, 0, set(), set()
+    copies: Dict[str, int] = {}
+    cmc_histogram = [0] * (INDEX_CMC_BINS + 1)
+
+    for card in deck_data["mainBoard"]:
+        count = card["count"]
+        n_cards += count
+        if "Land" in card.get("type", ""):
+            n_lands += count
+            for land_name, land_color in land_colors.items():
+                if land_name in card["name"]:
+                    land_color_set.update(land_color)
+                    break
+            continue
+
+        colors.update(card.get("colors") or [])
+        copies[card["name"]] = copies.get(card["name"], 0) + count
+        cmc = int(card.get("manaValue", card.get("convertedManaCost", 0)) or 0)
+        cmc_histogram[min(cmc, INDEX_CMC_BINS)] += count
+        total_cmc += cmc * count
+
+    deck_color_bits = sum(color_bits[color] for color in colors if color in color_bits)
+    n_spells = n_cards - n_lands
+    row = {
+        "deck_key": deck_key,
+        "deck_name": deck_data.get("name", "Unknown Deck"),
+        "deck_type": deck_data.get("type"),
+        "n_cards": n_cards,
+        "n_lands": n_lands,
+        "color_bits": deck_color_bits,
+        "land_color_bits": sum(color_bits[color] for color in land_color_set),
+        "n_colors": bin(deck_color_bits).count("1"),
+        "color_combination": COLOR_COMBINATION_BY_BITS.get(deck_color_bits),
+        "max_copies": max(copies.values(), default=0),
+        "mean_cmc": total_cmc / n_spells if n_spells else 0.0,
+    }
+    for cmc, count in enumerate(cmc_histogram):
+        label = f"cmc_{cmc}plus" if cmc == INDEX_CMC_BINS else f"cmc_{cmc}"
+        row[label] = count
+    return row
+
+
+def flag_valid_decks(deck_index: 'pd.DataFrame', format_name: str) -> 'pd.Series':
+    """
+    Verifica, de forma vetorizada, quais decks do índice atendem às regras de um formato
+    (as mesmas do `Deck.add_card` e do `Deck.is_valid`): tamanho do deck, número de terrenos,
+    cópias por carta e terrenos para todas as cores das mágicas.
+
+    Args:
+        deck_index (pd.DataFrame): Índice de decks (ver `deck_index_row`).
+        format_name (str): Formato de `classes.constants.mtg_formats`.
+
+    Returns:
+        pd.Series: Máscara booleana dos decks válidos.
+    """
+    rules = mtg_formats[format_name]
+    max_cards = rules["Deck Size"]["Maximum"]
+    max_copies = rules["Max Copies per Card"]
+
+    is_valid = (deck_index["n_cards"] >= rules["Deck Size"]["Minimum"]) & deck_index[
+        "n_lands"
+    ].between(rules["Min Lands"], rules["Max Lands"])
+    if max_cards != "No limit":
+        is_valid &= deck_index["n_cards"] <= max_cards
+    if max_copies != "No limit":
+        is_valid &= deck_index["max_copies"] <= max_copies
+
+    # Toda cor das mágicas precisa de um terreno básico da mesma cor
+    is_valid &= (deck_index["color_bits"] & ~deck_index["land_color_bits"]) == 0
+    return is_valid
+
+
 def pp_decks_from_json_files(
-    decks_json_partitioned: dict, deck_cards: int, log_folder: str
-) -> dict:
+    decks_json_partitioned: dict, deck_cards: int, log_folder: str, format_name: str
+) -> Tuple[dict, 'pd.DataFrame']:
     """
     Processa todos os decks JSON fornecidos pelo PartitionedDataSet e salva no formato .txt.
 
     Faz isso desde que contenham pelo menos o número mínimo de cartas definido em deck_cards (params).
     O log dos decks processados é salvo em um arquivo no log_folder (params).
 
+    Na mesma passada, monta o índice de decks: uma linha por decklist gerada (ver
+    `deck_index_row`), com a validade no formato `format_name` (ver `flag_valid_decks`), usado
+    pelo `sample_decks` para filtrar e estratificar a amostra sem ler os decklists.
+
     Args:
         decks_json_partitioned (dict): Dicionário de decks carregados de arquivos JSON através de PartitionedDataSet.
         deck_cards (int): Número mínimo de cartas no mainBoard para que o deck seja processado.
         log_folder (str): Caminho do arquivo onde os logs serão salvos.
+        format_name (str): Formato usado para validar os decks no índice (o mesmo com que a
+            simulação carrega os decks).
 
     Returns:
-        dict: Dicionário de decks processados, onde as chaves são os nomes dos arquivos e os valores são as decklists.
+        Tuple[dict, 'pd.DataFrame']: Dicionário de decks processados, onde as chaves são os nomes
+            dos arquivos e os valores são as decklists, e o índice de decks.
     """
     # Configura o logger
     logger = logging.getLogger(__name__)
@@ -118,6 +241,7 @@ def pp_decks_from_json_files(
 
     # Dicionário de saída para armazenar as decklists processadas
     processed_decks = {}
+    index_rows = {}
 
     # Percorrer os arquivos JSON no dicionário fornecido pelo PartitionedDataSet
     for file_name, dataset in decks_json_partitioned.items():
@@ -136,6 +260,9 @@ def pp_decks_from_json_files(
 
             # Salvar no dicionário de decks processados
             processed_decks[output_file_name] = "\n".join(decklist)
+            index_rows[output_file_name] = deck_index_row(
+                output_file_name, data['data']
+            )
 
             logger.info(f"Decklist {output_file_name} gerada com sucesso!")
         else:
@@ -143,25 +270,172 @@ def pp_decks_from_json_files(
                 f"Deck {file_name} ignorado (menos de {deck_cards} cartas no mainBoard)."
             )
 
+    import pandas as pd
+
+    # Índice de decks (decks com o mesmo nome de arquivo ficam com a última versão, como os .txt)
+    # Colunas explícitas: sem decks, o índice vazio ainda tem as colunas usadas a jusante
+    index_columns = list(deck_index_row("", {"mainBoard": []})) + ["format", "is_valid"]
+    deck_index = pd.DataFrame(list(index_rows.values()), columns=index_columns)
+    if not deck_index.empty:
+        deck_index["format"] = format_name
+        deck_index["is_valid"] = flag_valid_decks(deck_index, format_name)
+        logger.info(
+            f"Índice de decks: {len(deck_index)} decks, {int(deck_index['is_valid'].sum())} "
+            f"válidos no formato {format_name}."
+        )
+
     # Remover o handler para evitar problemas futuros
     for handler in logger.handlers:
         handler.close()
         logger.removeHandler(handler)
 
-    return processed_decks
+    return processed_decks, deck_index
+
+
+def select_decks(
+    deck_index: 'pd.DataFrame',
+    only_valid: bool = True,
+    colors: Optional[List[str]] = None,
+    deck_types: Optional[List[str]] = None,
+) -> 'pd.DataFrame':
+    """
+    Filtra o índice de decks com operações vetorizadas.
+
+    Args:
+        deck_index (pd.DataFrame): Índice de decks (ver `deck_index_row`).
+        only_valid (bool): Mantém apenas os decks válidos (coluna `is_valid`).
+        colors (List[str], optional): Cores permitidas (W, U, B, R, G); mantém os decks cujas
+            mágicas usam apenas essas cores. None não filtra.
+        deck_types (List[str], optional): Tipos de deck do MTGJSON a manter. None não filtra.
+
+    Returns:
+        pd.DataFrame: Linhas do índice que passam nos filtros.
+    """
+    import pandas as pd
+
+    mask = pd.Series(True, index=deck_index.index)
+    if only_valid:
+        mask &= deck_index["is_valid"]
+    if colors is not None:
+        allowed_bits = sum(color_bits[color] for color in colors)
+        mask &= (deck_index["color_bits"] & ~allowed_bits) == 0
+    if deck_types is not None:
+        mask &= deck_index["deck_type"].isin(deck_types)
+    return deck_index[mask]
+
+
+def cluster_near_duplicate_decks(
+    decks_txt_partitioned: dict, deck_index: 'pd.DataFrame', near_duplicate_params: dict
+) -> 'pd.DataFrame':
+    """
+    Agrupa os decks quase duplicados do índice (variantes de precons, a mesma lista com nomes
+    diferentes) com MinHash e LSH, sem comparar todos os pares de decks.
+
+    Cada decklist vira o conjunto de tokens do seu multiconjunto de cartas (ver `deck_tokens`),
+    resumido em um sketch MinHash. Os decks cujos sketches coincidem em alguma faixa do LSH são
+    comparados pela Jaccard exata, e os pares com Jaccard maior ou igual ao threshold ficam no
+    mesmo cluster (ver `cluster_near_duplicates`).
+
+    Args:
+        decks_txt_partitioned (dict): Decklists .txt, por nome de arquivo (funções de carga).
+        deck_index (pd.DataFrame): Índice de decks gerado no pré-processamento.
+        near_duplicate_params (dict): `threshold` (Jaccard mínima), `num_perm` (tamanho do
+            sketch), `bands` (faixas do LSH, com `num_perm // bands` posições cada; None
+            escolhe faixas e posições a partir do threshold) e `random_state`.
+
+    Returns:
+        pd.DataFrame: `deck_key`, `cluster_id` (o primeiro deck_key do cluster, em ordem
+            alfabética) e `cluster_size` de cada deck do índice.
+    """
+    import numpy as np
+    import pandas as pd
+
+    from classes.deck import Deck
+
+    from .near_duplicates import (
+        MinHasher,
+        cluster_near_duplicates,
+        deck_tokens,
+        lsh_bands,
+    )
+
+    logger = logging.getLogger(__name__)
+    start = time.perf_counter()
+
+    threshold = near_duplicate_params["threshold"]
+    num_perm = near_duplicate_params["num_perm"]
+    if near_duplicate_params["bands"]:
+        bands = near_duplicate_params["bands"]
+        rows = num_perm // bands
+        if not rows:
+            raise ValueError(
+                f"bands ({bands}) não pode ser maior que num_perm ({num_perm})."
+            )
+    else:
+        bands, rows = lsh_bands(num_perm, threshold)
+
+    # Ordem alfabética: o primeiro deck de cada cluster (a raiz) é o de menor deck_key
+    deck_keys = sorted(
+        key for key in deck_index["deck_key"] if key in decks_txt_partitioned
+    )
+    hasher = MinHasher(num_perm, near_duplicate_params["random_state"])
+    token_sets = []
+    sketches = np.empty((len(deck_keys), num_perm), dtype=np.uint32)
+    for deck_idx, deck_key in enumerate(deck_keys):
+        _, card_quantities = Deck.parse_decklist(decks_txt_partitioned[deck_key]())
+        token_hashes = hasher.hash_tokens(deck_tokens(card_quantities))
+        token_sets.append(set(token_hashes.tolist()))
+        sketches[deck_idx] = hasher.sketch(token_hashes)
+
+    labels, n_comparisons = cluster_near_duplicates(
+        token_sets, sketches, threshold, bands, rows
+    )
+
+    # dtype explícito: sem decks, as colunas continuam de strings (para o merge da amostragem)
+    deck_clusters = pd.DataFrame(
+        {"deck_key": deck_keys, "cluster_id": [deck_keys[label] for label in labels]},
+        dtype=object,
+    )
+    deck_clusters["cluster_size"] = deck_clusters.groupby("cluster_id")[
+        "deck_key"
+    ].transform("size")
+
+    n_clusters = deck_clusters["cluster_id"].nunique()
+    logger.info(
+        f"{len(deck_keys)} decks em {n_clusters} clusters com Jaccard >= {threshold} "
+        f"({bands} faixas de {rows} linhas; {n_comparisons} comparações exatas, "
+        f"contra {len(deck_keys) * (len(deck_keys) - 1) // 2} pares) em "
+        f"{time.perf_counter() - start:.1f}s."
+    )
+    return deck_clusters
 
 
 def sample_decks(
-    decks_txt_partitioned: dict, sample_size: float, log_folder: str
+    decks_txt_partitioned: dict,
+    deck_index: 'pd.DataFrame',
+    deck_clusters: 'pd.DataFrame',
+    sample_size: float,
+    log_folder: str,
+    sampling_params: dict,
 ) -> dict:
     """
     Amostra os decks no formato .txt com base no sample_size e retorna um dicionário de paths (pkl).
 
+    A população vem do índice de decks, filtrado por `select_decks` (por padrão, só decks
+    válidos), e a amostra pode ser estratificada por uma coluna do índice (ex.: a combinação
+    de cores), mantendo a proporção de cada grupo. Com `one_per_cluster`, a população fica
+    com um representante por cluster de decks quase duplicados (o primeiro deck_key elegível
+    do cluster, ver `cluster_near_duplicate_decks`).
+
     Args:
         decks_txt_partitioned (dict): Dicionário de decks onde as chaves são nomes de arquivos e os valores
         são funções que retornam o conteúdo do deck.
-        sample_size (float): A fração da população original que será usada para amostragem (valor entre 0 e 1).
+        deck_index (pd.DataFrame): Índice de decks gerado no pré-processamento.
+        deck_clusters (pd.DataFrame): Cluster de quase duplicados de cada deck.
+        sample_size (float): A fração da população filtrada que será usada para amostragem (valor entre 0 e 1).
         log_folder (str): Caminho da pasta para salvar os logs.
+        sampling_params (dict): `only_valid`, `colors` e `deck_types` (filtros, ver `select_decks`),
+            `one_per_cluster`, `stratify_by` (coluna do índice ou None) e `random_state`.
 
     Returns:
         dict: Dicionário com os caminhos dos decks amostrados.
@@ -169,15 +443,45 @@ def sample_decks(
     # Logger para a função
     logger = logging.getLogger(__name__)
 
-    # Número total de decks disponíveis
-    total_decks = len(decks_txt_partitioned)
-
-    # Calcular o tamanho da amostra
-    target_sample_size = int(total_decks * sample_size)
-
-    # Amostra aleatória da população
-    logger.info(f"Amostrando {target_sample_size} decks de um total de {total_decks}.")
-    sampled_keys = random.sample(list(decks_txt_partitioned.keys()), target_sample_size)
+    # População: decks do índice que têm decklist e passam nos filtros
+    population = select_decks(
+        deck_index[deck_index["deck_key"].isin(list(decks_txt_partitioned.keys()))],
+        only_valid=sampling_params["only_valid"],
+        colors=sampling_params["colors"],
+        deck_types=sampling_params["deck_types"],
+    )
+    logger.info(
+        f"{len(population)} decks elegíveis de um total de {len(decks_txt_partitioned)}."
+    )
+
+    # Um representante por cluster de quase duplicados
+    if sampling_params["one_per_cluster"]:
+        representatives = (
+            population.merge(
+                deck_clusters[["deck_key", "cluster_id"]], on="deck_key", how="left"
+            )
+            .sort_values("deck_key")
+            .drop_duplicates("cluster_id")
+        )
+        population = population[
+            population["deck_key"].isin(representatives["deck_key"])
+        ]
+        logger.info(f"{len(population)} decks elegíveis após manter um por cluster.")
+
+    # Amostra aleatória (estratificada, se pedido) da população
+    stratify_by = sampling_params["stratify_by"]
+    random_state = sampling_params["random_state"]
+    if stratify_by:
+        sample = population.groupby(stratify_by, dropna=False).sample(
+            frac=sample_size, random_state=random_state
+        )
+    else:
+        sample = population.sample(frac=sample_size, random_state=random_state)
+    sampled_keys = sample["deck_key"].tolist()
+    logger.info(
+        f"Amostrando {len(sampled_keys)} decks"
+        + (f" estratificados por {stratify_by}." if stratify_by else ".")
+    )
 
     # Criar dicionário contendo os paths dos decks amostrados
     sampled_decks = {
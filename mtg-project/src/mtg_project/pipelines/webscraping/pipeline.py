@@ -2,7 +2,12 @@
 
 from kedro.pipeline import Pipeline, node
 
-from .nodes import get_deck_zip_from_web, pp_decks_from_json_files, sample_decks
+from .nodes import (
+    cluster_near_duplicate_decks,
+    get_deck_zip_from_web,
+    pp_decks_from_json_files,
+    sample_decks,
+)
 
 
 def create_webscraping_pipeline(**kwargs) -> Pipeline:
@@ -24,16 +29,30 @@ def create_webscraping_pipeline(**kwargs) -> Pipeline:
                     "decks_json_partitioned",
                     "params:preprocessing.webscraper.deck_cards",
                     "params:preprocessing.webscraper.log_folder",
+                    "params:preprocessing.webscraper.index_format",
                 ],
-                outputs="decks_txt_partitioned",
+                outputs=["decks_txt_partitioned", "deck_index"],
                 name="pp_decks_from_json_files_node",
             ),
+            node(
+                func=cluster_near_duplicate_decks,
+                inputs=[
+                    "decks_txt_partitioned",
+                    "deck_index",
+                    "params:preprocessing.webscraper.near_duplicates",
+                ],
+                outputs="deck_clusters",
+                name="cluster_near_duplicate_decks_node",
+            ),
             node(
                 func=sample_decks,
                 inputs=[
                     "decks_txt_partitioned",
+                    "deck_index",
+                    "deck_clusters",
                     "params:preprocessing.webscraper.sample_size_ratio",
                     "params:preprocessing.webscraper.log_folder",
+                    "params:preprocessing.webscraper.sampling",
                 ],
                 outputs="sampled_decks",
                 name="sampling_decks_node",
@@ -0,0 +1,258 @@
+"""Serviço local de pontuação de decks com o modelo treinado.
+
+Recebe um decklist no formato .txt de `Deck.load_deck_from_txt`, resolve as cartas em um
+`CardStore` local, simula um lote de partidas, gera as features em memória e retorna a
+eficiência da curva de mana prevista pelo `best_model` por turno. O modelo e as cartas
+ficam carregados entre as requisições, e decklists idênticos são servidos de um cache.
+
+Uso:
+    python -m mtg_project.scoring_service --model data/06_models/best_model.pkl \\
+        --card-store data/01_raw/card_store.json --port 8765
+
+    curl -X POST --data-binary @deck.txt http://localhost:8765/score
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import pickle
+import random
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+
+import fsspec
+
+from classes.card_store import CardStore
+from classes.deck import Deck
+from classes.player import Player
+from classes.player_tracker import PlayerTracker
+from mtg_project.pipelines.modeling.compiled_tree import CompiledTree
+from mtg_project.pipelines.modeling.nodes import feature_engineering
+from mtg_project.pipelines.simulation.nodes import derive_seed
+
+logger = logging.getLogger(__name__)
+
+
+class DeckScorer:
+    """
+    Mantém o modelo e as cartas em memória e pontua decklists com um cache de resultados.
+
+    Args:
+        model: Modelo ajustado (`best_model`), compilado com `CompiledTree` na inicialização.
+        card_store (CardStore): Cartas conhecidas, usadas para resolver os decklists.
+        simulation_params (dict): Parâmetros da simulação (como em `params:simulation`).
+        n_matches (int): Número máximo de partidas simuladas por decklist.
+        latency_budget_ms (float): Tempo máximo de simulação por requisição; ao estourar,
+            a simulação para (com pelo menos uma partida) e o resultado indica quantas partidas rodaram.
+            Resultados parciais não entram no cache.
+        cache_size (int): Número de decklists mantidos no cache de resultados.
+    """
+
+    def __init__(
+        self,
+        model,
+        card_store: CardStore,
+        simulation_params: Dict[str, Any],
+        n_matches: int = 50,
+        latency_budget_ms: float = 500.0,
+        cache_size: int = 1024,
+    ):
+        self.model = CompiledTree.from_sklearn(model)
+        self.card_store = card_store
+        self.simulation_params = simulation_params
+        self.n_matches = n_matches
+        self.latency_budget_ms = latency_budget_ms
+        self.cache_size = cache_size
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cache_key(self, decklist_text: str) -> str:
+        deck_name, card_quantities = Deck.parse_decklist(decklist_text)
+        payload = json.dumps(
+            [deck_name, sorted(card_quantities.items()), self.n_matches],
+            sort_keys=True,
+        )
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    def _simulate(self, deck: Deck, cache_key: str) -> Dict[str, Any]:
+        """
+        Simula partidas do deck até `n_matches` ou até estourar o orçamento de latência.
+
+        As sementes das partidas derivam da chave do cache, então o mesmo decklist sempre
+        gera as mesmas partidas (e a resposta em cache é a de uma nova simulação).
+        """
+        params = self.simulation_params
+        player = Player("Scoring Player", deck)
+
+        deadline = time.perf_counter() + self.latency_budget_ms / 1000
+        partitions = {}
+        for match_num in range(1, self.n_matches + 1):
+            tracker = PlayerTracker(
+                hand_log_mode="off",
+                running_features=params.get("running_features", True),
+            )
+            player.rng = random.Random(derive_seed(cache_key, match_num))
+            player.play_a_match(
+                tracker,
+                params["max_mulligans"],
+                params["mulligan_prob"],
+                params["max_turns"],
+                params["hand_size_stop"],
+                params["extra_land_prob"],
+                colored_mana=params.get("colored_mana", True),
+            )
+            match_df = tracker.get_data().infer_objects()
+            partitions[f"Scoring_Player/match_{str(match_num).zfill(3)}"] = (
+                lambda match_df=match_df: match_df
+            )
+
+            if time.perf_counter() > deadline:
+                break
+
+        return partitions
+
+    def score(self, decklist_text: str) -> Dict[str, Any]:
+        """
+        Pontua um decklist, retornando a eficiência da curva de mana prevista por turno.
+
+        Raises:
+            ValueError: Se o decklist não puder ser resolvido ou não for um deck válido.
+        """
+        cache_key = self._cache_key(decklist_text)
+        with self._lock:
+            if cache_key in self._cache:
+                self._cache.move_to_end(cache_key)
+                return {**self._cache[cache_key], "cached": True}
+
+        start = time.perf_counter()
+
+        deck = Deck()
+        deck.load_deck_from_text(decklist_text, fetch_card=self.card_store.fetch_card)
+        if not deck.is_valid():
+            raise ValueError(f"O deck '{deck.deck_name}' não é válido.")
+
+        partitions = self._simulate(deck, cache_key)
+        features_df = feature_engineering(partitions)
+
+        features_df["predicted_efficiency"] = self.model.predict(features_df)
+        by_turn = features_df.groupby("turn")["predicted_efficiency"].mean()
+
+        result = {
+            "deck_name": deck.deck_name,
+            "n_matches": len(partitions),
+            "predicted_efficiency_by_turn": {
+                int(turn): round(float(value), 4) for turn, value in by_turn.items()
+            },
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+        }
+
+        # Só guarda resultados completos: um cortado pelo orçamento de latência teria menos
+        # partidas que uma nova simulação
+        if len(partitions) == self.n_matches:
+            with self._lock:
+                self._cache[cache_key] = result
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return {**result, "cached": False}
+
+
+def make_handler(scorer: DeckScorer):
+    """Cria o handler HTTP que atende `POST /score` e `GET /health`."""
+
+    class ScoringHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status: int, payload: dict):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send_json(200, {"status": "ok", "cards": len(scorer.card_store)})
+            else:
+                self._send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/score":
+                self._send_json(404, {"error": "not found"})
+                return
+
+            length = int(self.headers.get("Content-Length", 0))
+            decklist_text = self.rfile.read(length).decode("utf-8")
+            try:
+                self._send_json(200, scorer.score(decklist_text))
+            except ValueError as exc:
+                self._send_json(422, {"error": str(exc)})
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    return ScoringHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", required=True, help="Caminho do best_model.pkl")
+    parser.add_argument("--card-store", required=True, help="JSON do CardStore")
+    parser.add_argument("--allow-remote", action="store_true")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--matches", type=int, default=50)
+    parser.add_argument("--latency-budget-ms", type=float, default=500.0)
+    parser.add_argument("--cache-size", type=int, default=1024)
+    parser.add_argument("--max-turns", type=int, default=12)
+    parser.add_argument("--max-mulligans", type=int, default=3)
+    parser.add_argument("--mulligan-prob", type=float, default=0.20)
+    parser.add_argument("--extra-land-prob", type=float, default=0.10)
+    parser.add_argument("--hand-size-stop", type=int, default=0)
+    parser.add_argument(
+        "--generic-mana",
+        action="store_true",
+        help="Qualquer terreno paga qualquer custo (desliga o modelo de mana colorido).",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    # O log por jogada do simulador e da engenharia de features domina a latência
+    for noisy_logger in ("classes", "mtg_project.pipelines"):
+        logging.getLogger(noisy_logger).setLevel(logging.ERROR)
+
+    with fsspec.open(args.model, "rb") as file:
+        model = pickle.load(file)
+
+    scorer = DeckScorer(
+        model,
+        CardStore(args.card_store, allow_remote=args.allow_remote),
+        simulation_params={
+            "max_mulligans": args.max_mulligans,
+            "mulligan_prob": args.mulligan_prob,
+            "max_turns": args.max_turns,
+            "hand_size_stop": args.hand_size_stop,
+            "extra_land_prob": args.extra_land_prob,
+            "colored_mana": not args.generic_mana,
+        },
+        n_matches=args.matches,
+        latency_budget_ms=args.latency_budget_ms,
+        cache_size=args.cache_size,
+    )
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(scorer))
+    logger.info(f"Serviço de pontuação ouvindo em http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
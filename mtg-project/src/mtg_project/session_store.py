@@ -0,0 +1,28 @@
+"""Session store do Kedro com import tardio do kedro-viz."""
+
+import logging
+
+from kedro.framework.session.store import BaseSessionStore
+
+logger = logging.getLogger(__name__)
+
+
+class LazySQLiteStore(BaseSessionStore):
+    """
+    Repassa os dados da sessão para o `SQLiteStore` do kedro-viz apenas ao salvar.
+
+    Importar o kedro-viz no `settings.py` carregava o kedro-viz (e suas dependências) em
+    toda chamada da CLI. Aqui o import acontece no fim da sessão; se o kedro-viz não estiver
+    instalado, a sessão simplesmente não é persistida.
+    """
+
+    def save(self):
+        try:
+            from kedro_viz.integrations.kedro.sqlite_store import SQLiteStore
+        except ImportError:
+            logger.debug("kedro-viz não instalado; a sessão não será salva no SQLite.")
+            return
+
+        store = SQLiteStore(self._path, self._session_id)
+        store.update(self.data)
+        store.save()
@@ -3,21 +3,21 @@ from the Kedro defaults. For further information, including these default values
 https://docs.kedro.org/en/stable/kedro_project_setup/settings.html."""
 
 # Instantiated project hooks.
-# For example, after creating a hooks.py and defining a ProjectHooks class there, do
-# from pandas_viz.hooks import ProjectHooks
+from mtg_project.hooks import PerformanceHooks  # noqa: E402
 
 # Hooks are executed in a Last-In-First-Out (LIFO) order.
-# HOOKS = (ProjectHooks(),)
+HOOKS = (PerformanceHooks(),)
 
 # Installed plugins for which to disable hook auto-registration.
 # DISABLE_HOOKS_FOR_PLUGINS = ("kedro-viz",)
 
 from pathlib import Path  # noqa: E402
 
-from kedro_viz.integrations.kedro.sqlite_store import SQLiteStore  # noqa: E402
+from mtg_project.session_store import LazySQLiteStore  # noqa: E402
 
 # Class that manages storing KedroSession data.
-SESSION_STORE_CLASS = SQLiteStore
+# kedro-viz's SQLiteStore is only imported when the session is saved.
+SESSION_STORE_CLASS = LazySQLiteStore
 
 # Setup for Experiment Tracking
 # The SQLite DB required for experiment tracking is stored by default